@@ -52,7 +52,6 @@ INSTALLED_APPS = [
     "rosetta",
     "django_ckeditor_5",
     "django_filters",
-    "django_crontab",
     "model_utils",
     "honeypot",
     "django_recaptcha",
@@ -68,6 +67,7 @@ INSTALLED_APPS = [
     "logs_observation",
     "notifications",
     "subscriptions",
+    "tasks",
 ]
 
 MIDDLEWARE = [
@@ -130,6 +130,22 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("REDIS_URL", default="redis://127.0.0.1:6379/1"),
+    }
+}
+
+# Upcoming feed response cache: entries are fresh for FEED_CACHE_TIMEOUT
+# seconds and may be served stale for up to FEED_CACHE_STALE_TIMEOUT while
+# a single request rebuilds them.
+FEED_CACHE_TIMEOUT = config("FEED_CACHE_TIMEOUT", default=300, cast=int)
+FEED_CACHE_STALE_TIMEOUT = config("FEED_CACHE_STALE_TIMEOUT", default=3600, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -295,6 +311,83 @@ RAPIDAPI_BASKETBALL_HOST = config("RAPIDAPI_BASKETBALL_HOST")
 RAPIDAPI_BASKETBALL_KEY = config("RAPIDAPI_BASKETBALL_KEY")
 RAPIDAPI_NHL_HOST = config("RAPIDAPI_NHL_HOST")
 RAPIDAPI_NHL_KEY = config("RAPIDAPI_NHL_KEY")
+# Only the ingestion benchmark's local stand-in servers use plain http
+RAPIDAPI_SCHEME = config("RAPIDAPI_SCHEME", default="https")
+# Client-side limits, applied per RapidAPI key
+RAPIDAPI_REQUESTS_PER_MINUTE = config(
+    "RAPIDAPI_REQUESTS_PER_MINUTE", default=300, cast=int
+)
+RAPIDAPI_MAX_CONCURRENCY = config("RAPIDAPI_MAX_CONCURRENCY", default=8, cast=int)
+RAPIDAPI_CONNECT_TIMEOUT = config("RAPIDAPI_CONNECT_TIMEOUT", default=5, cast=int)
+RAPIDAPI_REQUEST_TIMEOUT = config("RAPIDAPI_REQUEST_TIMEOUT", default=30, cast=int)
+# Retries on 429/5xx and connection errors, with jittered exponential backoff
+RAPIDAPI_MAX_RETRIES = config("RAPIDAPI_MAX_RETRIES", default=3, cast=int)
+RAPIDAPI_RETRY_BACKOFF = config("RAPIDAPI_RETRY_BACKOFF", default=1.0, cast=float)
+# API response cache, in seconds per endpoint. Fixture pages where every
+# fixture is final are kept without expiry.
+RAPIDAPI_CACHE_DEFAULT_TTL = config("RAPIDAPI_CACHE_DEFAULT_TTL", default=600, cast=int)
+RAPIDAPI_CACHE_TTLS = {
+    "fixtures": 600,
+    "games": 600,
+    "predictions": 6 * 60 * 60,
+    "injuries": 30 * 60,
+    "standings": 60 * 60,
+    "leagues": 12 * 60 * 60,
+    "teams": 12 * 60 * 60,
+    "countries": 24 * 60 * 60,
+    "players": 24 * 60 * 60,
+}
+
+# Append-only zstd archive of the raw API payloads, replayed with
+# `manage.py replay_ingestion`; days older than API_ARCHIVE_MAX_AGE_DAYS are
+# pruned daily
+API_ARCHIVE_ENABLED = config("API_ARCHIVE_ENABLED", default=True, cast=bool)
+API_ARCHIVE_ROOT = config("API_ARCHIVE_ROOT", default=str(BASE_DIR / "archive"))
+API_ARCHIVE_LEVEL = config("API_ARCHIVE_LEVEL", default=10, cast=int)
+API_ARCHIVE_MAX_AGE_DAYS = config("API_ARCHIVE_MAX_AGE_DAYS", default=30, cast=int)
+
+# Upcoming matches whose API prediction is fetched per prefetch run
+PREDICTION_PREFETCH_BATCH_SIZE = config(
+    "PREDICTION_PREFETCH_BATCH_SIZE", default=200, cast=int
+)
+
+# Days of notifications listed in a user's inbox
+NOTIFICATION_INBOX_DAYS = config("NOTIFICATION_INBOX_DAYS", default=3, cast=int)
+# Upper bound on how long a cached unread count may be stale, e.g. after a
+# subscription change
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = config(
+    "NOTIFICATION_UNREAD_COUNT_TIMEOUT", default=300, cast=int
+)
+
+# FCM push outbox: messages sent concurrently per batch, and retries with
+# exponential backoff (seconds) before a message is dead-lettered
+NOTIFICATION_OUTBOX_BATCH_SIZE = config(
+    "NOTIFICATION_OUTBOX_BATCH_SIZE", default=100, cast=int
+)
+NOTIFICATION_OUTBOX_CONCURRENCY = config(
+    "NOTIFICATION_OUTBOX_CONCURRENCY", default=8, cast=int
+)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = config(
+    "NOTIFICATION_OUTBOX_MAX_ATTEMPTS", default=5, cast=int
+)
+NOTIFICATION_OUTBOX_RETRY_BACKOFF = config(
+    "NOTIFICATION_OUTBOX_RETRY_BACKOFF", default=30, cast=int
+)
+
+# Multicast batches of up to 500 tokens sent to Firebase at the same time
+FCM_MULTICAST_CONCURRENCY = config("FCM_MULTICAST_CONCURRENCY", default=4, cast=int)
+
+# Minutes before kickoff from which a match is polled for live scores
+LIVE_SCORES_LEAD_MINUTES = config("LIVE_SCORES_LEAD_MINUTES", default=15, cast=int)
+# Minutes between live polls of a whole day page, for sports without a
+# live-fixtures endpoint
+LIVE_SCORES_FALLBACK_MINUTES = config(
+    "LIVE_SCORES_FALLBACK_MINUTES", default=5, cast=int
+)
+
+# Logo asset store: concurrent downloads and how often a stored asset is revalidated
+ASSET_DOWNLOAD_CONCURRENCY = config("ASSET_DOWNLOAD_CONCURRENCY", default=8, cast=int)
+ASSET_REVALIDATE_DAYS = config("ASSET_REVALIDATE_DAYS", default=30, cast=int)
 
 # OpenAI Configuration
 OPENAI_API_KEY = config("OPENAI_API_KEY")
@@ -329,22 +422,36 @@ MOBILE_PREDICTION_PRODUCT_ID = config("MOBILE_PREDICTION_PRODUCT_ID")
 
 GOOGLE_SERVICE_ACCOUNT_KEY_PATH = config("GOOGLE_SERVICE_ACCOUNT_KEY_PATH")
 
-# Cron job configuration
-CRONJOBS = [
-    ("*/20 * * * *", "core.cron.update_scores"),
-    ("0 3 * * *", "core.cron.load_matches"),
-    ("0 0 * * *", "core.cron.update_league_season_year"),
-    ("0 */3 * * *", "core.cron.update_standings"),
-    ("*/10 * * * *", "notifications.cron.send_basketball_daily_picks_notification"),
-    ("*/10 * * * *", "notifications.cron.send_soccer_daily_picks_notification"),
-    ("*/10 * * * *", "notifications.cron.mark_soccer_notifications_as_not_important"),
+# Task queue: periodic tasks (crontab expressions, in TIME_ZONE) queued by
+# `manage.py run_tasks`, the worker's thread count, how often idle workers
+# poll, how often workers refresh the locks of their running tasks, after how
+# many seconds without a refresh a running task is considered abandoned, and
+# how many days finished tasks and their runs are kept
+TASK_WORKER_CONCURRENCY = config("TASK_WORKER_CONCURRENCY", default=4, cast=int)
+TASK_POLL_INTERVAL = config("TASK_POLL_INTERVAL", default=5, cast=float)
+TASK_HEARTBEAT_INTERVAL = config("TASK_HEARTBEAT_INTERVAL", default=60, cast=int)
+TASK_STALE_AFTER = config("TASK_STALE_AFTER", default=10 * 60, cast=int)
+TASK_RETENTION_DAYS = config("TASK_RETENTION_DAYS", default=14, cast=int)
+TASK_SCHEDULES = [
+    ("* * * * *", "core.poll_live_scores"),
+    ("0 * * * *", "core.update_scores"),
+    ("0 3 * * *", "core.load_matches"),
+    ("0 0 * * *", "core.update_league_season_year"),
+    ("30 0 * * *", "core.sync_league_rosters"),
+    ("0 */3 * * *", "core.update_standings"),
+    ("0 4 * * 1", "core.sync_players"),
+    ("15 0 * * *", "tasks.delete_finished_tasks"),
+    ("*/10 * * * *", "core.prefetch_match_predictions"),
+    ("45 0 * * *", "core.prune_api_archive"),
+    ("* * * * *", "notifications.dispatch_outbox"),
+    ("*/10 * * * *", "notifications.mark_soccer_notifications_as_not_important"),
     (
         "*/10 * * * *",
-        "notifications.cron.mark_basketball_notifications_as_not_important",
+        "notifications.mark_basketball_notifications_as_not_important",
     ),
     (
         "0 0 * * *",
-        "notifications.cron.delete_older_notifications",
+        "notifications.delete_older_notifications",
     ),
 ]
 
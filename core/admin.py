@@ -6,7 +6,7 @@ from django import forms
 from django.contrib import admin, messages
 from django.contrib.postgres.lookups import Unaccent
 from django.contrib.postgres.search import TrigramSimilarity
-from django.db.models import Min, Q, Value
+from django.db.models import Q, Value
 from django.db.models.functions import Greatest, Lower
 from django.utils import timezone
 from solo.admin import SingletonModelAdmin
@@ -15,6 +15,7 @@ from accounts.models import PurchasedPredictions, PurchasedTickets
 from core.models import (
     BetLine,
     FrequentlyAskedQuestion,
+    IngestionRun,
     PickOfTheDay,
     Prediction,
     SiteSettings,
@@ -22,6 +23,7 @@ from core.models import (
     SportLeague,
     SportMatch,
     SportTeam,
+    SyncCheckpoint,
     TeamStanding,
     Ticket,
 )
@@ -180,7 +182,7 @@ class SportMatchAdmin(admin.ModelAdmin):
     def refresh_football_view(self, request):
         start_time = timezone.now()
         end_time = start_time + timedelta(days=1)
-        FootballApiService().populate_matches(start_time, end_time)
+        FootballApiService(bypass_cache=True).populate_matches(start_time, end_time)
         self.message_user(
             request,
             f"✅ Football matches refreshed for {start_time.date()}–{end_time.date()}",
@@ -193,7 +195,7 @@ class SportMatchAdmin(admin.ModelAdmin):
     def refresh_basketball_view(self, request):
         start_time = timezone.now()
         end_time = start_time + timedelta(days=1)
-        BasketballApiService().populate_matches(start_time, end_time)
+        BasketballApiService(bypass_cache=True).populate_matches(start_time, end_time)
         self.message_user(
             request,
             f"🏀 Basketball matches refreshed for {start_time.date()}–{end_time.date()}",
@@ -293,13 +295,9 @@ class TicketAdmin(admin.ModelAdmin):
     status_display.admin_order_field = "status"
 
     def save_related(self, request, form, formsets, change):
+        # starts_at and the other bet line totals are kept up to date by
+        # TicketService as the inline bet lines are saved
         super().save_related(request, form, formsets, change)
-        ticket = form.instance
-        earliest_datetime = ticket.bet_lines.aggregate(Min("match__kickoff_datetime"))[
-            "match__kickoff_datetime__min"
-        ]
-        ticket.starts_at = earliest_datetime
-        ticket.save()
 
         products = Product.objects.all()
         for product in products:
@@ -320,6 +318,24 @@ class TicketAdmin(admin.ModelAdmin):
         )
 
 
+@admin.register(IngestionRun)
+class IngestionRunAdmin(admin.ModelAdmin):
+    list_display = ["job", "sport_type", "started_at", "duration", "rows_touched"]
+    list_filter = ["job", "sport_type"]
+    ordering = ["-started_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SyncCheckpoint)
+class SyncCheckpointAdmin(admin.ModelAdmin):
+    list_display = ["name", "last_page", "total_pages", "started_at", "finished_at"]
+
+
 admin.site.register(SiteSettings, SingletonModelAdmin)
 admin.site.register(SportCountry)
 admin.site.register(PurchasedPredictions)
@@ -110,13 +110,23 @@ class BetLineSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BetLine
-        fields = ["id", "match", "bet", "bet_type", "odds", "status"]
+        fields = [
+            "id",
+            "match",
+            "bet",
+            "bet_type",
+            "odds",
+            "status",
+            "same_as_previous",
+            "same_as_next",
+            "should_break_line",
+        ]
 
 
 class TicketHistorySerializer(serializers.ModelSerializer):
     object_type = serializers.SerializerMethodField()
     product = ProductSerializer()
-    bet_lines = BetLineSerializer(many=True)
+    bet_lines = BetLineSerializer(many=True, source="sorted_bet_lines")
     total_odds = serializers.SerializerMethodField()
 
     class Meta:
@@ -129,6 +139,7 @@ class TicketHistorySerializer(serializers.ModelSerializer):
             "starts_at",
             "bet_lines",
             "total_odds",
+            "legs_count",
             "visibility",
             "label",
             "stake",
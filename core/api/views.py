@@ -1,28 +1,21 @@
 from django.http import HttpResponse
 from django.views.decorators.http import require_POST
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from core.models import FrequentlyAskedQuestion, Prediction, Ticket
+from core.models import FrequentlyAskedQuestion, Prediction
+from core.services.feed_cache_service import FeedCacheService
+from core.services.feed_service import FeedService
+from core.services.history_timeline_service import TimelineCursor
 from subscriptions.models import Product
 from subscriptions.serializers import ProductSerializer
 import pytz
-from .serializers import (
-    FrequentlyAskedQuestionSerializer,
-    PredictionHistorySerializer,
-    PredictionSerializer,
-    TicketHistorySerializer,
-)
-
-
-def sort_ticket_bet_lines(ticket_data_list):
-    for ticket in ticket_data_list:
-        bet_lines = ticket.get("bet_lines", [])
-        if bet_lines:
-            bet_lines.sort(key=lambda x: x["match"]["id"])
+from .serializers import FrequentlyAskedQuestionSerializer, PredictionSerializer
 
 
 class PredictionPagination(PageNumberPagination):
@@ -116,113 +109,70 @@ class HistoryAPIView(APIView):
     authentication_classes = []
     permission_classes = []
 
-    def get_queryset(self):
-        # Existing queryset logic remains unchanged
-        product_filter = self.request.query_params.get("filter")
-        obj_filter = self.request.query_params.get("obj")
-
-        predictions = []
-        tickets = []
-
-        if obj_filter is None or obj_filter == "predictions":
-            predictions = Prediction.objects.filter(
-                visibility=Prediction.Visibility.PUBLIC,
-                status__in=[Prediction.Status.WON, Prediction.Status.LOST],
-            ).select_related(
-                "match__home_team", "match__away_team", "match__league", "product"
-            )
-            if product_filter:
-                predictions = predictions.filter(product__name__iexact=product_filter)
-
-        if obj_filter is None or obj_filter == "tickets":
-            tickets = Ticket.objects.filter(
-                visibility=Ticket.Visibility.PUBLIC,
-                status__in=[Ticket.Status.WON, Ticket.Status.LOST],
-            ).prefetch_related(
-                "bet_lines__match__home_team",
-                "bet_lines__match__away_team",
-                "bet_lines__match__league",
-                "product",
-            )
-            if product_filter:
-                tickets = tickets.filter(product__name__iexact=product_filter)
-
-        return predictions, tickets
+    def get_queryset(self, cursor=None):
+        return FeedService().get_history_queryset(
+            product_filter=self.request.query_params.get("filter") or None,
+            object_filter=self.request.query_params.get("obj") or None,
+            cursor=cursor,
+        )
 
     def get(self, request):
-        predictions, tickets = self.get_queryset()
-
-        # Serialize data
-        prediction_data = PredictionHistorySerializer(predictions, many=True).data
-        ticket_data = TicketHistorySerializer(tickets, many=True).data
-
-        # --- Sort bet lines within tickets ---
-        sort_ticket_bet_lines(ticket_data)
-
-        # Combine and sort
-        combined = []
-        for p in prediction_data:
-            p["datetime"] = p["match"]["kickoff_datetime"]
-            combined.append(p)
+        paginator = self.pagination_class()
 
-        for t in ticket_data:
-            t["datetime"] = t["starts_at"]
-            combined.append(t)
+        # Keyset pagination: ?after=<cursor>. An empty value asks for the first page.
+        if "after" in request.query_params:
+            return self._get_cursor_page(request, paginator)
+
+        items = paginator.paginate_queryset(self.get_queryset(), request, view=self)
+        return paginator.get_paginated_response([item.payload for item in items])
+
+    def _get_cursor_page(self, request, paginator):
+        cursor = None
+        after = request.query_params.get("after")
+        if after:
+            try:
+                cursor = TimelineCursor.decode(after)
+            except ValueError:
+                raise ValidationError({"after": "Invalid cursor."})
+
+        page_size = paginator.get_page_size(request)
+        items = list(self.get_queryset(cursor=cursor)[: page_size + 1])
+
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            last = items[-1]
+            next_cursor = TimelineCursor(
+                datetime=last.sort_datetime,
+                object_type=last.object_type,
+                id=last.object_id,
+            )
 
-        # Sort descending by datetime
-        combined.sort(key=lambda x: x["datetime"], reverse=True)
+        next_link = None
+        if next_cursor:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "after", next_cursor.encode()
+            )
 
-        # Paginate results
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(combined, request)
-        return paginator.get_paginated_response(page)
+        return Response(
+            {
+                "page_size": page_size,
+                "next_cursor": next_cursor.encode() if next_cursor else None,
+                "next": next_link,
+                "results": [item.payload for item in items],
+            }
+        )
 
 
 class UpcomingAPIView(APIView):
     permission_classes = []
 
     def get_queryset(self):
-        product_filter = self.request.query_params.get("filter")
-        obj_filter = self.request.query_params.get("obj")
-
-        predictions = []
-        tickets = []
-
-        if obj_filter is None or obj_filter == "predictions":
-            predictions = (
-                Prediction.objects.filter(
-                    visibility__in=self._get_visibility_filter(),
-                    status=Prediction.Status.PENDING,
-                )
-                .select_related(
-                    "match__home_team", "match__away_team", "match__league", "product"
-                )
-                .exclude(id=1053)
-                .order_by("match__kickoff_datetime")
-            )
-
-            if product_filter:
-                predictions = predictions.filter(product__name__iexact=product_filter)
-
-        if obj_filter is None or obj_filter == "tickets":
-            tickets = (
-                Ticket.objects.filter(
-                    visibility__in=self._get_visibility_filter(),
-                    status=Ticket.Status.PENDING,
-                )
-                .prefetch_related(
-                    "bet_lines__match__home_team",
-                    "bet_lines__match__away_team",
-                    "bet_lines__match__league",
-                    "product",
-                )
-                .order_by("product__name", "starts_at")
-            )
-
-            if product_filter:
-                tickets = tickets.filter(product__name__iexact=product_filter)
-
-        return predictions, tickets
+        return FeedService().get_upcoming_queryset(
+            visibility=self._get_visibility_filter(),
+            product_filter=self.request.query_params.get("filter"),
+            object_filter=self.request.query_params.get("obj"),
+        )
 
     def _get_visibility_filter(self):
         visibility = [Prediction.Visibility.PUBLIC]
@@ -231,33 +181,22 @@ class UpcomingAPIView(APIView):
 
         return visibility
 
-    def get(self, request):
-        predictions, tickets = self.get_queryset()
-
-        # Serialize data
-        prediction_data = PredictionSerializer(predictions, many=True).data
-        ticket_data = TicketHistorySerializer(tickets, many=True).data
-
-        # --- Sort bet lines within tickets ---
-        sort_ticket_bet_lines(ticket_data)
-
-        # Combine and add metadata for sorting
-        combined = []
-        for p in prediction_data:
-            p["object_type"] = "prediction"
-            p["datetime"] = p["match"]["kickoff_datetime"]
-            combined.append(p)
+    def _get_cache_key_parts(self):
+        return [
+            "upcoming-api",
+            "admin" if self.request.user.is_superuser else "public",
+            self.request.query_params.get("filter"),
+            self.request.query_params.get("obj"),
+        ]
 
-        for t in ticket_data:
-            t["object_type"] = "ticket"
-            t["datetime"] = t["starts_at"]
-            combined.append(t)
-
-        # Sort by type (ticket comes first) and then by datetime
+    def get(self, request):
+        # Items are stored pre-serialized, tickets first and then by datetime.
         # This matches the UpcomingMatchesView sorting logic
-        combined.sort(key=lambda x: (x["object_type"] != "ticket", x["datetime"]))
-
-        return Response(combined)
+        payloads = FeedCacheService().get_or_build(
+            self._get_cache_key_parts(),
+            lambda: list(self.get_queryset().values_list("payload", flat=True)),
+        )
+        return Response(payloads)
 
 
 @require_POST
@@ -0,0 +1,246 @@
+import math
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+
+from core.models import ApiSportModel, SportCountry, SportLeague
+from core.services.fake_rapidapi import FakeRapidApiServer
+from core.services.payload_archive import PayloadArchive
+from subscriptions.models import Product
+from tasks.registry import get_task
+from tasks.services.task_worker import TaskWorker
+
+# Task, and the number of days of fixtures it fetches
+JOBS = {
+    "core.load_matches": 8,
+    "core.update_scores": 1,
+    "core.poll_live_scores": 1,
+    "core.update_standings": 1,
+}
+# Fixtures per benchmark league
+FIXTURES_PER_LEAGUE = 100
+
+
+class QueryCounter:
+    """
+    Counts the queries, and the rows written by INSERT/UPDATE/DELETE
+    statements, on every DB connection, including those opened by the
+    worker threads of the ingestion jobs.
+
+    Rows are taken from the cursor's rowcount, which SQLite doesn't report
+    for INSERT ... RETURNING; the counts are exact on PostgreSQL.
+    """
+
+    WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+
+        rows_written = 0
+        if sql.lstrip().upper().startswith(self.WRITE_STATEMENTS):
+            rows_written = max(context["cursor"].rowcount, 0)
+
+        with self.lock:
+            self.counts["queries"] += 1
+            self.counts["rows_written"] += rows_written
+
+        return result
+
+    def install(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def reset(self) -> Counter:
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+
+        return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the ingestion tasks against local stand-in RapidAPI servers, "
+        "on a throwaway test database"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            type=lambda value: [int(n) for n in value.split(",")],
+            default=[1_000, 10_000, 100_000],
+            help="Comma-separated fixture counts per job (default: 1000,10000,100000)",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=lambda value: value.split(","),
+            default=list(JOBS),
+            help=f"Comma-separated jobs to run (default: {','.join(JOBS)})",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Seconds the stand-in servers wait before every response",
+        )
+        parser.add_argument(
+            "--throttle-every",
+            type=int,
+            default=0,
+            help="Answer every n-th request with 429 (default: never)",
+        )
+        parser.add_argument(
+            "--requests-per-minute",
+            type=int,
+            default=settings.RAPIDAPI_REQUESTS_PER_MINUTE,
+            help="Client-side rate limit per stand-in server",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Serve payloads recorded in the API archive where available",
+        )
+
+    def handle(self, *args, **kwargs):
+        unknown_jobs = set(kwargs["jobs"]) - set(JOBS)
+        if unknown_jobs:
+            raise CommandError(f"Unknown jobs: {', '.join(sorted(unknown_jobs))}")
+
+        recorded = self._load_recorded() if kwargs["archive"] else {}
+        servers = {
+            sport_type: FakeRapidApiServer(
+                sport_type,
+                latency=kwargs["latency"],
+                throttle_every=kwargs["throttle_every"],
+                recorded=recorded,
+            ).start()
+            for sport_type in (
+                ApiSportModel.SportType.SOCCER,
+                ApiSportModel.SportType.BASKETBALL,
+            )
+        }
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        query_counter = QueryCounter()
+        connection_created.connect(query_counter.install)
+        query_counter.install(None, connection)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(
+                RAPIDAPI_SCHEME="http",
+                RAPIDAPI_SOCCER_HOST=servers[ApiSportModel.SportType.SOCCER].host,
+                RAPIDAPI_SOCCER_KEY="benchmark-soccer",
+                RAPIDAPI_BASKETBALL_HOST=servers[
+                    ApiSportModel.SportType.BASKETBALL
+                ].host,
+                RAPIDAPI_BASKETBALL_KEY="benchmark-basketball",
+                RAPIDAPI_REQUESTS_PER_MINUTE=kwargs["requests_per_minute"],
+                RAPIDAPI_CACHE_DEFAULT_TTL=0,
+                RAPIDAPI_CACHE_TTLS={},
+                API_ARCHIVE_ENABLED=False,
+                # Keeps the benchmark off the real Redis; cleared for every scenario
+                CACHES={
+                    "default": {
+                        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                        "LOCATION": "benchmark-ingestion",
+                    }
+                },
+                TASK_POLL_INTERVAL=0.05,
+                MEDIA_ROOT=media_root,
+            ):
+                for scenario in kwargs["scenarios"]:
+                    self._run_scenario(scenario, kwargs["jobs"], servers, query_counter)
+        finally:
+            connection_created.disconnect(query_counter.install)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            for server in servers.values():
+                server.stop()
+
+    def _run_scenario(self, scenario, jobs, servers, query_counter):
+        # Football and basketball split the fixtures of every job
+        fixtures_per_sport = math.ceil(scenario / len(servers))
+        for server in servers.values():
+            server.leagues = max(1, fixtures_per_sport // FIXTURES_PER_LEAGUE)
+
+        call_command("flush", interactive=False, verbosity=0)
+        # The servers keep their hosts across scenarios, so cached pages
+        # (final fixture pages never expire) would leak into the next one
+        cache.clear()
+        self._seed(servers)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{scenario} fixtures per job"))
+        for job in jobs:
+            for server in servers.values():
+                server.fixtures_per_day = math.ceil(fixtures_per_sport / JOBS[job])
+                server.reset_counts()
+            query_counter.reset()
+
+            # The job and the sub-tasks it fans out, drained by a worker
+            started_at = time.monotonic()
+            get_task(job).enqueue()
+            TaskWorker(scheduler=False).run(burst=True)
+            elapsed = time.monotonic() - started_at
+
+            counts = query_counter.reset()
+            http_calls = sum(server.requests for server in servers.values())
+            throttled = sum(server.throttled for server in servers.values())
+            self.stdout.write(
+                f"  {job:<22} {elapsed:>9.2f}s  {counts['queries']:>8} queries  "
+                f"{http_calls:>6} HTTP calls ({throttled} throttled)  "
+                f"{counts['rows_written']:>8} rows written"
+            )
+
+    def _seed(self, servers):
+        """
+        Create the products and the leagues the stand-in servers serve fixtures
+        for; teams and matches are left to the jobs.
+        """
+        products = {
+            ApiSportModel.SportType.SOCCER: Product.objects.create(
+                name=Product.Names.SOCCER
+            ),
+            ApiSportModel.SportType.BASKETBALL: Product.objects.create(
+                name=Product.Names.BASKETBALL
+            ),
+        }
+        country = SportCountry.objects.create(name="Benchmark")
+
+        SportLeague.objects.bulk_create(
+            [
+                SportLeague(
+                    type=sport_type,
+                    product=products[sport_type],
+                    external_id=external_id,
+                    name=f"League {external_id}",
+                    country=country,
+                    league_type="League",
+                    current_season_year=date.today().year,
+                    api_coverage_data={"standings": True},
+                )
+                for sport_type, server in servers.items()
+                for external_id in server.get_league_ids()
+            ]
+        )
+
+    def _load_recorded(self) -> dict:
+        archive = PayloadArchive()
+        recorded = {}
+        for endpoint in ("fixtures", "games", "standings"):
+            for path in archive.get_segments(endpoint):
+                for record in archive.read(path):
+                    recorded[record["url"]] = record["payload"]
+
+        self.stdout.write(f"Loaded {len(recorded)} recorded payloads")
+        return recorded
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from core.models import FeedItem, Prediction, Ticket
+from core.services.feed_service import FeedService
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized feed items from predictions and tickets"
+
+    def handle(self, *args, **kwargs):
+        feed_service = FeedService()
+
+        predictions = self._sync(
+            Prediction.objects.order_by("id"), feed_service.sync_predictions
+        )
+        self.stdout.write(f"Synced {predictions} prediction feed items")
+
+        tickets = self._sync(Ticket.objects.order_by("id"), feed_service.sync_tickets)
+        self.stdout.write(f"Synced {tickets} ticket feed items")
+
+        # Drop items whose source object no longer exists
+        deleted, _ = (
+            FeedItem.objects.filter(object_type=FeedItem.ObjectType.PREDICTION)
+            .exclude(object_id__in=Prediction.objects.values("id"))
+            .delete()
+        )
+        deleted += (
+            FeedItem.objects.filter(object_type=FeedItem.ObjectType.TICKET)
+            .exclude(object_id__in=Ticket.objects.values("id"))
+            .delete()[0]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} orphaned feed items"))
+
+    def _sync(self, queryset, sync):
+        ids = list(queryset.values_list("id", flat=True))
+        total = 0
+        for i in range(0, len(ids), BATCH_SIZE):
+            total += sync(queryset.filter(id__in=ids[i : i + BATCH_SIZE]))
+
+        return total
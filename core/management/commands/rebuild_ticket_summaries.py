@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Ticket
+from core.services.ticket_service import TicketService
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored bet line layout and totals of every ticket"
+
+    def handle(self, *args, **kwargs):
+        ticket_service = TicketService()
+        ticket_ids = list(Ticket.objects.order_by("id").values_list("id", flat=True))
+
+        updated = 0
+        for i in range(0, len(ticket_ids), BATCH_SIZE):
+            updated += ticket_service.refresh_tickets(ticket_ids[i : i + BATCH_SIZE])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {updated} bet lines and tickets across {len(ticket_ids)} tickets"
+            )
+        )
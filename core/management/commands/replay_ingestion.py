@@ -0,0 +1,73 @@
+import time
+from collections import Counter
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.basketball_api_service import BasketballApiService
+from core.services.football_api_service import FootballApiService
+from core.services.hocker_api_service import HockeyApiService
+from core.services.lookup_cache import LookupCache
+from core.services.payload_archive import PayloadArchive
+
+# Service, fixture-list endpoint and host setting of every sport. Basketball
+# and hockey share the endpoint name, so segments are always picked by host.
+SPORTS = {
+    "soccer": (FootballApiService, "fixtures", "RAPIDAPI_SOCCER_HOST"),
+    "basketball": (BasketballApiService, "games", "RAPIDAPI_BASKETBALL_HOST"),
+    "hockey": (HockeyApiService, "games", "RAPIDAPI_NHL_HOST"),
+}
+
+
+class Command(BaseCommand):
+    help = "Replay archived fixture payloads through the ingestion pipeline, without calling the API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("sport", choices=list(SPORTS), help="Sport to replay")
+        parser.add_argument(
+            "--start", type=date.fromisoformat, help="First archive day (YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--end", type=date.fromisoformat, help="Last archive day (YYYY-MM-DD)"
+        )
+        parser.add_argument(
+            "--host",
+            type=str,
+            help="Replay the payloads of this RapidAPI host instead of the sport's configured one",
+        )
+
+    def handle(self, *args, **kwargs):
+        service_class, endpoint, host_setting = SPORTS[kwargs["sport"]]
+        host = kwargs["host"] or getattr(settings, host_setting)
+        service = service_class(LookupCache())
+        archive = PayloadArchive()
+
+        segments = archive.get_segments(
+            endpoint,
+            host=host,
+            start_date=kwargs["start"],
+            end_date=kwargs["end"],
+        )
+        if not segments:
+            raise CommandError(
+                f"No archived {host}/{endpoint} payloads in {archive.root}"
+            )
+
+        stats = Counter()
+        started_at = time.monotonic()
+        for path in segments:
+            for record in archive.read(path):
+                items = record["payload"].get("response") or []
+                stats["pages_replayed"] += 1
+                stats.update(service._process_fixtures(items))
+
+            self.stdout.write(f"Replayed {path}")
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {stats['fixtures_seen']} fixtures from {len(segments)} segments "
+                f"in {elapsed:.2f}s ({stats['fixtures_seen'] / max(elapsed, 1e-9):.0f}/s): {dict(stats)}"
+            )
+        )
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from core.services.api.league_service import LeagueService
+
+
+class Command(BaseCommand):
+    help = "Sync the current-season teams of every football league with API-Football"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the teams that would be added and removed",
+        )
+
+    def handle(self, *args, **kwargs):
+        diff = LeagueService().map_teams_to_leagues(dry_run=kwargs["dry_run"])
+
+        for league_external_id, changes in sorted(diff.items()):
+            if (
+                not changes["added"]
+                and not changes["removed"]
+                and not changes["missing"]
+            ):
+                continue
+
+            self.stdout.write(
+                f"League {league_external_id}: +{changes['added']} -{changes['removed']} "
+                f"missing {changes['missing']} ({changes['unchanged']} unchanged)"
+            )
+
+        added = sum(len(changes["added"]) for changes in diff.values())
+        removed = sum(len(changes["removed"]) for changes in diff.values())
+        prefix = "Dry run, nothing written: " if kwargs["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{added} league teams to add and {removed} to remove "
+                f"across {len(diff)} leagues."
+            )
+        )
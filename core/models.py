@@ -203,6 +203,9 @@ class SportMatch(ApiSportModel):
     away_team_score = models.CharField(blank=True)
     kickoff_datetime = models.DateTimeField(db_index=True)
     metadata = models.JSONField(null=True, blank=True)
+    tracker = FieldTracker(
+        fields=["home_team_score", "away_team_score", "status", "kickoff_datetime"]
+    )
 
     @property
     def is_live(self):
@@ -331,26 +334,22 @@ class Ticket(BaseInternalModel):
     starts_at = models.DateTimeField(null=True, blank=True)
     label = models.CharField(max_length=255, blank=True)
     stake = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # Summary of the bet lines, maintained by TicketService whenever they change
+    total_odds = models.DecimalField(max_digits=20, decimal_places=4, default=1)
+    legs_count = models.PositiveSmallIntegerField(default=0)
     tracker = FieldTracker()
 
     @property
-    def total_odds(self) -> float:
+    def sorted_bet_lines(self) -> list:
         """
-        Calculate the total odds for all bet lines associated with this instance.
-
-        This property computes the product of the odds of all related bet lines. It
-        iterates over all bet line objects connected to the instance and multiplies
-        their respective odds to produce the final total odds value.
+        Bet lines in their precomputed layout order, grouped by match.
 
-        @return: The calculated total odds of all related bet lines as a float.
+        Sorted in Python so a prefetched ``bet_lines`` is reused.
         """
-        odds = 1
-        for match in self.bet_lines.all():
-            if not match.odds:
-                continue
-
-            odds *= match.odds
-        return odds
+        return sorted(
+            self.bet_lines.all(),
+            key=lambda bet_line: (bet_line.layout_position, bet_line.id),
+        )
 
     @property
     def formatted_stake(self):
@@ -374,9 +373,6 @@ class Ticket(BaseInternalModel):
         return f"{stake:.2f}".rstrip("0").rstrip(".")
 
     def __str__(self):
-        # get the first match from the bet lines by date
-        first_match = self.bet_lines.order_by("match__kickoff_datetime").first()
-
         return f"[{self.product.name}] {self.label} ({self.status})"
 
 
@@ -397,6 +393,12 @@ class BetLine(BaseInternalModel):
     bet_type = models.CharField(max_length=255)
     odds = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
 
+    # Ticket layout, maintained by TicketService whenever the ticket's bet lines change
+    layout_position = models.PositiveSmallIntegerField(default=0)
+    same_as_previous = models.BooleanField(default=False)
+    same_as_next = models.BooleanField(default=False)
+    should_break_line = models.BooleanField(default=True)
+
     def __str__(self):
         return (
             f"{self.match.home_team.name} vs {self.match.away_team.name} ({self.bet})"
@@ -422,3 +424,115 @@ class Player(ApiSportModel):
     number = models.CharField(max_length=255, null=True, blank=True)
     position = models.CharField(max_length=255, null=True, blank=True)
     photo = models.FileField(upload_to="assets/players/photos/", null=True, blank=True)
+
+
+class FeedItem(BaseInternalModel):
+    """
+    Denormalized timeline row for a Prediction or Ticket, holding the
+    pre-rendered API payload so feed endpoints don't have to join and
+    serialize the underlying objects on every request.
+    """
+
+    class ObjectType(models.TextChoices):
+        PREDICTION = "prediction", "Prediction"
+        TICKET = "ticket", "Ticket"
+
+    object_type = models.CharField(max_length=10, choices=ObjectType)
+    object_id = models.BigIntegerField()
+    product = models.ForeignKey(
+        "subscriptions.Product", on_delete=models.SET_NULL, null=True
+    )
+    visibility = models.CharField(max_length=10)
+    status = models.CharField(max_length=10)
+    sort_datetime = models.DateTimeField(null=True)
+    payload = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"{self.object_type} #{self.object_id} ({self.status})"
+
+    class Meta:
+        verbose_name = "Feed Item"
+        verbose_name_plural = "Feed Items"
+        unique_together = ("object_type", "object_id")
+        indexes = [
+            models.Index(
+                fields=["status", "visibility", "-sort_datetime"],
+                name="feeditem_history_idx",
+            ),
+            models.Index(
+                fields=["status", "visibility", "object_type", "sort_datetime"],
+                name="feeditem_upcoming_idx",
+            ),
+        ]
+
+
+class IngestionRun(BaseInternalModel):
+    """
+    Metrics of one fixture ingestion run for one sport, so the cost of the
+    polling jobs can be followed over time.
+    """
+
+    job = models.CharField(max_length=64, db_index=True)
+    sport_type = models.CharField(max_length=20, choices=ApiSportModel.SportType)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    rows_touched = models.PositiveIntegerField(default=0)
+    stats = models.JSONField(default=dict)
+
+    @property
+    def duration(self) -> timedelta:
+        return self.finished_at - self.started_at
+
+    def __str__(self):
+        return f"{self.job} ({self.sport_type}) at {self.started_at}"
+
+    class Meta:
+        verbose_name = "Ingestion Run"
+        verbose_name_plural = "Ingestion Runs"
+        ordering = ["-started_at"]
+
+
+class SyncCheckpoint(BaseInternalModel):
+    """
+    Progress of a paginated catalog sync, so a sync that stopped halfway
+    resumes after the last page it completed instead of starting over.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    last_page = models.PositiveIntegerField(default=0)
+    total_pages = models.PositiveIntegerField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_at is not None
+
+    def __str__(self):
+        return f"{self.name}: page {self.last_page}/{self.total_pages or '?'}"
+
+    class Meta:
+        verbose_name = "Sync Checkpoint"
+        verbose_name_plural = "Sync Checkpoints"
+
+
+class Asset(BaseInternalModel):
+    """
+    A downloaded remote asset (team, league or country logo), remembered by
+    source URL with its HTTP validators and content hash, so it is only
+    fetched again when it is missing locally or has changed upstream.
+    """
+
+    source_url = models.CharField(max_length=500, unique=True)
+    path = models.CharField(max_length=255)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    checked_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.path
+
+    class Meta:
+        verbose_name = "Asset"
+        verbose_name_plural = "Assets"
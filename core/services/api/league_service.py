@@ -1,4 +1,8 @@
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
 
 from core.models import ApiSportModel, SportLeague, SportLeagueTeam, SportTeam
 from core.services.api.in_progress.BaseApiFootballService import BaseApiFootballService
@@ -30,66 +34,165 @@ class LeagueService(BaseApiFootballService):
                 coverage=active_season_with_coverage.get("coverage"),
             )
 
-    def map_teams_to_leagues(self):
-        endpoint = "teams"
-        sport_leagues = SportLeague.objects.filter(
-            type=ApiSportModel.SportType.SOCCER, current_season_year__isnull=False
+    def map_teams_to_leagues(self, dry_run: bool = False) -> dict:
+        """
+        Sync the current-season rosters of the football leagues.
+
+        Rosters are fetched concurrently, teams resolved with one query and
+        compared against the existing SportLeagueTeam rows of each league's
+        season; the links to add and remove are then written in bulk. Leagues
+        whose roster couldn't be fetched, or came back empty, are left as
+        they are.
+
+        @return: Per league external ID, the team external IDs ``added``,
+                 ``removed`` and ``missing`` (no SportTeam yet), and the
+                 number of links ``unchanged``. Nothing is written with
+                 ``dry_run``.
+        """
+        leagues = list(
+            SportLeague.objects.filter(
+                type=ApiSportModel.SportType.SOCCER, current_season_year__isnull=False
+            )
         )
 
-        for league in sport_leagues:
-            # sleep to avoid hitting API rate limits
-            sleep(0.5)
-            query_params = {
-                "league": league.external_id,
-                "season": league.current_season_year,
+        with ThreadPoolExecutor(
+            max_workers=settings.RAPIDAPI_MAX_CONCURRENCY
+        ) as executor:
+            rosters = {
+                league: roster
+                for league, roster in zip(
+                    leagues, executor.map(self._fetch_roster, leagues)
+                )
+                if roster
             }
-            response = self.get_endpoint(endpoint=endpoint, query_params=query_params)
-            body = response.get("response", [])
 
-            if not body:
-                self.log.info(
-                    f"No teams found for league {league.external_id} in season {league.current_season_year}."
+        team_ids = dict(
+            SportTeam.objects.filter(
+                type=ApiSportModel.SportType.SOCCER,
+                external_id__in=set().union(*rosters.values()),
+            ).values_list("external_id", "id")
+        )
+
+        existing = {}
+        for (
+            link_id,
+            league_id,
+            season,
+            team_external_id,
+        ) in SportLeagueTeam.objects.filter(
+            league__in=rosters,
+            season__in={league.current_season_year for league in rosters},
+        ).values_list(
+            "id", "league_id", "season", "team__external_id"
+        ):
+            existing.setdefault((league_id, season), {})[team_external_id] = link_id
+
+        diff = {}
+        links_to_create = []
+        link_ids_to_delete = []
+        for league, roster in rosters.items():
+            current = existing.get((league.id, league.current_season_year), {})
+            wanted = {external_id for external_id in roster if external_id in team_ids}
+            added = wanted - set(current)
+            removed = set(current) - wanted
+
+            diff[league.external_id] = {
+                "added": sorted(added),
+                "removed": sorted(removed),
+                "missing": sorted(roster - wanted),
+                "unchanged": len(wanted) - len(added),
+            }
+            links_to_create.extend(
+                SportLeagueTeam(
+                    league=league,
+                    team_id=team_ids[external_id],
+                    season=league.current_season_year,
                 )
-                continue
+                for external_id in added
+            )
+            link_ids_to_delete.extend(current[external_id] for external_id in removed)
+
+        self.log.info(
+            f"{'Dry run: ' if dry_run else ''}{len(links_to_create)} league teams to add "
+            f"and {len(link_ids_to_delete)} to remove across {len(rosters)} leagues."
+        )
+        if dry_run:
+            return diff
+
+        with transaction.atomic():
+            SportLeagueTeam.objects.bulk_create(links_to_create, ignore_conflicts=True)
+            SportLeagueTeam.objects.filter(id__in=link_ids_to_delete).delete()
+
+        return diff
+
+    def _fetch_roster(self, league: SportLeague) -> set:
+        """
+        @return: The external IDs of the teams in the league's current season,
+                 empty when they couldn't be fetched.
+        """
+        query_params = {
+            "league": league.external_id,
+            "season": league.current_season_year,
+        }
+        try:
+            response = self.get_endpoint(endpoint="teams", query_params=query_params)
+        except requests.exceptions.RequestException:
+            return set()
+
+        roster = {
+            item.get("team", {}).get("id")
+            for item in response.get("response", [])
+            if item.get("team", {}).get("id")
+        }
+        if not roster:
+            self.log.info(
+                f"No teams found for league {league.external_id} in season {league.current_season_year}."
+            )
 
-            for item in body:
-                team_external_id = item.get("team", {}).get("id")
-                if not team_external_id:
-                    self.log.warning(
-                        f"Team ID not found for league {league.external_id}. Skipping."
-                    )
-                    continue
-
-                sport_team = SportTeam.objects.filter(
-                    external_id=team_external_id, type=ApiSportModel.SportType.SOCCER
-                ).first()
-
-                if not sport_team:
-                    self.log.warning(
-                        f"SportTeam not found for external ID {team_external_id}. Skipping."
-                    )
-                    continue
-
-                try:
-                    SportLeagueTeam.objects.create(
-                        league=league,
-                        team=sport_team,
-                        season=league.current_season_year,
-                    )
-                    self.log.info(
-                        f"Mapped team {team_external_id} to league {league.external_id}."
-                    )
-                except Exception as e:
-                    self.log.error(
-                        f"Error mapping team {team_external_id} to league {league.external_id}: {e}"
-                    )
+        return roster
 
     def fetch_and_update_team_standings(self):
+        """
+        Refresh the standings of every league with standings coverage. Leagues
+        are refreshed concurrently; the shared RapidAPI token bucket keeps the
+        requests within the quota.
+        """
+        leagues = self.get_standings_leagues()
+        team_standing_service = TeamStandingsService()
+
+        def update(league):
+            self.log.info(
+                f"Updating standings for league {league.external_id} in season {league.current_season_year}."
+            )
+            try:
+                return team_standing_service.update_team_standings(
+                    league.external_id, league.current_season_year
+                )
+            except Exception as e:
+                self.log.error(
+                    f"Error updating standings for league {league.external_id}: {e}"
+                )
+                return 0
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(
+            max_workers=settings.RAPIDAPI_MAX_CONCURRENCY
+        ) as executor:
+            updated = sum(executor.map(update, leagues))
+
+        self.log.info(f"Updated {updated} standings across {len(leagues)} leagues.")
+
+    def get_standings_leagues(self) -> list:
+        """
+        @return: The football leagues of the current season with standings
+                 coverage.
+        """
         sport_leagues = SportLeague.objects.filter(
             type=ApiSportModel.SportType.SOCCER, current_season_year__isnull=False
         )
 
-        team_standing_service = TeamStandingsService()
+        leagues = []
         for league in sport_leagues:
             metadata = league.api_coverage_data
 
@@ -99,14 +202,9 @@ class LeagueService(BaseApiFootballService):
                 )
                 continue
 
-            sleep(0.5)
+            leagues.append(league)
 
-            self.log.info(
-                f"Updating standings for league {league.external_id} in season {league.current_season_year}."
-            )
-            team_standing_service.update_team_standings(
-                league.external_id, league.current_season_year
-            )
+        return leagues
 
     def _find_active_season_with_coverage(self, seasons) -> dict:
         if not seasons:
@@ -1,75 +1,196 @@
-import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from time import sleep
+from typing import Optional
 
-from core.models import ApiSportModel, Player
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import ApiSportModel, Player, SyncCheckpoint
 from core.services.api.in_progress.BaseApiFootballService import BaseApiFootballService
 from subscriptions.models import Product
 
+# Fields refreshed on players that already exist
+PLAYER_UPDATE_FIELDS = [
+    "full_name",
+    "first_name",
+    "last_name",
+    "age",
+    "birth_date",
+    "birth_place",
+    "birth_country",
+    "nationality",
+    "height",
+    "weight",
+    "number",
+    "position",
+]
+
 
 class PlayerService(BaseApiFootballService):
+    CHECKPOINT_NAME = "players/profiles"
 
-    def fetch_player_profiles(self):
+    def fetch_player_profiles(self, restart: bool = False) -> Counter:
         """
-        Fetches player profiles from the API.
+        Sync the player catalog from ``players/profiles``.
+
+        Pages are downloaded concurrently under the client's rate limit and
+        written in page order, one bulk upsert each. The last written page is
+        checkpointed, so a sync that failed resumes after it; a finished sync
+        (or ``restart``) starts over from the first page.
+
+        @return: Page and player counts of this run.
         """
-        endpoint = "players/profiles"
-        current_page = 1
-        max_pages = 2
+        checkpoint, _ = SyncCheckpoint.objects.get_or_create(name=self.CHECKPOINT_NAME)
+        if restart or checkpoint.is_finished or not checkpoint.last_page:
+            checkpoint.last_page = 0
+            checkpoint.total_pages = None
+            checkpoint.started_at = timezone.now()
+            checkpoint.finished_at = None
+            checkpoint.save()
+        else:
+            self.log.info(f"Resuming player sync after page {checkpoint.last_page}")
 
         product = Product.objects.filter(name=Product.Names.SOCCER).first()
+        stats = Counter()
+        started_at = time.monotonic()
 
-        while current_page <= max_pages:
-            sleep(0.5)
-            response = self.get_endpoint(
-                endpoint=endpoint, query_params={"page": current_page}
-            )
-            paging = response.get("paging", {})
-            body = response.get("response", [])
-
-            if not body:
-                self.log.info("No more player profiles found.")
-                break
-
-            max_pages = paging.get("total")
-            current_page += 1
-            print("Current page:", current_page)
-
-            for item in body:
-                data = item.get("player", {})
-                if not data:
-                    self.log.warning(f"No player data found for item: {item}")
-                    continue
-
-                birth_date_string = None
-                birth_place = None
-                birth_country = None
-                print(json.dumps(data, indent=2))
-
-                if data["birth"]:
-                    birth_date_string = data["birth"].get("date")
-                    birth_place = data["birth"].get("place")
-                    birth_country = data["birth"].get("country")
-
-                Player.objects.create(
-                    product=product,
-                    type=ApiSportModel.SportType.TEMP_FIX,
-                    external_id=data["id"],
-                    full_name=data["name"],
-                    first_name=data["firstname"],
-                    last_name=data["lastname"],
-                    age=data["age"],
-                    birth_date=(
-                        datetime.strptime(birth_date_string, "%Y-%m-%d")
-                        if birth_date_string
-                        else None
-                    ),
-                    birth_place=birth_place,
-                    birth_country=birth_country,
-                    nationality=data["nationality"],
-                    height=data["height"],
-                    weight=data["weight"],
-                    number=data["number"],
-                    position=data["position"],
-                    photo=None,
+        # The first page tells how many there are
+        first_page = checkpoint.last_page + 1
+        response = self._fetch_page(first_page)
+        if response is None:
+            raise RuntimeError(f"Failed to fetch player profiles page {first_page}")
+
+        total_pages = response.get("paging", {}).get("total") or first_page
+        self._write_page(checkpoint, first_page, total_pages, response, product, stats)
+
+        pages = range(first_page + 1, total_pages + 1)
+        executor = ThreadPoolExecutor(max_workers=settings.RAPIDAPI_MAX_CONCURRENCY)
+        try:
+            # map yields in page order, so the checkpoint never skips a page
+            for page, response in zip(pages, executor.map(self._fetch_page, pages)):
+                if response is None:
+                    raise RuntimeError(f"Failed to fetch player profiles page {page}")
+
+                self._write_page(
+                    checkpoint, page, total_pages, response, product, stats
                 )
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        checkpoint.finished_at = timezone.now()
+        checkpoint.save(update_fields=["finished_at", "updated_at"])
+
+        elapsed = time.monotonic() - started_at
+        self.log.info(
+            f"Synced {stats['players_seen']} players from {stats['pages_fetched']} pages "
+            f"in {elapsed:.2f}s ({stats['players_seen'] / max(elapsed, 1e-9):.0f}/s): {dict(stats)}"
+        )
+        return stats
+
+    def _fetch_page(self, page: int) -> Optional[dict]:
+        try:
+            return self.get_endpoint(
+                endpoint="players/profiles", query_params={"page": page}
+            )
+        except requests.exceptions.RequestException:
+            return None
+
+    def _write_page(
+        self,
+        checkpoint: SyncCheckpoint,
+        page: int,
+        total_pages: int,
+        response: dict,
+        product: Optional[Product],
+        stats: Counter,
+    ) -> None:
+        stats["pages_fetched"] += 1
+        stats.update(self._upsert_players(response.get("response") or [], product))
+
+        checkpoint.last_page = page
+        checkpoint.total_pages = total_pages
+        checkpoint.save(update_fields=["last_page", "total_pages", "updated_at"])
+
+    def _upsert_players(self, items: list, product: Optional[Product]) -> Counter:
+        """
+        Write one page of player profiles with a single bulk upsert on
+        ``(external_id, type)``, skipping the players that didn't change.
+
+        @return: created/updated/unchanged counts for the page.
+        """
+        stats = Counter(players_seen=len(items))
+        players = {}
+        for item in items:
+            player = self._parse_player(item.get("player") or {}, product)
+            if player is None:
+                self.log.warning(f"No player data found for item: {item}")
+                stats["players_skipped"] += 1
+                continue
+
+            players[player.external_id] = player
+
+        existing = {
+            player.external_id: player
+            for player in Player.objects.filter(
+                type=ApiSportModel.SportType.TEMP_FIX, external_id__in=list(players)
+            ).only("external_id", *PLAYER_UPDATE_FIELDS)
+        }
+
+        players_to_write = []
+        for external_id, player in players.items():
+            current = existing.get(external_id)
+            if current is None:
+                stats["players_created"] += 1
+            elif any(
+                getattr(current, field) != getattr(player, field)
+                for field in PLAYER_UPDATE_FIELDS
+            ):
+                stats["players_updated"] += 1
+            else:
+                stats["players_unchanged"] += 1
+                continue
+
+            players_to_write.append(player)
+
+        if players_to_write:
+            Player.objects.bulk_create(
+                players_to_write,
+                update_conflicts=True,
+                unique_fields=["external_id", "type"],
+                update_fields=[*PLAYER_UPDATE_FIELDS, "updated_at"],
+            )
+
+        return stats
+
+    def _parse_player(self, data: dict, product: Optional[Product]) -> Optional[Player]:
+        if not data.get("id"):
+            return None
+
+        birth = data.get("birth") or {}
+        birth_date_string = birth.get("date")
+
+        return Player(
+            product=product,
+            type=ApiSportModel.SportType.TEMP_FIX,
+            external_id=data["id"],
+            full_name=data.get("name") or "",
+            first_name=data.get("firstname"),
+            last_name=data.get("lastname"),
+            age=data.get("age"),
+            birth_date=(
+                datetime.strptime(birth_date_string, "%Y-%m-%d").date()
+                if birth_date_string
+                else None
+            ),
+            birth_place=birth.get("place"),
+            birth_country=birth.get("country"),
+            nationality=data.get("nationality"),
+            height=data.get("height"),
+            weight=data.get("weight"),
+            number=None if data.get("number") is None else str(data["number"]),
+            position=data.get("position"),
+            photo=None,
+        )
@@ -1,11 +1,20 @@
-from time import sleep
-
-from core.models import SportLeague, SportLeagueTeam, SportTeam, TeamStanding
+from core.models import (
+    ApiSportModel,
+    SportLeague,
+    SportLeagueTeam,
+    SportTeam,
+    TeamStanding,
+)
 from core.services.api.in_progress.BaseApiFootballService import BaseApiFootballService
 
 
 class TeamStandingsService(BaseApiFootballService):
-    def update_team_standings(self, league_external_id: int, season_year: int):
+    def update_team_standings(self, league_external_id: int, season_year: int) -> int:
+        """
+        Fetch the standings of a league and store every team row in bulk.
+
+        @return: The number of TeamStanding rows written.
+        """
         endpoint = "standings"
         query_params = {"league": league_external_id, "season": season_year}
 
@@ -16,7 +25,7 @@ class TeamStandingsService(BaseApiFootballService):
             self.log.info(
                 f"No standings data found for {league_external_id} in {season_year}"
             )
-            return
+            return 0
 
         standings = body[0].get("league", {}).get("standings", [])
 
@@ -24,44 +33,80 @@ class TeamStandingsService(BaseApiFootballService):
             self.log.info(
                 f"No standings data found for {league_external_id} in {season_year}, even though the response was not empty"
             )
-            return
-
-        for data in standings[0]:
-            team_external_id = data.get("team", {}).get("id")
-            sleep(0.5)
-
-            try:
-                sport_league_team = SportLeagueTeam.objects.filter(
-                    team__external_id=team_external_id,
-                    league__external_id=league_external_id,
-                    season=season_year,
-                ).first()
-
-                if not sport_league_team:
-                    SportLeagueTeam.objects.create(
-                        league=SportLeague.objects.get(external_id=league_external_id),
-                        team=SportTeam.objects.get(external_id=team_external_id),
-                    )
-
-                team_standing, created = TeamStanding.objects.get_or_create(
-                    league_team=sport_league_team,
-                    defaults={
-                        "data": data,
-                    },
-                )
-
-                if not created:
-                    team_standing.data = data
-                    team_standing.save()
-                    self.log.info(
-                        f"Updated existing TeamStanding for team {team_external_id} in league {league_external_id} for season {season_year}"
-                    )
-                else:
-                    self.log.info(
-                        f"Created new TeamStanding for team {team_external_id} in league {league_external_id} for season {season_year}"
-                    )
-            except Exception as e:
-                self.log.error(
-                    f"Error processing team {team_external_id} in league {league_external_id} for season {season_year}: {e}"
-                )
-                continue
+            return 0
+
+        rows = {
+            data.get("team", {}).get("id"): data
+            for data in standings[0]
+            if data.get("team", {}).get("id")
+        }
+
+        league = SportLeague.objects.filter(
+            external_id=league_external_id, type=ApiSportModel.SportType.SOCCER
+        ).first()
+        if not league:
+            self.log.error(f"League {league_external_id} not found")
+            return 0
+
+        league_teams = self._get_league_teams(league, season_year, list(rows))
+
+        missing = set(rows) - set(league_teams)
+        if missing:
+            self.log.warning(
+                f"Teams {sorted(missing)} not found for league {league_external_id} in season {season_year}. Skipping."
+            )
+
+        TeamStanding.objects.bulk_create(
+            [
+                TeamStanding(league_team_id=league_team_id, data=rows[team_external_id])
+                for team_external_id, league_team_id in league_teams.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["league_team"],
+            update_fields=["data", "updated_at"],
+        )
+        self.log.info(
+            f"Updated {len(league_teams)} standings in league {league_external_id} for season {season_year}"
+        )
+
+        return len(league_teams)
+
+    def _get_league_teams(
+        self, league: SportLeague, season_year: int, team_external_ids: list
+    ) -> dict:
+        """
+        Resolve the league-team links of the given teams, creating the
+        missing ones for teams that exist.
+
+        @return: Map of team external ID to SportLeagueTeam ID.
+        """
+        league_teams = self._load_league_teams(league, season_year, team_external_ids)
+
+        missing = set(team_external_ids) - set(league_teams)
+        if missing:
+            SportLeagueTeam.objects.bulk_create(
+                [
+                    SportLeagueTeam(league=league, team_id=team_id, season=season_year)
+                    for team_id in SportTeam.objects.filter(
+                        type=ApiSportModel.SportType.SOCCER, external_id__in=missing
+                    ).values_list("id", flat=True)
+                ],
+                ignore_conflicts=True,
+            )
+            league_teams = self._load_league_teams(
+                league, season_year, team_external_ids
+            )
+
+        return league_teams
+
+    def _load_league_teams(
+        self, league: SportLeague, season_year: int, team_external_ids: list
+    ) -> dict:
+        return dict(
+            SportLeagueTeam.objects.filter(
+                league=league,
+                season=season_year,
+                team__external_id__in=team_external_ids,
+                team__type=ApiSportModel.SportType.SOCCER,
+            ).values_list("team__external_id", "id")
+        )
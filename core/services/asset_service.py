@@ -0,0 +1,171 @@
+import hashlib
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Asset
+
+logger = logging.getLogger("cron")
+
+
+@dataclass(frozen=True)
+class AssetRequest:
+    url: str
+    upload_dir: str
+    filename: str
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.upload_dir, self.filename)
+
+
+@dataclass
+class DownloadResult:
+    request: AssetRequest
+    status: int
+    content_hash: str = ""
+    etag: str = ""
+    last_modified: str = ""
+
+
+class AssetService:
+    """
+    Local store for remote logos.
+
+    An asset that was downloaded before and still exists on disk is served
+    without any HTTP request. Once it is older than ASSET_REVALIDATE_DAYS it
+    is revalidated with a conditional request (ETag / Last-Modified), and the
+    file is only rewritten when its content hash changed.
+    """
+
+    def get_path(self, url: str, upload_dir: str, filename: str) -> Optional[str]:
+        return self.get_paths([AssetRequest(url, upload_dir, filename)]).get(url)
+
+    def get_paths(self, asset_requests: list) -> dict:
+        """
+        Resolve many assets at once. Downloads and revalidations run
+        concurrently; the asset records are written afterwards in bulk.
+
+        @return: Map of source URL to local path, for the assets available.
+        """
+        asset_requests = {r.url: r for r in asset_requests if r.url}
+        assets = Asset.objects.in_bulk(list(asset_requests), field_name="source_url")
+
+        paths = {}
+        pending = []
+        revalidate_before = timezone.now() - timedelta(
+            days=settings.ASSET_REVALIDATE_DAYS
+        )
+        for url, asset_request in asset_requests.items():
+            asset = assets.get(url)
+            if (
+                asset
+                and asset.path == asset_request.path
+                and asset.checked_at > revalidate_before
+                and self._exists(asset.path)
+            ):
+                paths[url] = asset.path
+            else:
+                pending.append(asset_request)
+
+        if not pending:
+            return paths
+
+        with ThreadPoolExecutor(
+            max_workers=settings.ASSET_DOWNLOAD_CONCURRENCY
+        ) as executor:
+            results = list(
+                executor.map(lambda r: self._download(r, assets.get(r.url)), pending)
+            )
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for result in results:
+            if result is None:
+                continue
+
+            url = result.request.url
+            paths[url] = result.request.path
+            asset = assets.get(url)
+            if result.status == 304:
+                asset.checked_at = now
+                to_update.append(asset)
+                continue
+
+            values = {
+                "path": result.request.path,
+                "etag": result.etag,
+                "last_modified": result.last_modified,
+                "content_hash": result.content_hash,
+                "checked_at": now,
+            }
+            if asset is None:
+                to_create.append(Asset(source_url=url, **values))
+            else:
+                for k, v in values.items():
+                    setattr(asset, k, v)
+                to_update.append(asset)
+
+        Asset.objects.bulk_create(to_create, ignore_conflicts=True)
+        Asset.objects.bulk_update(
+            to_update,
+            ["path", "etag", "last_modified", "content_hash", "checked_at"],
+        )
+
+        return paths
+
+    def _download(
+        self, asset_request: AssetRequest, asset: Optional[Asset]
+    ) -> Optional[DownloadResult]:
+        headers = {}
+        # Only revalidate when the local copy is still there to fall back on
+        if asset and asset.path == asset_request.path and self._exists(asset.path):
+            if asset.etag:
+                headers["If-None-Match"] = asset.etag
+            if asset.last_modified:
+                headers["If-Modified-Since"] = asset.last_modified
+
+        try:
+            logger.info(f"Downloading asset: {asset_request.url}")
+            response = requests.get(
+                asset_request.url,
+                headers=headers,
+                timeout=settings.RAPIDAPI_REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to download asset: {asset_request.url}. Error: {e}")
+            return None
+
+        if response.status_code == 304:
+            return DownloadResult(request=asset_request, status=304)
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if not (
+            asset
+            and asset.content_hash == content_hash
+            and asset.path == asset_request.path
+            and self._exists(asset.path)
+        ):
+            full_path = os.path.join(settings.MEDIA_ROOT, asset_request.path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, "wb") as f:
+                f.write(response.content)
+
+        return DownloadResult(
+            request=asset_request,
+            status=response.status_code,
+            content_hash=content_hash,
+            etag=response.headers.get("ETag", ""),
+            last_modified=response.headers.get("Last-Modified", ""),
+        )
+
+    def _exists(self, path: str) -> bool:
+        return os.path.exists(os.path.join(settings.MEDIA_ROOT, path))
@@ -0,0 +1,309 @@
+import json
+import logging
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from core.models import ApiSportModel
+
+logger = logging.getLogger("cron")
+
+# 1x1 transparent PNG, served for every logo
+LOGO = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+
+class FakeRapidApiServer:
+    """
+    Local stand-in for one RapidAPI host (API-Football, API-Basketball or
+    API-Hockey), for benchmarking ingestion without network access or quota.
+
+    Fixture pages (``/fixtures?date=`` and ``/games?date=``), standings and
+    logos are generated deterministically: ``fixtures_per_day`` fixtures per
+    day, spread over ``leagues`` leagues (IDs from ``LEAGUE_ID_OFFSET``) of
+    ``TEAMS_PER_LEAGUE`` teams each. Fixtures are in play for
+    ``MATCH_LENGTH`` after kickoff and finished after that; in-play fixtures
+    are also listed by ``?live=`` and any fixture by ``?ids=``. Recorded payloads (e.g. read from the PayloadArchive)
+    are served instead whenever one was recorded for the requested URL.
+
+    ``latency`` delays every API response, and every ``throttle_every``-th
+    API request is answered with 429 to exercise the client's retries.
+    Logo requests are served right away and not counted.
+    """
+
+    LEAGUE_ID_OFFSET = 900_000
+    TEAMS_PER_LEAGUE = 20
+    # Fixture IDs are <days since FIRST_DAY> * MAX_FIXTURES_PER_DAY + index
+    FIRST_DAY = date(2020, 1, 1)
+    MAX_FIXTURES_PER_DAY = 100_000
+    MATCH_LENGTH = timedelta(hours=2)
+
+    def __init__(
+        self,
+        sport_type: ApiSportModel.SportType,
+        fixtures_per_day: int = 100,
+        leagues: int = 10,
+        latency: float = 0.0,
+        throttle_every: int = 0,
+        recorded: Optional[dict] = None,
+    ):
+        if fixtures_per_day > self.MAX_FIXTURES_PER_DAY:
+            raise ValueError(
+                f"At most {self.MAX_FIXTURES_PER_DAY} fixtures per day are supported"
+            )
+
+        self.sport_type = sport_type
+        self.fixtures_per_day = fixtures_per_day
+        self.leagues = leagues
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.recorded = {
+            self._normalize(url): payload for url, payload in (recorded or {}).items()
+        }
+
+        self.requests = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.httpd.server_port}"
+
+    def start(self) -> "FakeRapidApiServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset_counts(self) -> None:
+        with self.lock:
+            self.requests = 0
+            self.throttled = 0
+
+    def get_league_ids(self) -> list:
+        """
+        @return: The external IDs of the generated leagues, and of the leagues
+                 in the recorded fixture pages of this sport.
+        """
+        fixture_endpoint = (
+            "fixtures" if self.sport_type == ApiSportModel.SportType.SOCCER else "games"
+        )
+        league_ids = {self.LEAGUE_ID_OFFSET + i for i in range(self.leagues)}
+        for url, payload in self.recorded.items():
+            if urlparse(url).path.rstrip("/").endswith(f"/{fixture_endpoint}"):
+                league_ids.update(
+                    item.get("league", {}).get("id")
+                    for item in payload.get("response") or []
+                )
+
+        league_ids.discard(None)
+        return sorted(league_ids)
+
+    # ---------------------------
+    #   Payloads
+    # ---------------------------
+    def get_payload(self, url: str) -> Optional[dict]:
+        """
+        @return: The payload for ``url``, or None for an unknown endpoint.
+        """
+        normalized = self._normalize(url)
+        if normalized in self.recorded:
+            return self.recorded[normalized]
+
+        parsed = urlparse(url)
+        endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+        params = dict(parse_qsl(parsed.query))
+
+        if endpoint in ("fixtures", "games") and "date" in params:
+            day = date.fromisoformat(params["date"])
+            return self._wrap(
+                [self._make_fixture(day, i) for i in range(self.fixtures_per_day)]
+            )
+        elif endpoint == "fixtures" and "live" in params:
+            return self._wrap(self._make_live_fixtures(params["live"]))
+        elif endpoint == "fixtures" and "ids" in params:
+            return self._wrap(
+                [
+                    self._make_fixture(
+                        self.FIRST_DAY
+                        + timedelta(days=external_id // self.MAX_FIXTURES_PER_DAY),
+                        external_id % self.MAX_FIXTURES_PER_DAY,
+                    )
+                    for external_id in map(int, params["ids"].split("-"))
+                ]
+            )
+        elif endpoint == "standings":
+            return self._wrap(self._make_standings(int(params.get("league", 0))))
+        elif endpoint in ("fixtures", "games", "predictions", "leagues", "teams"):
+            return self._wrap([])
+
+        return None
+
+    def _wrap(self, response: list) -> dict:
+        return {"errors": [], "results": len(response), "response": response}
+
+    def _make_live_fixtures(self, leagues: str) -> list:
+        league_ids = None if leagues == "all" else set(map(int, leagues.split("-")))
+        today = datetime.now(timezone.utc).date()
+        fixtures = []
+        # Fixtures kicking off late yesterday can still be in play
+        for day in (today - timedelta(days=1), today):
+            for i in range(self.fixtures_per_day):
+                fixture = self._make_fixture(day, i)
+                if fixture["fixture"]["status"]["short"] != "2H":
+                    continue
+                if league_ids is None or fixture["league"]["id"] in league_ids:
+                    fixtures.append(fixture)
+
+        return fixtures
+
+    def _make_fixture(self, day: date, i: int) -> dict:
+        league_index = i % self.leagues
+        first_team = self.LEAGUE_ID_OFFSET + league_index * self.TEAMS_PER_LEAGUE
+        round_index = i // self.leagues
+        home = first_team + (2 * round_index) % self.TEAMS_PER_LEAGUE
+        away = first_team + (2 * round_index + 1) % self.TEAMS_PER_LEAGUE
+
+        external_id = (day - self.FIRST_DAY).days * self.MAX_FIXTURES_PER_DAY + i
+        kickoff = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        kickoff += timedelta(minutes=(i * 7) % (24 * 60))
+        now = datetime.now(timezone.utc)
+        started = kickoff <= now
+        # Deterministic scores, so replaying a day writes nothing new
+        home_score = zlib.crc32(f"{external_id}h".encode()) % 5 if started else None
+        away_score = zlib.crc32(f"{external_id}a".encode()) % 5 if started else None
+
+        league = {"id": self.LEAGUE_ID_OFFSET + league_index}
+        teams = {"home": self._make_team(home), "away": self._make_team(away)}
+        if not started:
+            status = {"short": "NS"}
+        elif now < kickoff + self.MATCH_LENGTH:
+            in_play = (
+                "2H" if self.sport_type == ApiSportModel.SportType.SOCCER else "Q4"
+            )
+            status = {"short": in_play}
+        else:
+            status = {"short": "FT"}
+        timestamp = int(kickoff.timestamp())
+
+        if self.sport_type == ApiSportModel.SportType.SOCCER:
+            return {
+                "fixture": {
+                    "id": external_id,
+                    "timestamp": timestamp,
+                    "status": status,
+                },
+                "league": league,
+                "teams": teams,
+                "goals": {"home": home_score, "away": away_score},
+            }
+
+        if self.sport_type == ApiSportModel.SportType.BASKETBALL:
+            scores = {
+                "home": {"total": None if home_score is None else 80 + home_score},
+                "away": {"total": None if away_score is None else 80 + away_score},
+            }
+        else:
+            scores = {"home": home_score, "away": away_score}
+
+        return {
+            "id": external_id,
+            "timestamp": timestamp,
+            "status": status,
+            "league": league,
+            "teams": teams,
+            "scores": scores,
+        }
+
+    def _make_team(self, external_id: int) -> dict:
+        return {
+            "id": external_id,
+            "name": f"Team {external_id}",
+            "logo": f"http://{self.host}/logos/{external_id}.png",
+        }
+
+    def _make_standings(self, league_external_id: int) -> list:
+        league_index = league_external_id - self.LEAGUE_ID_OFFSET
+        if not 0 <= league_index < self.leagues:
+            return []
+
+        first_team = self.LEAGUE_ID_OFFSET + league_index * self.TEAMS_PER_LEAGUE
+        rows = [
+            {
+                "rank": rank + 1,
+                "team": self._make_team(first_team + rank),
+                "points": 3 * (self.TEAMS_PER_LEAGUE - rank),
+            }
+            for rank in range(self.TEAMS_PER_LEAGUE)
+        ]
+        return [{"league": {"id": league_external_id, "standings": [rows]}}]
+
+    def _normalize(self, url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.path}?{urlencode(sorted(parse_qsl(parsed.query)))}"
+
+    # ---------------------------
+    #   HTTP
+    # ---------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                # Logos come from a CDN, outside of the API quota
+                if self.path.startswith("/logos/"):
+                    self._send(200, LOGO, content_type="image/png")
+                    return
+
+                with server.lock:
+                    server.requests += 1
+                    throttle = (
+                        server.throttle_every
+                        and server.requests % server.throttle_every == 0
+                    )
+                    if throttle:
+                        server.throttled += 1
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if throttle:
+                    self._send(429, b"", headers={"Retry-After": "0"})
+                    return
+
+                payload = server.get_payload(self.path)
+                if payload is None:
+                    self._send(404, b"")
+                    return
+
+                self._send(200, json.dumps(payload).encode())
+
+            def _send(
+                self, status, body, content_type="application/json", headers=None
+            ):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Fake RapidAPI {server.sport_type}: {format % args}")
+
+        return Handler
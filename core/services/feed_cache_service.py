@@ -0,0 +1,104 @@
+import hashlib
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class FeedCacheService:
+    """
+    Versioned cache for the upcoming feed responses.
+
+    Every entry remembers the feed version it was built for. Saving a
+    prediction, ticket or bet line bumps the version, which turns all entries
+    stale at once without having to know their keys. Stale entries keep being
+    served while a single request, holding a short lock, rebuilds them.
+    """
+
+    VERSION_KEY = "feed:version"
+    KEY_PREFIX = "feed:entry"
+    LOCK_PREFIX = "feed:lock"
+    LOCK_TIMEOUT = 30
+    LOCK_WAIT = 3
+    LOCK_POLL_INTERVAL = 0.1
+
+    def get_or_build(self, key_parts: list, builder: Callable):
+        """
+        Return the cached value for ``key_parts``, calling ``builder`` to
+        (re)build it when it is missing or stale.
+        """
+        key = self._make_key(key_parts)
+        version = self.get_version()
+        entry = cache.get(key)
+
+        if self._is_fresh(entry, version):
+            return entry["value"]
+
+        lock_key = f"{self.LOCK_PREFIX}:{key}"
+        if not cache.add(lock_key, 1, self.LOCK_TIMEOUT):
+            # Someone else is already rebuilding this entry
+            if entry is not None:
+                return entry["value"]
+
+            entry = self._wait_for_entry(key)
+            if entry is not None:
+                return entry["value"]
+
+            return builder()
+
+        try:
+            value = builder()
+            cache.set(
+                key,
+                {
+                    "version": version,
+                    "expires_at": time.time() + settings.FEED_CACHE_TIMEOUT,
+                    "value": value,
+                },
+                settings.FEED_CACHE_STALE_TIMEOUT,
+            )
+        finally:
+            cache.delete(lock_key)
+
+        return value
+
+    def get_version(self) -> int:
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            # Seed from the clock so a lost version never matches old entries
+            cache.add(self.VERSION_KEY, int(time.time()), None)
+            version = cache.get(self.VERSION_KEY)
+
+        return version
+
+    def bump_version(self) -> None:
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.set(self.VERSION_KEY, int(time.time()), None)
+
+    def _is_fresh(self, entry, version) -> bool:
+        return (
+            entry is not None
+            and entry["version"] == version
+            and entry["expires_at"] > time.time()
+        )
+
+    def _wait_for_entry(self, key: str):
+        """
+        Cold cache: give the request holding the lock a moment to fill the
+        entry instead of running the same queries alongside it.
+        """
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+
+        return None
+
+    def _make_key(self, key_parts: list) -> str:
+        raw = ":".join(str(part) for part in key_parts)
+        return f"{self.KEY_PREFIX}:{hashlib.md5(raw.encode()).hexdigest()}"
@@ -0,0 +1,182 @@
+import logging
+from typing import Iterable, Optional
+
+from django.db.models import Q
+
+from core.api.serializers import PredictionHistorySerializer, TicketHistorySerializer
+from core.models import FeedItem, Prediction, Ticket
+from core.services.history_timeline_service import TimelineCursor
+
+logger = logging.getLogger(__name__)
+
+
+class FeedService:
+    """
+    Keeps the denormalized FeedItem rows in sync with predictions and tickets
+    and serves the feed endpoints from them.
+    """
+
+    UPDATE_FIELDS = [
+        "product",
+        "visibility",
+        "status",
+        "sort_datetime",
+        "payload",
+        "updated_at",
+    ]
+
+    # ---------------------------
+    #   Sync
+    # ---------------------------
+    def sync_prediction(self, prediction_id: int) -> None:
+        if not self.sync_predictions(Prediction.objects.filter(id=prediction_id)):
+            self.remove(FeedItem.ObjectType.PREDICTION, prediction_id)
+
+    def sync_ticket(self, ticket_id: int) -> None:
+        if not self.sync_tickets(Ticket.objects.filter(id=ticket_id)):
+            self.remove(FeedItem.ObjectType.TICKET, ticket_id)
+
+    def sync_matches(self, match_ids: Iterable[int]) -> None:
+        """
+        Re-render every feed item that shows one of the given matches, e.g.
+        after a score or status update.
+        """
+        match_ids = list(match_ids)
+        if not match_ids:
+            return
+
+        self.sync_predictions(Prediction.objects.filter(match_id__in=match_ids))
+        self.sync_tickets(
+            Ticket.objects.filter(bet_lines__match_id__in=match_ids).distinct()
+        )
+
+    def sync_predictions(self, predictions) -> int:
+        predictions = predictions.select_related(
+            "match__home_team",
+            "match__away_team",
+            "match__league__country",
+            "product",
+        )
+        return self._upsert(self._build_prediction_item(p) for p in predictions)
+
+    def sync_tickets(self, tickets) -> int:
+        tickets = tickets.select_related("product").prefetch_related(
+            "bet_lines__match__home_team",
+            "bet_lines__match__away_team",
+            "bet_lines__match__league__country",
+        )
+        return self._upsert(self._build_ticket_item(t) for t in tickets)
+
+    def remove(self, object_type: FeedItem.ObjectType, object_id: int) -> None:
+        FeedItem.objects.filter(object_type=object_type, object_id=object_id).delete()
+
+    def _upsert(self, items) -> int:
+        items = list(items)
+        if not items:
+            return 0
+
+        FeedItem.objects.bulk_create(
+            items,
+            update_conflicts=True,
+            unique_fields=["object_type", "object_id"],
+            update_fields=self.UPDATE_FIELDS,
+        )
+        return len(items)
+
+    def _build_prediction_item(self, prediction: Prediction) -> FeedItem:
+        payload = PredictionHistorySerializer(prediction).data
+        payload["datetime"] = payload["match"]["kickoff_datetime"]
+
+        return FeedItem(
+            object_type=FeedItem.ObjectType.PREDICTION,
+            object_id=prediction.id,
+            product=prediction.product,
+            visibility=prediction.visibility,
+            status=prediction.status,
+            sort_datetime=prediction.match.kickoff_datetime,
+            payload=payload,
+        )
+
+    def _build_ticket_item(self, ticket: Ticket) -> FeedItem:
+        payload = TicketHistorySerializer(ticket).data
+        payload["datetime"] = payload["starts_at"]
+
+        return FeedItem(
+            object_type=FeedItem.ObjectType.TICKET,
+            object_id=ticket.id,
+            product=ticket.product,
+            visibility=ticket.visibility,
+            status=ticket.status,
+            sort_datetime=ticket.starts_at,
+            payload=payload,
+        )
+
+    # ---------------------------
+    #   Feed queries
+    # ---------------------------
+    def get_history_queryset(
+        self,
+        product_filter: Optional[str] = None,
+        object_filter: Optional[str] = None,
+        cursor: Optional[TimelineCursor] = None,
+    ):
+        """
+        Settled public items, newest first. Ordered by (datetime, object_type,
+        id) descending, the same keyset the history timeline uses.
+        """
+        items = self._filter(
+            FeedItem.objects.filter(
+                visibility=Prediction.Visibility.PUBLIC,
+                status__in=[Prediction.Status.WON, Prediction.Status.LOST],
+                sort_datetime__isnull=False,
+            ),
+            product_filter,
+            object_filter,
+        )
+
+        if cursor:
+            items = items.filter(
+                Q(sort_datetime__lt=cursor.datetime)
+                | Q(sort_datetime=cursor.datetime, object_type__lt=cursor.object_type)
+                | Q(
+                    sort_datetime=cursor.datetime,
+                    object_type=cursor.object_type,
+                    object_id__lt=cursor.id,
+                )
+            )
+
+        return items.order_by("-sort_datetime", "-object_type", "-object_id")
+
+    def get_upcoming_queryset(
+        self,
+        visibility: list,
+        product_filter: Optional[str] = None,
+        object_filter: Optional[str] = None,
+    ):
+        """
+        Pending items, tickets first and then by datetime.
+        """
+        items = self._filter(
+            FeedItem.objects.filter(
+                visibility__in=visibility,
+                status=Prediction.Status.PENDING,
+            ).exclude(object_type=FeedItem.ObjectType.PREDICTION, object_id=1053),
+            product_filter,
+            object_filter,
+        )
+
+        # "ticket" sorts after "prediction", so descending puts tickets first
+        return items.order_by("-object_type", "sort_datetime", "object_id")
+
+    def _filter(self, items, product_filter, object_filter):
+        if object_filter == "predictions":
+            items = items.filter(object_type=FeedItem.ObjectType.PREDICTION)
+        elif object_filter == "tickets":
+            items = items.filter(object_type=FeedItem.ObjectType.TICKET)
+        elif object_filter is not None:
+            items = items.none()
+
+        if product_filter:
+            items = items.filter(product__name__iexact=product_filter)
+
+        return items
@@ -1,12 +1,12 @@
 import logging
+from collections import Counter
 from datetime import datetime, timezone
+from typing import Optional
 
 import requests
-from django.utils import timezone as django_timezone
 
 from core.models import (
     ApiSportModel,
-    SportLeague,
     SportMatch,
 )
 from core.services.sport_api_service import SportApiService
@@ -50,29 +50,33 @@ allowed_league_ids = [
 
 
 class FootballApiService(SportApiService):
+    SPORT_TYPE = ApiSportModel.SportType.SOCCER
+    PRODUCT_NAME = Product.Names.SOCCER
+    MATCH_UPDATE_FIELDS = [*SportApiService.MATCH_UPDATE_FIELDS, "status"]
+    # Most fixtures API-Football returns for one ``ids`` query
+    MAX_FIXTURE_IDS = 20
 
-    def populate_matches(self, start_date: datetime, end_date: datetime) -> None:
+    def populate_matches(self, start_date: datetime, end_date: datetime) -> Counter:
         endpoint = f"{self._get_base_url(SportMatch.SportType.SOCCER)}/fixtures"
-        self.fetch_sport_matches(
+        return self.fetch_sport_matches(
             start_date,
             end_date,
             endpoint,
             SportMatch.SportType.SOCCER,
-            self._process_fixture,
+            self._process_fixtures,
         )
 
     def fetch_match_prediction(self, external_id: int) -> dict:
         logger.info(f"Fetching predictions for match {external_id}")
         endpoint = f"{self._get_base_url(SportMatch.SportType.SOCCER)}/predictions?fixture={external_id}"
-        response = requests.get(
-            endpoint, headers=self._get_headers(SportMatch.SportType.SOCCER)
-        )
-
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch sport matches for url: {endpoint}")
+        try:
+            data = self._get_client(SportMatch.SportType.SOCCER).get_json(
+                endpoint, bypass_cache=self.bypass_cache
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch predictions for url: {endpoint}. Error: {e}")
             return {}
 
-        data = response.json()
         data_response = data.get("response")
         if not data_response:
             logger.error(f"No predictions found for match {external_id}")
@@ -82,98 +86,75 @@ class FootballApiService(SportApiService):
         prediction = data_response[0].get("predictions")
         return prediction
 
+    def _fetch_live_matches(self, matches: list) -> Counter:
+        """
+        Fetch the in-play fixtures of the leagues with live matches in one
+        ``live`` query. Matches in progress that dropped out of it have just
+        ended, and are fetched by ID once more for their final score.
+        """
+        base_url = self._get_base_url(SportMatch.SportType.SOCCER)
+        league_ids = sorted({match.league.external_id for match in matches})
+        stats = Counter()
+
+        live_endpoint = f"{base_url}/fixtures?live={'-'.join(map(str, league_ids))}"
+        data = self._fetch_page(live_endpoint, SportMatch.SportType.SOCCER)
+        if data is None:
+            stats["pages_failed"] += 1
+            return stats
+
+        items = data.get("response") or []
+        stats["pages_fetched"] += 1
+        stats.update(self._process_fixtures(items))
+
+        live_ids = {item.get("fixture").get("id") for item in items}
+        ended_ids = [
+            match.external_id
+            for match in matches
+            if match.status == SportMatch.Status.IN_PROGRESS
+            and match.external_id not in live_ids
+        ]
+        for i in range(0, len(ended_ids), self.MAX_FIXTURE_IDS):
+            chunk = ended_ids[i : i + self.MAX_FIXTURE_IDS]
+            ids_endpoint = f"{base_url}/fixtures?ids={'-'.join(map(str, chunk))}"
+            data = self._fetch_page(ids_endpoint, SportMatch.SportType.SOCCER)
+            if data is None:
+                stats["pages_failed"] += 1
+                continue
+
+            stats["pages_fetched"] += 1
+            stats.update(self._process_fixtures(data.get("response") or []))
+
+        return stats
+
     def fetch_matches_for_league(self):
         return self.populate_matches_for_league(callback=self._process_fixture)
 
-    def _process_fixture(self, item: dict):
-        product_obj = Product.objects.get(name=Product.Names.SOCCER)
-
+    def _parse_fixture(self, item: dict) -> Optional[dict]:
         fixture = item.get("fixture")
-        status = fixture.get("status").get("short")
-        league = item.get("league")
-        home_team = item.get("teams").get("home")
-        away_team = item.get("teams").get("away")
         goals = item.get("goals")
 
-        league_id = league.get("id")
-
         logger.info(f"Processing fixture with ID: {fixture.get('id')}")
 
-        league_obj = SportLeague.objects.filter(
-            external_id=league_id,
-            product__name=Product.Names.SOCCER,
-        ).first()
-
-        if not league_obj:
-            logger.error(f"League {league_id} not found")
+        kickoff_timestamp = fixture.get("timestamp")
+        if not kickoff_timestamp:
+            logger.error(f"Match {fixture.get('id')} has no kickoff timestamp")
             return None
 
-        home_team_obj = self._create_or_update_team(
-            home_team, league_obj, ApiSportModel.SportType.SOCCER, product_obj
-        )
-        away_team_obj = self._create_or_update_team(
-            away_team, league_obj, ApiSportModel.SportType.SOCCER, product_obj
-        )
-
         home_team_score = goals.get("home")
         away_team_score = goals.get("away")
-        if home_team_score is None:
-            home_team_score = ""
-        if away_team_score is None:
-            away_team_score = ""
-
-        kickoff_timestamp = fixture.get("timestamp")
 
-        if not kickoff_timestamp:
-            logger.error(f"Match {item.get('id')} has no kickoff timestamp")
-            return None
-
-        kickoff_datetime = datetime.fromtimestamp(kickoff_timestamp, tz=timezone.utc)
-
-        match_obj = SportMatch.objects.filter(
-            external_id=fixture.get("id"), product=product_obj
-        ).first()
-
-        match_status = self._get_status(status)
-
-        if match_obj:
-            try:
-                match_obj.home_team_score = home_team_score
-                match_obj.away_team_score = away_team_score
-                match_obj.kickoff_datetime = kickoff_datetime
-                match_obj.status = match_status
-                match_obj.save()
-                logger.info(f"Updated existing match: {match_obj}")
-            except Exception as e:
-                logger.error(f"Failed to update match: {e}")
-                return None
-        else:
-            try:
-                match_obj = SportMatch.objects.create(
-                    external_id=fixture.get("id"),
-                    league=league_obj,
-                    home_team=home_team_obj,
-                    away_team=away_team_obj,
-                    home_team_score=home_team_score,
-                    away_team_score=away_team_score,
-                    kickoff_datetime=kickoff_datetime,
-                    product=product_obj,
-                    type=SportMatch.SportType.SOCCER,
-                    status=match_status,
-                )
-                logger.info(f"Successfully created {match_obj}")
-            except Exception as e:
-                logger.error(f"Failed to create match: {e}")
-                return None
-
-        if (
-            match_obj.kickoff_datetime > django_timezone.now()
-            and not match_obj.metadata
-        ):
-            match_obj.metadata = self.fetch_match_prediction(match_obj.external_id)
-            match_obj.save()
-
-        return match_obj
+        return {
+            "external_id": fixture.get("id"),
+            "league_external_id": item.get("league").get("id"),
+            "home_team": item.get("teams").get("home"),
+            "away_team": item.get("teams").get("away"),
+            "home_team_score": "" if home_team_score is None else str(home_team_score),
+            "away_team_score": "" if away_team_score is None else str(away_team_score),
+            "kickoff_datetime": datetime.fromtimestamp(
+                kickoff_timestamp, tz=timezone.utc
+            ),
+            "status": self._get_status(fixture.get("status").get("short")),
+        }
 
     def _get_status(self, status: str) -> SportMatch.Status:
         if status in ["TBD", "NS", "SUSP", "PST", "ABD"]:
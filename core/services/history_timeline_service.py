@@ -0,0 +1,223 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.db.models import CharField, F, Q, Value
+
+from core.models import Prediction, Ticket
+
+
+@dataclass(frozen=True)
+class TimelineCursor:
+    """
+    Position in the history timeline. The timeline is ordered by
+    (datetime, object_type, id) descending, so the cursor carries all three.
+    """
+
+    datetime: datetime
+    object_type: str
+    id: int
+
+    def encode(self) -> str:
+        raw = f"{self.datetime.isoformat()}|{self.object_type}|{self.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> "TimelineCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value.encode()).decode()
+            dt, object_type, object_id = raw.split("|")
+            cursor = cls(
+                datetime=datetime.fromisoformat(dt),
+                object_type=object_type,
+                id=int(object_id),
+            )
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {value}") from e
+
+        if cursor.object_type not in (
+            HistoryTimelineService.PREDICTION,
+            HistoryTimelineService.TICKET,
+        ):
+            raise ValueError(f"Invalid cursor: {value}")
+
+        return cursor
+
+
+class HistoryTimelineService:
+    """
+    Unified history timeline over settled public predictions and tickets.
+
+    Ordering and pagination happen in the database through a UNION of both
+    tables, so a request only ever loads the rows of the page it renders.
+    """
+
+    PREDICTION = "prediction"
+    TICKET = "ticket"
+
+    def __init__(
+        self, product_filter: Optional[str] = None, object_filter: Optional[str] = None
+    ):
+        self.product_filter = product_filter
+        self.object_filter = object_filter
+
+    def get_queryset(self, cursor: Optional[TimelineCursor] = None, limit=None):
+        """
+        Build the ordered UNION of prediction and ticket rows. Each row is a
+        dict with ``object_type``, ``id`` and ``sort_datetime``.
+
+        When ``limit`` is given each side of the union is limited as well, which
+        lets keyset pages be served straight from the datetime indexes.
+        """
+        builders = []
+        if self.object_filter in (None, "predictions"):
+            builders.append(self._get_predictions)
+        if self.object_filter in (None, "tickets"):
+            builders.append(self._get_tickets)
+
+        # A single side is ordered and sliced directly, without a union
+        side_limit = limit if len(builders) > 1 else None
+        querysets = [builder(cursor, side_limit) for builder in builders]
+
+        if not querysets:
+            return Prediction.objects.none().values("id")
+
+        queryset = querysets[0]
+        if len(querysets) > 1:
+            queryset = queryset.union(*querysets[1:], all=True)
+
+        queryset = queryset.order_by("-sort_datetime", "-object_type", "-id")
+        if limit is not None:
+            queryset = queryset[:limit]
+
+        return queryset
+
+    def get_page_after(self, cursor: Optional[TimelineCursor], limit: int):
+        """
+        Fetch one keyset page that starts right after ``cursor``.
+
+        @return: The hydrated page items and the cursor of the next page, or
+                 None when this is the last page.
+        """
+        rows = list(self.get_queryset(cursor=cursor, limit=limit + 1))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = TimelineCursor(
+                datetime=last["sort_datetime"],
+                object_type=last["object_type"],
+                id=last["id"],
+            )
+
+        return self.hydrate(rows), next_cursor
+
+    def hydrate(self, rows) -> list[dict]:
+        """
+        Load the model objects behind a page of timeline rows, keeping the
+        timeline order.
+        """
+        prediction_ids = [r["id"] for r in rows if r["object_type"] == self.PREDICTION]
+        ticket_ids = [r["id"] for r in rows if r["object_type"] == self.TICKET]
+
+        predictions = (
+            Prediction.objects.select_related(
+                "match__home_team",
+                "match__away_team",
+                "match__league__country",
+                "product",
+            ).in_bulk(prediction_ids)
+            if prediction_ids
+            else {}
+        )
+        tickets = (
+            Ticket.objects.select_related("product")
+            .prefetch_related(
+                "bet_lines__match__home_team",
+                "bet_lines__match__away_team",
+                "bet_lines__match__league__country",
+            )
+            .in_bulk(ticket_ids)
+            if ticket_ids
+            else {}
+        )
+
+        items = []
+        for row in rows:
+            source = predictions if row["object_type"] == self.PREDICTION else tickets
+            obj = source.get(row["id"])
+            if obj is None:
+                # Deleted between the page query and the hydration query
+                continue
+
+            items.append(
+                {
+                    "object": obj,
+                    "type": row["object_type"],
+                    "datetime": row["sort_datetime"],
+                }
+            )
+
+        return items
+
+    def _get_predictions(self, cursor: Optional[TimelineCursor], limit):
+        predictions = Prediction.objects.filter(
+            visibility=Prediction.Visibility.PUBLIC,
+            status__in=[Prediction.Status.WON, Prediction.Status.LOST],
+        )
+
+        if self.product_filter:
+            predictions = predictions.filter(product__name__iexact=self.product_filter)
+
+        if cursor:
+            # "prediction" sorts before "ticket", so on a datetime tie every
+            # prediction comes after a ticket cursor in descending order
+            tie = Q(match__kickoff_datetime=cursor.datetime)
+            if cursor.object_type == self.PREDICTION:
+                tie &= Q(id__lt=cursor.id)
+
+            predictions = predictions.filter(
+                Q(match__kickoff_datetime__lt=cursor.datetime) | tie
+            )
+
+        predictions = predictions.annotate(
+            object_type=Value(self.PREDICTION, output_field=CharField()),
+            sort_datetime=F("match__kickoff_datetime"),
+        ).values("id", "object_type", "sort_datetime")
+
+        if limit is not None:
+            predictions = predictions.order_by("-match__kickoff_datetime", "-id")[
+                :limit
+            ]
+
+        return predictions
+
+    def _get_tickets(self, cursor: Optional[TimelineCursor], limit):
+        tickets = Ticket.objects.filter(
+            visibility=Ticket.Visibility.PUBLIC,
+            status__in=[Ticket.Status.WON, Ticket.Status.LOST],
+            starts_at__isnull=False,
+        )
+
+        if self.product_filter:
+            tickets = tickets.filter(product__name__iexact=self.product_filter)
+
+        if cursor:
+            condition = Q(starts_at__lt=cursor.datetime)
+            if cursor.object_type == self.TICKET:
+                condition |= Q(starts_at=cursor.datetime, id__lt=cursor.id)
+
+            tickets = tickets.filter(condition)
+
+        tickets = tickets.annotate(
+            object_type=Value(self.TICKET, output_field=CharField()),
+            sort_datetime=F("starts_at"),
+        ).values("id", "object_type", "sort_datetime")
+
+        if limit is not None:
+            tickets = tickets.order_by("-starts_at", "-id")[:limit]
+
+        return tickets
@@ -0,0 +1,206 @@
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from core.services.payload_archive import PayloadArchive
+from core.services.rate_limiter import get_token_bucket
+from core.services.response_cache import ApiResponseCache
+
+logger = logging.getLogger("cron")
+
+
+class RapidApiClient:
+    """
+    Pooled HTTP client for one RapidAPI key.
+
+    Keeps connections alive through a shared ``requests.Session``, applies
+    connect/read timeouts, retries 429 and 5xx responses (and connection
+    errors) with jittered exponential backoff, draws every attempt from the
+    process-wide token bucket of the key, and records latency and status
+    codes per endpoint. JSON payloads are served from ApiResponseCache when
+    possible, so repeated calls cost no quota, and the ones fetched are
+    appended to the PayloadArchive.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, host: str, api_key: str):
+        self.host = host
+        self.api_key = api_key
+        self.token_bucket = get_token_bucket(api_key)
+        self.response_cache = ApiResponseCache()
+        self.payload_archive = (
+            PayloadArchive() if settings.API_ARCHIVE_ENABLED else None
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update(
+            {"x-rapidapi-host": host, "x-rapidapi-key": api_key}
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=settings.RAPIDAPI_MAX_CONCURRENCY
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.metrics = defaultdict(
+            lambda: {
+                "requests": 0,
+                "retries": 0,
+                "cache_hits": 0,
+                "seconds": 0.0,
+                "statuses": Counter(),
+            }
+        )
+        self.lock = threading.Lock()
+
+    def get_json(self, url: str, bypass_cache: bool = False) -> dict:
+        """
+        GET ``url`` and return its JSON payload, from the response cache when
+        it's there. With ``bypass_cache`` the request is always made and its
+        payload replaces the cached one.
+
+        @raise requests.exceptions.RequestException: When the request fails
+               or doesn't return 200.
+        """
+        if not bypass_cache:
+            payload = self.response_cache.get(url)
+            if payload is not None:
+                with self.lock:
+                    self.metrics[urlparse(url).path]["cache_hits"] += 1
+                return payload
+
+        response = self.get(url)
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(
+                f"{response.status_code} - {response.text} for url: {url}",
+                response=response,
+            )
+
+        payload = response.json()
+        self.response_cache.set(url, payload)
+        if self.payload_archive:
+            self.payload_archive.append(url, payload)
+
+        return payload
+
+    def get(self, url: str, params: dict = None) -> requests.Response:
+        """
+        GET ``url``, retrying transient failures.
+
+        @return: The last response; it may still be an error response once
+                 the retries are used up.
+        @raise requests.exceptions.RequestException: When the request keeps
+               failing without a response.
+        """
+        endpoint = urlparse(url).path
+        for attempt in range(settings.RAPIDAPI_MAX_RETRIES + 1):
+            is_last_attempt = attempt == settings.RAPIDAPI_MAX_RETRIES
+            self.token_bucket.acquire()
+
+            started_at = time.monotonic()
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    timeout=(
+                        settings.RAPIDAPI_CONNECT_TIMEOUT,
+                        settings.RAPIDAPI_REQUEST_TIMEOUT,
+                    ),
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                self._record(endpoint, "error", started_at, attempt)
+                if is_last_attempt:
+                    raise
+
+                delay = self._get_backoff(attempt)
+                logger.warning(
+                    f"Request to {url} failed: {e}. Retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            self._record(endpoint, response.status_code, started_at, attempt)
+            if response.status_code not in self.RETRY_STATUSES or is_last_attempt:
+                return response
+
+            delay = self._get_backoff(attempt, response.headers.get("Retry-After"))
+            logger.warning(
+                f"Request to {url} returned {response.status_code}. Retrying in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+    def get_metrics(self, reset: bool = False) -> dict:
+        with self.lock:
+            metrics = {
+                endpoint: {
+                    **values,
+                    "seconds": round(values["seconds"], 3),
+                    "statuses": dict(values["statuses"]),
+                    "avg_seconds": round(
+                        values["seconds"] / max(values["requests"], 1), 3
+                    ),
+                }
+                for endpoint, values in self.metrics.items()
+            }
+            if reset:
+                self.metrics.clear()
+
+        return metrics
+
+    def _record(self, endpoint: str, status, started_at: float, attempt: int) -> None:
+        with self.lock:
+            values = self.metrics[endpoint]
+            values["requests"] += 1
+            values["retries"] += 1 if attempt else 0
+            values["seconds"] += time.monotonic() - started_at
+            values["statuses"][status] += 1
+
+    def _get_backoff(self, attempt: int, retry_after: str = None) -> float:
+        """
+        Full-jitter exponential backoff. A numeric ``Retry-After`` header
+        sets the lower bound.
+        """
+        delay = random.uniform(0, settings.RAPIDAPI_RETRY_BACKOFF * 2**attempt)
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+
+        return delay
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_rapidapi_client(host: str, api_key: str) -> RapidApiClient:
+    """
+    Shared client per RapidAPI host and key, so every service and thread
+    reuses the same connection pool.
+    """
+    with _clients_lock:
+        if (host, api_key) not in _clients:
+            _clients[(host, api_key)] = RapidApiClient(host, api_key)
+
+        return _clients[(host, api_key)]
+
+
+def log_client_metrics(job: str) -> None:
+    """
+    Log the per-endpoint metrics collected since the last call.
+    """
+    with _clients_lock:
+        clients = list(_clients.values())
+
+    for client in clients:
+        for endpoint, metrics in client.get_metrics(reset=True).items():
+            logger.info(f"Job: {job} {client.host}{endpoint} {metrics}")
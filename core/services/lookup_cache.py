@@ -0,0 +1,115 @@
+import logging
+import threading
+from collections import Counter
+
+from core.models import SportLeague, SportTeam
+from subscriptions.models import Product
+
+logger = logging.getLogger("cron")
+
+
+class LookupCache:
+    """
+    Run-scoped identity map for the rows ingestion keeps resolving: products
+    by name, and leagues and teams by ``(external_id, type)``.
+
+    One instance is shared by every service of a cron job, so each row is
+    loaded at most once per run. Leagues that don't exist are remembered as
+    well, so unknown leagues in the API feed aren't queried page after page.
+    """
+
+    TEAM_FIELDS = ["id", "external_id", "type", "name", "logo"]
+
+    def __init__(self):
+        self.products = {}
+        self.leagues = {}
+        self.teams = {}
+        self.hits = Counter()
+        self.misses = Counter()
+        self.lock = threading.Lock()
+
+    def get_product(self, name: str) -> Product:
+        with self.lock:
+            if name in self.products:
+                self.hits["product"] += 1
+                return self.products[name]
+
+            self.misses["product"] += 1
+
+        product = Product.objects.get(name=name)
+        with self.lock:
+            self.products[name] = product
+
+        return product
+
+    def get_leagues(self, sport_type: str, external_ids) -> dict:
+        """
+        @return: Map of external ID to SportLeague for the leagues that exist.
+        """
+        missing = self._count(
+            "league",
+            self.leagues,
+            [(external_id, sport_type) for external_id in external_ids],
+        )
+        if missing:
+            found = {
+                league.external_id: league
+                for league in SportLeague.objects.filter(
+                    type=sport_type, external_id__in=missing
+                )
+            }
+            with self.lock:
+                for external_id in missing:
+                    self.leagues[(external_id, sport_type)] = found.get(external_id)
+
+        return self._collect(self.leagues, sport_type, external_ids)
+
+    def get_teams(self, sport_type: str, external_ids) -> dict:
+        """
+        @return: Map of external ID to SportTeam (id, name and logo loaded)
+                 for the teams that exist.
+        """
+        missing = self._count(
+            "team",
+            self.teams,
+            [(external_id, sport_type) for external_id in external_ids],
+        )
+        if missing:
+            teams = SportTeam.objects.filter(
+                type=sport_type, external_id__in=missing
+            ).only(*self.TEAM_FIELDS)
+            self.set_teams(sport_type, teams)
+
+        return self._collect(self.teams, sport_type, external_ids)
+
+    def set_teams(self, sport_type: str, teams) -> None:
+        with self.lock:
+            for team in teams:
+                self.teams[(team.external_id, sport_type)] = team
+
+    def log_stats(self, job: str) -> None:
+        logger.info(
+            f"Job: {job} lookup cache hits={dict(self.hits)} misses={dict(self.misses)}"
+        )
+
+    def _count(self, kind: str, store: dict, keys: list) -> list:
+        """
+        Count hits and misses for ``keys``.
+
+        @return: The external IDs that still have to be loaded.
+        """
+        keys = set(keys)
+        with self.lock:
+            missing = [key[0] for key in keys if key not in store]
+            self.hits[kind] += len(keys) - len(missing)
+            self.misses[kind] += len(missing)
+
+        return missing
+
+    def _collect(self, store: dict, sport_type: str, external_ids) -> dict:
+        with self.lock:
+            return {
+                external_id: store[(external_id, sport_type)]
+                for external_id in external_ids
+                if store.get((external_id, sport_type)) is not None
+            }
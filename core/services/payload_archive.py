@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+import os
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import urlparse
+
+import zstandard
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger("cron")
+
+
+class PayloadArchive:
+    """
+    Append-only archive of the raw RapidAPI payloads.
+
+    Every payload fetched from the API is appended as one NDJSON line
+    (``url``, ``fetched_at`` and ``payload``) to a zstd segment per host,
+    endpoint and day: ``<host>/<endpoint>/<YYYY-MM-DD>-<pid>.ndjson.zst``.
+    Each append writes its own zstd frame, so a segment stays readable even
+    if the process dies mid-run; the process ID keeps concurrent jobs from
+    writing to the same file.
+    """
+
+    SEGMENT_SUFFIX = ".ndjson.zst"
+
+    _lock = threading.Lock()
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or settings.API_ARCHIVE_ROOT)
+
+    def append(self, url: str, payload: dict) -> None:
+        now = timezone.now()
+        record = {"url": url, "fetched_at": now.isoformat(), "payload": payload}
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        data = zstandard.ZstdCompressor(level=settings.API_ARCHIVE_LEVEL).compress(line)
+
+        host, endpoint = self._split_url(url)
+        path = (
+            self.root
+            / host
+            / endpoint
+            / f"{now.date().isoformat()}-{os.getpid()}{self.SEGMENT_SUFFIX}"
+        )
+        try:
+            with self._lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "ab") as f:
+                    f.write(data)
+        except OSError as e:
+            logger.error(f"Failed to archive payload of {url}. Error: {e}")
+
+    def get_segments(
+        self,
+        endpoint: str,
+        host: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> list:
+        """
+        @return: The segment paths of an endpoint, oldest day first.
+        """
+        segments = []
+        for path in self.root.glob(f"{host or '*'}/{endpoint}/*{self.SEGMENT_SUFFIX}"):
+            day = date.fromisoformat(path.name[:10])
+            if start_date and day < start_date:
+                continue
+            if end_date and day > end_date:
+                continue
+
+            segments.append(path)
+
+        return sorted(segments, key=lambda path: (path.name, str(path)))
+
+    def prune(self, max_age: timedelta) -> int:
+        """
+        Delete the segments of the days older than ``max_age``.
+
+        @return: The number of segments deleted.
+        """
+        oldest_day = timezone.now().date() - max_age
+        deleted = 0
+        for path in self.root.glob(f"*/*/*{self.SEGMENT_SUFFIX}"):
+            if date.fromisoformat(path.name[:10]) >= oldest_day:
+                continue
+
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError as e:
+                logger.error(f"Failed to delete archive segment {path}. Error: {e}")
+
+        return deleted
+
+    def read(self, path: Path) -> Iterator[dict]:
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                f, read_across_frames=True
+            )
+            for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                if line.strip():
+                    yield json.loads(line)
+
+    def _split_url(self, url: str) -> tuple:
+        parsed = urlparse(url)
+        endpoint = parsed.path.rstrip("/").rsplit("/", 1)[-1] or "root"
+        return parsed.netloc, endpoint
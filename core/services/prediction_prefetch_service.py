@@ -0,0 +1,91 @@
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from core.models import SportMatch
+from core.services.football_api_service import (
+    FootballApiService,
+    allowed_league_ids,
+)
+
+logger = logging.getLogger("cron")
+
+
+class PredictionPrefetchService:
+    """
+    Work queue for the API prediction metadata of upcoming football matches.
+
+    Fixture ingestion doesn't fetch predictions any more; matches without
+    metadata are queued here instead and picked up by their own job. The
+    queue is ordered by priority: matches never tried before the ones the API
+    had no prediction for, then matches in the allowed leagues, then the
+    soonest kickoff. Predictions are fetched concurrently (the shared
+    RapidAPI client keeps them within the quota) and written in bulk.
+    """
+
+    def __init__(self, football_api_service: FootballApiService = None):
+        self.football_api_service = football_api_service or FootballApiService()
+
+    def get_queue(self):
+        return (
+            SportMatch.objects.filter(
+                Q(metadata__isnull=True) | Q(metadata={}),
+                type=SportMatch.SportType.SOCCER,
+                kickoff_datetime__gt=timezone.now(),
+            )
+            .annotate(
+                attempted=Case(
+                    When(metadata__isnull=True, then=Value(0)),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                ),
+                priority=Case(
+                    When(league__external_id__in=allowed_league_ids, then=Value(0)),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                ),
+            )
+            .order_by("attempted", "priority", "kickoff_datetime", "id")
+            .only("id", "external_id", "metadata")
+        )
+
+    def prefetch(self, limit: int = None) -> Counter:
+        """
+        Fetch the predictions of the next ``limit`` matches in the queue.
+
+        @return: Counts of the matches fetched, and of those the API had no
+                 prediction for.
+        """
+        limit = limit or settings.PREDICTION_PREFETCH_BATCH_SIZE
+        matches = list(self.get_queue()[:limit])
+        stats = Counter()
+        if not matches:
+            return stats
+
+        def fetch(match_obj):
+            try:
+                return self.football_api_service.fetch_match_prediction(
+                    match_obj.external_id
+                )
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(
+            max_workers=settings.RAPIDAPI_MAX_CONCURRENCY
+        ) as executor:
+            predictions = list(executor.map(fetch, matches))
+
+        for match_obj, prediction in zip(matches, predictions):
+            # Stored even when empty, so the match falls behind the ones never tried
+            match_obj.metadata = prediction or {}
+            stats["predictions_fetched" if prediction else "predictions_missing"] += 1
+
+        SportMatch.objects.bulk_update(matches, ["metadata"])
+        logger.info(f"Prefetched predictions for {len(matches)} matches: {dict(stats)}")
+
+        return stats
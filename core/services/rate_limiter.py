@@ -0,0 +1,53 @@
+import threading
+import time
+
+from django.conf import settings
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Tokens refill continuously at ``rate_per_minute``
+    up to ``capacity``; ``acquire`` blocks until a token is available.
+    """
+
+    def __init__(self, rate_per_minute: int, capacity: int = None):
+        self.rate_per_second = rate_per_minute / 60
+        self.capacity = capacity or max(1, rate_per_minute // 60)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate_per_second
+
+            time.sleep(wait)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second
+        )
+        self.updated_at = now
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(key: str) -> TokenBucket:
+    """
+    Shared bucket per quota (e.g. RapidAPI key), so every service and
+    thread using the same quota draws from the same bucket.
+    """
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = TokenBucket(settings.RAPIDAPI_REQUESTS_PER_MINUTE)
+
+        return _buckets[key]
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import logging
+import zlib
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("cron")
+
+
+class ApiResponseCache:
+    """
+    Compressed cache of RapidAPI JSON payloads, keyed by the normalized URL
+    (host, path and sorted query parameters).
+
+    How long a payload is kept depends on its endpoint, see
+    RAPIDAPI_CACHE_TTLS. Fixture pages in which every fixture already has a
+    final status never change again and are kept without expiry. Payloads
+    carrying API errors (e.g. an exhausted quota) are never cached.
+    """
+
+    KEY_PREFIX = "rapidapi-response"
+    # Endpoints listing fixtures, across the football, basketball and hockey APIs
+    FIXTURE_ENDPOINTS = {"fixtures", "games"}
+    FINAL_STATUSES = {"FT", "AET", "PEN", "AOT", "AP", "AWD", "WO", "CANC", "ABD"}
+
+    def get(self, url: str) -> Optional[dict]:
+        data = cache.get(self._make_key(url))
+        if data is None:
+            return None
+
+        return json.loads(zlib.decompress(data))
+
+    def set(self, url: str, payload: dict) -> None:
+        if not isinstance(payload, dict) or payload.get("errors"):
+            return
+
+        timeout = self._get_timeout(url, payload)
+        if timeout == 0:
+            return
+
+        data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        cache.set(self._make_key(url), data, timeout=timeout)
+
+    def _get_timeout(self, url: str, payload: dict) -> Optional[int]:
+        """
+        @return: Seconds to keep the payload, None to keep it without expiry
+                 or 0 to not cache it at all.
+        """
+        endpoint = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint in self.FIXTURE_ENDPOINTS:
+            items = payload.get("response") or []
+            if items and all(self._is_final(item) for item in items):
+                return None
+
+        return settings.RAPIDAPI_CACHE_TTLS.get(
+            endpoint, settings.RAPIDAPI_CACHE_DEFAULT_TTL
+        )
+
+    def _is_final(self, item: dict) -> bool:
+        # Football nests the status under "fixture", basketball and hockey don't
+        status = (item.get("fixture") or item).get("status") or {}
+        return status.get("short") in self.FINAL_STATUSES
+
+    def _make_key(self, url: str) -> str:
+        parsed = urlparse(url)
+        query = urlencode(sorted(parse_qsl(parsed.query)))
+        normalized = f"{parsed.netloc}{parsed.path}?{query}"
+        return f"{self.KEY_PREFIX}:{hashlib.md5(normalized.encode()).hexdigest()}"
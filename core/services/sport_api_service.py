@@ -1,24 +1,48 @@
 import logging
-import os
-from datetime import datetime, timedelta
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone as django_timezone
 
 from core.models import (
     ApiSportModel,
     SportCountry,
     SportLeague,
+    SportLeagueTeam,
     SportMatch,
     SportTeam,
 )
+from core.services.asset_service import AssetRequest, AssetService
+from core.services.http_client import RapidApiClient, get_rapidapi_client
+from core.services.lookup_cache import LookupCache
+from core.signals import sport_matches_changed
 from subscriptions.models import Product
 
 logger = logging.getLogger("cron")
 
 
 class SportApiService:
+    SPORT_TYPE: ApiSportModel.SportType = None
+    PRODUCT_NAME: Product.Names = None
+    # Fields refreshed on matches that already exist
+    MATCH_UPDATE_FIELDS = ["home_team_score", "away_team_score", "kickoff_datetime"]
+    # How long after kickoff a match may still be in play
+    LIVE_WINDOW = timedelta(hours=3)
+    # Throttles the day pages polled for live scores, see _fetch_live_matches
+    LIVE_POLL_KEY_PREFIX = "live-scores:day-poll"
+
+    def __init__(
+        self, lookup_cache: Optional[LookupCache] = None, bypass_cache: bool = False
+    ):
+        self.lookup_cache = lookup_cache or LookupCache()
+        # Skip the API response cache, for forced refreshes
+        self.bypass_cache = bypass_cache
+
     def _get_headers(self, sport_type: ApiSportModel.SportType) -> dict:
         if sport_type == ApiSportModel.SportType.BASKETBALL:
             return {
@@ -41,15 +65,21 @@ class SportApiService:
             f"Unsupported sport type: {sport_type}. Supported types are: {list(ApiSportModel.SportType)}"
         )
 
+    def _get_client(self, sport_type: ApiSportModel.SportType) -> RapidApiClient:
+        headers = self._get_headers(sport_type)
+        return get_rapidapi_client(
+            headers["x-rapidapi-host"], headers["x-rapidapi-key"]
+        )
+
     def _get_base_url(self, sport_type: ApiSportModel.SportType) -> str:
         if sport_type == ApiSportModel.SportType.BASKETBALL:
-            return f"https://{settings.RAPIDAPI_BASKETBALL_HOST}"
+            return f"{settings.RAPIDAPI_SCHEME}://{settings.RAPIDAPI_BASKETBALL_HOST}"
 
         elif sport_type == ApiSportModel.SportType.SOCCER:
-            return f"https://{settings.RAPIDAPI_SOCCER_HOST}/v3"
+            return f"{settings.RAPIDAPI_SCHEME}://{settings.RAPIDAPI_SOCCER_HOST}/v3"
 
         elif sport_type == ApiSportModel.SportType.NHL:
-            return f"https://{settings.RAPIDAPI_NHL_HOST}"
+            return f"{settings.RAPIDAPI_SCHEME}://{settings.RAPIDAPI_NHL_HOST}"
 
         raise ValueError(
             f"Unsupported sport type: {sport_type}. Supported types are: {list(ApiSportModel.SportType)}"
@@ -57,9 +87,9 @@ class SportApiService:
 
     def populate_countries(self, sport_type: ApiSportModel.SportType) -> None:
         endpoint = f"{self._get_base_url(sport_type)}/countries"
-        headers = self._get_headers(sport_type)
-        response = requests.get(endpoint, headers=headers)
-        data = response.json()
+        data = self._get_client(sport_type).get_json(
+            endpoint, bypass_cache=self.bypass_cache
+        )
 
         for country in data.get("response", []):
             country_name = country.get("name")
@@ -98,9 +128,9 @@ class SportApiService:
     ) -> None:
         endpoint = f"{self._get_base_url(sport_type)}/leagues"
         print(f"Endpoint: {endpoint}")
-        headers = self._get_headers(sport_type)
-        response = requests.get(endpoint, headers=headers)
-        data = response.json()
+        data = self._get_client(sport_type).get_json(
+            endpoint, bypass_cache=self.bypass_cache
+        )
 
         for item in data.get("response"):
             country = item.get("country")
@@ -146,9 +176,9 @@ class SportApiService:
         Get the league object based on sport type and external ID.
         """
 
-        league_obj = SportLeague.objects.filter(
-            type=sport_type, external_id=external_id
-        ).first()
+        league_obj = self.lookup_cache.get_leagues(sport_type, [external_id]).get(
+            external_id
+        )
 
         if not league_obj:
             logger.error(f"League {external_id} not found")
@@ -162,17 +192,17 @@ class SportApiService:
 
         while start_year <= end_year:
             endpoint = f"{self._get_base_url(SportMatch.SportType.SOCCER)}/fixtures?season={start_year}&league={league_external_id}"
-            headers = self._get_headers(ApiSportModel.SportType.SOCCER)
-            response = requests.get(endpoint, headers=headers)
-
-            if response.status_code != 200:
+            try:
+                data = self._get_client(ApiSportModel.SportType.SOCCER).get_json(
+                    endpoint, bypass_cache=self.bypass_cache
+                )
+            except requests.exceptions.RequestException as e:
                 logger.error(
-                    f"Failed to fetch matches for league {league_external_id} in year {start_year}. Status code: {response.status_code}"
+                    f"Failed to fetch matches for league {league_external_id} in year {start_year}. Error: {e}"
                 )
                 start_year += 1
                 continue
 
-            data = response.json()
             for item in data.get("response", []):
                 if callback:
                     callback(item)
@@ -187,8 +217,17 @@ class SportApiService:
         end_date: Optional[datetime],
         endpoint: str,
         sport_type: ApiSportModel.SportType,
-        process_match: callable,
-    ) -> None:
+        process_page: callable,
+    ) -> Counter:
+        """
+        Fetch the fixtures of every day in the range and process them.
+
+        Day pages are downloaded concurrently by a bounded worker pool, while
+        processing (and with it every DB write) stays in the calling thread,
+        one page at a time in date order.
+
+        @return: The ingestion counts summed over all pages.
+        """
         if start_date is None:
             start_date = datetime.today() - timedelta(days=1)
         if end_date is None:
@@ -196,87 +235,356 @@ class SportApiService:
 
         logger.info(f"Fetching {sport_type} matches from {start_date} to {end_date}")
 
+        query_endpoints = []
         current_date = start_date
         while current_date <= end_date:
-            logger.info(f"Fetching {sport_type} matches for date: {current_date}")
             formatted_date = current_date.strftime("%Y-%m-%d")
-            query_endpoint = f"{endpoint}?date={formatted_date}"
-            logger.info(
-                f"Fetching {sport_type} matches from endpoint: {query_endpoint}"
+            query_endpoints.append(f"{endpoint}?date={formatted_date}")
+            current_date += timedelta(days=1)
+
+        with ThreadPoolExecutor(
+            max_workers=settings.RAPIDAPI_MAX_CONCURRENCY
+        ) as executor:
+            pages = executor.map(
+                lambda query_endpoint: self._fetch_page(query_endpoint, sport_type),
+                query_endpoints,
             )
-            headers = self._get_headers(sport_type)
-            response = requests.get(query_endpoint, headers=headers)
 
-            if response.status_code != 200:
-                logger.error(
-                    f"Failed to fetch {sport_type} matches from endpoint: {query_endpoint}. Status code: {response.status_code}"
-                )
-                current_date += timedelta(days=1)
+            # map yields in submission order, as soon as each page is ready
+            stats = Counter()
+            for query_endpoint, data in zip(query_endpoints, pages):
+                if data is None:
+                    stats["pages_failed"] += 1
+                    continue
+
+                stats["pages_fetched"] += 1
+
+                try:
+                    page_stats = process_page(data.get("response") or [])
+                except Exception as e:
+                    logger.exception(
+                        f"Failed to process {sport_type} matches from endpoint: {query_endpoint}. Error: {e}"
+                    )
+                    stats["pages_failed"] += 1
+                    continue
+
+                logger.info(f"Processed {query_endpoint}: {dict(page_stats)}")
+                stats.update(page_stats)
+
+        logger.info(f"Finished {sport_type} matches: {dict(stats)}")
+        return stats
+
+    def _fetch_page(
+        self, query_endpoint: str, sport_type: ApiSportModel.SportType
+    ) -> Optional[dict]:
+        logger.info(f"Fetching {sport_type} matches from endpoint: {query_endpoint}")
+        try:
+            return self._get_client(sport_type).get_json(
+                query_endpoint, bypass_cache=self.bypass_cache
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(
+                f"Failed to fetch {sport_type} matches from endpoint: {query_endpoint}. Error: {e}"
+            )
+            return None
+
+    # ---------------------------
+    #   Live scores
+    # ---------------------------
+    def get_live_window_matches(self) -> list:
+        """
+        @return: The unfinished matches kicking off within
+                 LIVE_SCORES_LEAD_MINUTES, or kicked off less than LIVE_WINDOW
+                 ago.
+        """
+        now = django_timezone.now()
+        return list(
+            SportMatch.objects.filter(
+                type=self.SPORT_TYPE,
+                kickoff_datetime__gte=now - self.LIVE_WINDOW,
+                kickoff_datetime__lte=now
+                + timedelta(minutes=settings.LIVE_SCORES_LEAD_MINUTES),
+            )
+            .exclude(status=SportMatch.Status.FINISHED)
+            .select_related("league")
+            .only("id", "external_id", "status", "kickoff_datetime", "league")
+        )
+
+    def populate_live_matches(self) -> Counter:
+        """
+        Refresh the matches in their live window, without any API call when
+        there are none.
+
+        @return: The ingestion counts, empty when nothing was polled.
+        """
+        matches = self.get_live_window_matches()
+        if not matches:
+            return Counter()
+
+        stats = self._fetch_live_matches(matches)
+        stats["live_window_matches"] = len(matches)
+        logger.info(
+            f"Polled {len(matches)} live {self.SPORT_TYPE} matches: {dict(stats)}"
+        )
+        return stats
+
+    def _fetch_live_matches(self, matches: list) -> Counter:
+        """
+        Fetch the day pages the live matches kick off on, each at most once
+        per LIVE_SCORES_FALLBACK_MINUTES. Sports whose API can list the live
+        fixtures directly override this.
+        """
+        days = sorted(
+            {
+                match.kickoff_datetime.astimezone(timezone.utc).date()
+                for match in matches
+            }
+        )
+        stats = Counter()
+        for day in days:
+            # Whole day pages are costly, so not every minute like live lists
+            if not cache.add(
+                f"{self.LIVE_POLL_KEY_PREFIX}:{self.SPORT_TYPE}:{day.isoformat()}",
+                True,
+                settings.LIVE_SCORES_FALLBACK_MINUTES * 60,
+            ):
+                stats["days_throttled"] += 1
                 continue
 
-            data = response.json()
-            for item in data.get("response"):
-                process_match(item)
+            day = datetime.combine(day, datetime.min.time())
+            stats.update(self.populate_matches(day, day))
 
-            current_date += timedelta(days=1)
+        return stats
 
-    def _create_or_update_team(
-        self,
-        team_data: dict,
-        league_obj: SportLeague,
-        sport_type: ApiSportModel.SportType,
-        product: Product,
-    ) -> Optional[SportTeam]:
-        team_id = team_data.get("id")
-        team_name = team_data.get("name")
-        team_logo_url = team_data.get("logo")
-
-        team_logo_path = self._download_asset(
-            team_logo_url,
-            f"assets/teams/logos/",
-            f"{team_id}-{league_obj.type}.png",
+    # ---------------------------
+    #   Batch ingestion
+    # ---------------------------
+    def _parse_fixture(self, item: dict) -> Optional[dict]:
+        """
+        Turn one API fixture into the flat dict the batch pipeline writes:
+        ``external_id``, ``league_external_id``, ``home_team`` and
+        ``away_team`` (API team dicts), ``home_team_score``,
+        ``away_team_score``, ``kickoff_datetime`` and optionally ``status``.
+
+        @return: The parsed fixture, or None to skip it.
+        """
+        raise NotImplementedError
+
+    def _get_sport_product(self) -> Product:
+        return self.lookup_cache.get_product(self.PRODUCT_NAME)
+
+    def _process_fixture(self, item: dict) -> Counter:
+        return self._process_fixtures([item])
+
+    def _process_fixtures(self, items: list) -> Counter:
+        """
+        Write one page of fixtures with a fixed number of queries: leagues,
+        teams and matches are resolved from maps loaded for the whole page,
+        and teams, league-team links and matches are upserted in bulk.
+
+        @return: created/updated/unchanged counts for teams and matches.
+        """
+        stats = Counter(fixtures_seen=len(items))
+        fixtures = {}
+        for item in items:
+            fixture = self._parse_fixture(item)
+            if fixture is None:
+                stats["fixtures_skipped"] += 1
+                continue
+
+            fixtures[fixture["external_id"]] = fixture
+
+        leagues = self.lookup_cache.get_leagues(
+            self.SPORT_TYPE, {f["league_external_id"] for f in fixtures.values()}
         )
+        for external_id, fixture in list(fixtures.items()):
+            if fixture["league_external_id"] not in leagues:
+                logger.error(
+                    f"League {fixture['league_external_id']} not found. Skipping match {external_id}"
+                )
+                stats["fixtures_skipped"] += 1
+                del fixtures[external_id]
 
-        try:
-            # Create or get the team (without league relationship)
-            team_obj, created = SportTeam.objects.get_or_create(
-                external_id=team_id,
-                type=sport_type,
-                defaults={
-                    "name": team_name,
-                    "logo": team_logo_path,
-                    "product": product,
-                },
+        if not fixtures:
+            return stats
+
+        team_ids = self._upsert_teams(fixtures.values(), stats)
+        self._link_league_teams(fixtures.values(), leagues, team_ids)
+        self._upsert_matches(fixtures.values(), leagues, team_ids, stats)
+
+        return stats
+
+    def _upsert_teams(self, fixtures, stats: Counter) -> dict:
+        """
+        @return: Map of team external ID to SportTeam ID for the page.
+        """
+        team_data = {}
+        for fixture in fixtures:
+            for team in (fixture["home_team"], fixture["away_team"]):
+                team_data[team.get("id")] = team
+
+        existing = self.lookup_cache.get_teams(self.SPORT_TYPE, team_data)
+
+        # Logos are only fetched for teams that don't have one yet, as one
+        # concurrent batch served from the asset store where possible
+        logo_requests = {
+            external_id: AssetRequest(
+                data.get("logo"),
+                "assets/teams/logos/",
+                f"{external_id}-{self.SPORT_TYPE}.png",
             )
+            for external_id, data in team_data.items()
+            if data.get("logo")
+            and not (external_id in existing and existing[external_id].logo.name)
+        }
+        logo_paths = AssetService().get_paths(list(logo_requests.values()))
+
+        teams_to_write = []
+        for external_id, data in team_data.items():
+            team = existing.get(external_id)
+            logo = team.logo.name if team else ""
+            if not logo and external_id in logo_requests:
+                logo = logo_paths.get(logo_requests[external_id].url, "")
+
+            if team is None:
+                stats["teams_created"] += 1
+            elif team.name != data.get("name") or team.logo.name != logo:
+                stats["teams_updated"] += 1
+            else:
+                stats["teams_unchanged"] += 1
+                continue
 
-            # Update team name and logo if team already exists
-            if not created:
-                team_obj.name = team_name
-                if team_logo_path:
-                    team_obj.logo = team_logo_path
-                team_obj.save()
-
-            # Create the league-team relationship if it doesn't exist
-            if league_obj.current_season_year:
-                from core.models import SportLeagueTeam
-
-                SportLeagueTeam.objects.get_or_create(
-                    league=league_obj,
-                    team=team_obj,
-                    season=league_obj.current_season_year,
+            teams_to_write.append(
+                SportTeam(
+                    external_id=external_id,
+                    type=self.SPORT_TYPE,
+                    name=data.get("name"),
+                    logo=logo,
+                    product=self._get_sport_product(),
                 )
-                logger.info(
-                    f"Created/updated league-team relationship: {team_name} in {league_obj.name} for season {league_obj.current_season_year}"
-                )
-            else:
+            )
+
+        if teams_to_write:
+            SportTeam.objects.bulk_create(
+                teams_to_write,
+                update_conflicts=True,
+                unique_fields=["external_id", "type"],
+                update_fields=["name", "logo", "updated_at"],
+            )
+            # Reload the written teams (and the IDs of new ones) into the cache
+            written = list(
+                SportTeam.objects.filter(
+                    type=self.SPORT_TYPE,
+                    external_id__in=[team.external_id for team in teams_to_write],
+                ).only(*LookupCache.TEAM_FIELDS)
+            )
+            self.lookup_cache.set_teams(self.SPORT_TYPE, written)
+            existing.update({team.external_id: team for team in written})
+
+        return {external_id: team.id for external_id, team in existing.items()}
+
+    def _link_league_teams(self, fixtures, leagues: dict, team_ids: dict) -> None:
+        links = set()
+        for fixture in fixtures:
+            league = leagues[fixture["league_external_id"]]
+            if not league.current_season_year:
+                continue
+
+            for team in (fixture["home_team"], fixture["away_team"]):
+                if team.get("id") in team_ids:
+                    links.add(
+                        (
+                            league.id,
+                            team_ids[team.get("id")],
+                            league.current_season_year,
+                        )
+                    )
+
+        for league in {leagues[f["league_external_id"]] for f in fixtures}:
+            if not league.current_season_year:
                 logger.warning(
-                    f"League {league_obj.name} has no current_season_year, skipping league-team relationship"
+                    f"League {league.name} has no current_season_year, skipping league-team relationship"
                 )
 
-            return team_obj
-        except Exception as e:
-            logger.error(f"Failed to create team {team_name}: {e}")
-            return None
+        SportLeagueTeam.objects.bulk_create(
+            [
+                SportLeagueTeam(league_id=league_id, team_id=team_id, season=season)
+                for league_id, team_id, season in links
+            ],
+            ignore_conflicts=True,
+        )
+
+    def _upsert_matches(
+        self, fixtures, leagues: dict, team_ids: dict, stats: Counter
+    ) -> None:
+        fixtures = list(fixtures)
+        existing = {
+            match.external_id: match
+            for match in SportMatch.objects.filter(
+                type=self.SPORT_TYPE,
+                external_id__in=[f["external_id"] for f in fixtures],
+            ).only("id", "external_id", *self.MATCH_UPDATE_FIELDS)
+        }
+
+        matches_to_write = []
+        changed_ids = []
+        kickoff_changed_ids = []
+        for fixture in fixtures:
+            home_team_id = team_ids.get(fixture["home_team"].get("id"))
+            away_team_id = team_ids.get(fixture["away_team"].get("id"))
+            if not home_team_id or not away_team_id:
+                logger.error(f"Missing teams for match {fixture['external_id']}")
+                stats["fixtures_skipped"] += 1
+                continue
+
+            match = SportMatch(
+                external_id=fixture["external_id"],
+                type=self.SPORT_TYPE,
+                league=leagues[fixture["league_external_id"]],
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                home_team_score=fixture["home_team_score"],
+                away_team_score=fixture["away_team_score"],
+                kickoff_datetime=fixture["kickoff_datetime"],
+                product=self._get_sport_product(),
+            )
+            if "status" in fixture:
+                match.status = fixture["status"]
+
+            current = existing.get(fixture["external_id"])
+            if current is None:
+                stats["matches_created"] += 1
+            elif any(
+                getattr(current, field) != getattr(match, field)
+                for field in self.MATCH_UPDATE_FIELDS
+            ):
+                stats["matches_updated"] += 1
+                changed_ids.append(current.id)
+                if current.kickoff_datetime != match.kickoff_datetime:
+                    kickoff_changed_ids.append(current.id)
+            else:
+                stats["matches_unchanged"] += 1
+                continue
+
+            matches_to_write.append(match)
+
+        if not matches_to_write:
+            return
+
+        SportMatch.objects.bulk_create(
+            matches_to_write,
+            update_conflicts=True,
+            unique_fields=["external_id", "type"],
+            update_fields=[*self.MATCH_UPDATE_FIELDS, "updated_at"],
+        )
+
+        if changed_ids:
+            # Bulk writes skip post_save, so notify the dependants explicitly
+            sport_matches_changed.send(
+                sender=SportMatch,
+                match_ids=changed_ids,
+                kickoff_changed_ids=kickoff_changed_ids,
+            )
 
     def _download_asset(
         self, asset_url: str, upload_dir: str, filename: str
@@ -285,27 +593,4 @@ class SportApiService:
             logger.error("Asset URL is empty.")
             return None
 
-        try:
-            logger.info(f"Downloading asset: {asset_url}")
-            flag_response = requests.get(asset_url, stream=True, timeout=10)
-            flag_response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to download asset: {asset_url}. Error: {e}")
-            return None
-
-        if flag_response.status_code == 200:
-            flag_dir = os.path.join(settings.MEDIA_ROOT, upload_dir)
-            os.makedirs(flag_dir, exist_ok=True)
-
-            flag_filename = filename
-            flag_path = os.path.join(upload_dir, flag_filename)
-            full_flag_path = os.path.join(settings.MEDIA_ROOT, flag_path)
-            with open(full_flag_path, "wb") as f:
-                for chunk in flag_response.iter_content(1024):
-                    f.write(chunk)
-
-            return flag_path
-
-        logger.error(f"Failed to download asset: {asset_url}")
-
-        return None
+        return AssetService().get_path(asset_url, upload_dir, filename)
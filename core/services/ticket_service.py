@@ -0,0 +1,158 @@
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from core.models import BetLine, Ticket
+
+
+class TicketService:
+    """
+    Maintains the data tickets derive from their bet lines: the precomputed
+    bet line layout (grouping by match and the connector lines between
+    picks) and the ticket summary (total odds, leg count and first kickoff).
+    Views and serializers read them as stored instead of recomputing them on
+    every request.
+    """
+
+    LAYOUT_FIELDS = [
+        "layout_position",
+        "same_as_previous",
+        "same_as_next",
+        "should_break_line",
+    ]
+    SUMMARY_FIELDS = ["total_odds", "legs_count", "starts_at"]
+    TOTAL_ODDS_PRECISION = Decimal("0.0001")
+
+    def refresh(self, ticket_id: int) -> None:
+        """
+        Recompute the layout and summary of a ticket after its bet lines changed.
+        """
+        self.refresh_tickets([ticket_id])
+
+    def refresh_tickets(self, ticket_ids) -> int:
+        """
+        Recompute the layout and summary of the given tickets, writing back
+        only the rows that changed. Uses bulk updates, so no save signals fire.
+
+        @return: The number of bet lines and tickets that were updated.
+        """
+        ticket_ids = list(ticket_ids)
+        bet_lines = (
+            BetLine.objects.filter(ticket_id__in=ticket_ids)
+            .select_related("match")
+            .only(
+                "id",
+                "ticket_id",
+                "odds",
+                "match_id",
+                "match__kickoff_datetime",
+                *self.LAYOUT_FIELDS,
+            )
+        )
+
+        by_ticket = defaultdict(list)
+        for bet_line in bet_lines:
+            by_ticket[bet_line.ticket_id].append(bet_line)
+
+        changed_bet_lines = []
+        for ticket_bet_lines in by_ticket.values():
+            changed_bet_lines.extend(self.apply_layout(ticket_bet_lines))
+
+        changed_tickets = []
+        tickets = Ticket.objects.filter(id__in=ticket_ids).only(
+            "id", *self.SUMMARY_FIELDS
+        )
+        for ticket in tickets:
+            if self.apply_summary(ticket, by_ticket[ticket.id]):
+                changed_tickets.append(ticket)
+
+        if changed_bet_lines:
+            BetLine.objects.bulk_update(changed_bet_lines, self.LAYOUT_FIELDS)
+        if changed_tickets:
+            Ticket.objects.bulk_update(changed_tickets, self.SUMMARY_FIELDS)
+
+        return len(changed_bet_lines) + len(changed_tickets)
+
+    def get_ticket_ids_for_matches(self, match_ids) -> list:
+        return list(
+            BetLine.objects.filter(match_id__in=match_ids)
+            .values_list("ticket_id", flat=True)
+            .distinct()
+        )
+
+    def apply_summary(self, ticket: Ticket, bet_lines: list) -> bool:
+        """
+        Set the summary fields of a ticket from its bet lines. Bet lines
+        without odds don't count towards the total odds.
+
+        @return: Whether any of the fields changed.
+        """
+        total_odds = Decimal(1)
+        for bet_line in bet_lines:
+            if bet_line.odds:
+                total_odds *= bet_line.odds
+
+        summary = {
+            "total_odds": total_odds.quantize(self.TOTAL_ODDS_PRECISION),
+            "legs_count": len(bet_lines),
+            "starts_at": min(
+                (bet_line.match.kickoff_datetime for bet_line in bet_lines),
+                default=None,
+            ),
+        }
+        return self._set_changed(ticket, summary)
+
+    def apply_layout(self, bet_lines: list) -> list:
+        """
+        Set the layout fields on the bet lines of a single ticket.
+
+        Bet lines are sorted by match so picks on the same match sit next to
+        each other. A line connects to the next one when both are on the same
+        match, or when both are the only pick on their match; otherwise it
+        breaks. The last line always breaks.
+
+        @return: The bet lines whose layout changed.
+        """
+        bet_lines = sorted(bet_lines, key=lambda x: (x.match_id, x.id))
+        match_counts = Counter(bet_line.match_id for bet_line in bet_lines)
+
+        changed = []
+        for i, bet_line in enumerate(bet_lines):
+            previous_bet_line = bet_lines[i - 1] if i > 0 else None
+            next_bet_line = bet_lines[i + 1] if i < len(bet_lines) - 1 else None
+
+            same_as_previous = (
+                previous_bet_line is not None
+                and previous_bet_line.match_id == bet_line.match_id
+            )
+            same_as_next = (
+                next_bet_line is not None
+                and next_bet_line.match_id == bet_line.match_id
+            )
+
+            if next_bet_line is None:
+                should_break_line = True
+            else:
+                should_connect = same_as_next or (
+                    match_counts[bet_line.match_id] == 1
+                    and match_counts[next_bet_line.match_id] == 1
+                )
+                should_break_line = not should_connect
+
+            layout = {
+                "layout_position": i,
+                "same_as_previous": same_as_previous,
+                "same_as_next": same_as_next,
+                "should_break_line": should_break_line,
+            }
+            if self._set_changed(bet_line, layout):
+                changed.append(bet_line)
+
+        return changed
+
+    def _set_changed(self, obj, values: dict) -> bool:
+        if all(getattr(obj, k) == v for k, v in values.items()):
+            return False
+
+        for k, v in values.items():
+            setattr(obj, k, v)
+        return True
@@ -1,12 +1,20 @@
 # signals.py in your predictions app
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
 
+from core.services.feed_cache_service import FeedCacheService
+from core.services.feed_service import FeedService
+from core.services.ticket_service import TicketService
 from notifications.services.prediction_notification_service import (
     PredictionNotificationService,
 )
 
-from .models import Prediction, Ticket
+from .models import BetLine, FeedItem, Prediction, SportMatch, Ticket
+
+# Sent when existing matches change, including by bulk writes that skip
+# post_save. Arguments: match_ids, kickoff_changed_ids.
+sport_matches_changed = Signal()
 
 
 @receiver(post_save, sender=Prediction)
@@ -41,3 +49,72 @@ def handle_ticket_status_change(sender, instance, **kwargs):
                 prediction_notification_service.send_ticket_won_notification(instance)
             elif instance.status == Ticket.Status.LOST:
                 prediction_notification_service.send_ticket_lost_notification(instance)
+
+
+@receiver(post_save, sender=Prediction)
+def sync_prediction_feed_item(sender, instance, **kwargs):
+    FeedService().sync_prediction(instance.id)
+
+
+@receiver(post_delete, sender=Prediction)
+def remove_prediction_feed_item(sender, instance, **kwargs):
+    FeedService().remove(FeedItem.ObjectType.PREDICTION, instance.id)
+
+
+@receiver(post_save, sender=Ticket)
+def sync_ticket_feed_item(sender, instance, **kwargs):
+    FeedService().sync_ticket(instance.id)
+
+
+@receiver(post_delete, sender=Ticket)
+def remove_ticket_feed_item(sender, instance, **kwargs):
+    FeedService().remove(FeedItem.ObjectType.TICKET, instance.id)
+
+
+@receiver([post_save, post_delete], sender=BetLine)
+def handle_bet_line_change(sender, instance, **kwargs):
+    """
+    Recompute the ticket layout and totals, then re-render its feed item.
+    """
+    TicketService().refresh(instance.ticket_id)
+    FeedService().sync_ticket(instance.ticket_id)
+
+
+@receiver(post_save, sender=SportMatch)
+def handle_sport_match_change(sender, instance, created, **kwargs):
+    if not created and instance.tracker.changed():
+        sport_matches_changed.send(
+            sender=SportMatch,
+            match_ids=[instance.id],
+            kickoff_changed_ids=(
+                [instance.id]
+                if instance.tracker.has_changed("kickoff_datetime")
+                else []
+            ),
+        )
+
+
+@receiver(sport_matches_changed)
+def sync_match_feed_items(sender, match_ids, kickoff_changed_ids, **kwargs):
+    """
+    Re-render the feed items showing these matches when their score, status or
+    kickoff changes. Tickets are refreshed first since kickoffs drive starts_at.
+    """
+    if kickoff_changed_ids:
+        ticket_service = TicketService()
+        ticket_service.refresh_tickets(
+            ticket_service.get_ticket_ids_for_matches(kickoff_changed_ids)
+        )
+
+    FeedService().sync_matches(match_ids)
+    transaction.on_commit(FeedCacheService().bump_version)
+
+
+@receiver([post_save, post_delete], sender=Prediction)
+@receiver([post_save, post_delete], sender=Ticket)
+@receiver([post_save, post_delete], sender=BetLine)
+def invalidate_feed_cache(sender, **kwargs):
+    """
+    Mark every cached upcoming feed response stale once the change is committed.
+    """
+    transaction.on_commit(FeedCacheService().bump_version)
@@ -0,0 +1,197 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from core.models import ApiSportModel, IngestionRun
+from core.services.api.league_service import LeagueService
+from core.services.api.player_service import PlayerService
+from core.services.api.team_standings import TeamStandingsService
+from core.services.basketball_api_service import BasketballApiService
+from core.services.football_api_service import FootballApiService
+from core.services.http_client import log_client_metrics
+from core.services.lookup_cache import LookupCache
+from core.services.payload_archive import PayloadArchive
+from core.services.prediction_prefetch_service import PredictionPrefetchService
+from tasks.registry import task
+
+logger = logging.getLogger("cron")
+
+MATCH_SERVICES = {
+    ApiSportModel.SportType.SOCCER: FootballApiService,
+    ApiSportModel.SportType.BASKETBALL: BasketballApiService,
+}
+
+
+def _populate_matches_concurrently(job, start_date, end_date):
+    """
+    Run the football and basketball ingestion side by side. Each RapidAPI
+    key keeps its own rate limit in the shared HTTP client.
+    """
+
+    def populate(service):
+        try:
+            started_at = timezone.now()
+            stats = service.populate_matches(start_date, end_date)
+            _record_ingestion_run(job, service.SPORT_TYPE, started_at, stats)
+        finally:
+            connection.close()
+
+    lookup_cache = LookupCache()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(populate, FootballApiService(lookup_cache)),
+            executor.submit(populate, BasketballApiService(lookup_cache)),
+        ]
+        for future in futures:
+            future.result()
+
+    lookup_cache.log_stats(job)
+    log_client_metrics(job)
+
+
+def _record_ingestion_run(job, sport_type, started_at, stats):
+    rows_touched = sum(
+        stats[key]
+        for key in (
+            "matches_created",
+            "matches_updated",
+            "teams_created",
+            "teams_updated",
+        )
+    )
+    ingestion_run = IngestionRun.objects.create(
+        job=job,
+        sport_type=sport_type,
+        started_at=started_at,
+        finished_at=timezone.now(),
+        rows_touched=rows_touched,
+        stats=dict(stats),
+    )
+    logger.info(
+        f"Job: {job} {sport_type} touched {rows_touched} of {stats['fixtures_seen']} fixtures in {ingestion_run.duration}"
+    )
+
+
+@task("core.update_scores", priority=10, singleton=True)
+def update_scores():
+    logger.info(f"Job: update_scores started at {datetime.now()}")
+    start_date = datetime.today()
+
+    _populate_matches_concurrently("update_scores", start_date, start_date)
+    logger.info(f"Job: update_scores finished at {datetime.now()}")
+
+
+@task("core.poll_live_scores", priority=20, singleton=True)
+def poll_live_scores():
+    """
+    Poll only the matches in or near their live window; runs every minute,
+    but makes no API call while nothing is being played.
+    """
+    lookup_cache = LookupCache()
+    for sport_type, service_class in MATCH_SERVICES.items():
+        # Live scores must never come from the response cache
+        service = service_class(lookup_cache, bypass_cache=True)
+        started_at = timezone.now()
+        stats = service.populate_live_matches()
+        if stats:
+            _record_ingestion_run("poll_live_scores", sport_type, started_at, stats)
+
+
+@task("core.load_matches", singleton=True)
+def load_matches():
+    """
+    Fan out one sub-task per sport and day, from yesterday to six days ahead.
+    """
+    logger.info(f"Job: load_matches started at {datetime.now()}")
+    start_date = date.today() - timedelta(days=1)
+
+    for i in range(8):
+        day = start_date + timedelta(days=i)
+        for sport_type in MATCH_SERVICES:
+            populate_matches_day.enqueue("load_matches", sport_type, day.isoformat())
+
+    logger.info(f"Job: load_matches queued at {datetime.now()}")
+
+
+@task("core.populate_matches_day", max_attempts=3, singleton=True)
+def populate_matches_day(job, sport_type, day):
+    day = datetime.fromisoformat(day)
+    service = MATCH_SERVICES[sport_type]()
+
+    started_at = timezone.now()
+    stats = service.populate_matches(day, day)
+    _record_ingestion_run(job, sport_type, started_at, stats)
+    service.lookup_cache.log_stats(job)
+
+
+@task("core.update_league_season_year", singleton=True)
+def update_league_season_year():
+    logger.info(f"Job: update_league_season_year started at {datetime.now()}")
+    league_service = LeagueService()
+    league_service.update_league_season_year()
+    log_client_metrics("update_league_season_year")
+    logger.error(f"Job: update_league_season_year finished at {datetime.now()}")
+
+
+@task("core.sync_league_rosters", max_attempts=3, singleton=True)
+def sync_league_rosters():
+    logger.info(f"Job: sync_league_rosters started at {datetime.now()}")
+    LeagueService().map_teams_to_leagues()
+    log_client_metrics("sync_league_rosters")
+    logger.info(f"Job: sync_league_rosters finished at {datetime.now()}")
+
+
+@task("core.update_standings", singleton=True)
+def update_standings():
+    """
+    Fan out one sub-task per league with standings coverage.
+    """
+    logger.info(f"Job: update_standings started at {datetime.now()}")
+    for league in LeagueService().get_standings_leagues():
+        update_league_standings.enqueue(league.external_id, league.current_season_year)
+
+    logger.info(f"Job: update_standings queued at {datetime.now()}")
+
+
+@task("core.update_league_standings", max_attempts=3, singleton=True)
+def update_league_standings(league_external_id, season_year):
+    TeamStandingsService().update_team_standings(league_external_id, season_year)
+
+
+@task("core.sync_players", max_attempts=5, singleton=True)
+def sync_players():
+    """
+    Refresh the player catalog. A failed run is retried by the queue and
+    resumes from the last checkpointed page.
+    """
+    logger.info(f"Job: sync_players started at {datetime.now()}")
+    started_at = timezone.now()
+    stats = PlayerService().fetch_player_profiles()
+    IngestionRun.objects.create(
+        job="sync_players",
+        sport_type=ApiSportModel.SportType.SOCCER,
+        started_at=started_at,
+        finished_at=timezone.now(),
+        rows_touched=stats["players_created"] + stats["players_updated"],
+        stats=dict(stats),
+    )
+    log_client_metrics("sync_players")
+    logger.info(f"Job: sync_players finished at {datetime.now()}")
+
+
+@task("core.prefetch_match_predictions", singleton=True)
+def prefetch_match_predictions():
+    logger.info(f"Job: prefetch_match_predictions started at {datetime.now()}")
+    PredictionPrefetchService().prefetch()
+    log_client_metrics("prefetch_match_predictions")
+    logger.info(f"Job: prefetch_match_predictions finished at {datetime.now()}")
+
+
+@task("core.prune_api_archive", singleton=True)
+def prune_api_archive():
+    deleted = PayloadArchive().prune(timedelta(days=settings.API_ARCHIVE_MAX_AGE_DAYS))
+    logger.info(f"Pruned {deleted} API archive segments")
@@ -22,6 +22,8 @@ from core.models import (
     Prediction,
     Ticket,
 )
+from core.services.feed_cache_service import FeedCacheService
+from core.services.history_timeline_service import HistoryTimelineService
 from subscriptions.models import Product
 
 logger = logging.getLogger(__name__)
@@ -70,13 +72,15 @@ class HistoryView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Get combined and sorted objects (now with improved rendering logic)
-        combined_objects = self._get_combined_objects()
-
-        # Paginate results
-        paginator = Paginator(combined_objects, self.paginate_by)
+        # Paginate the timeline in the database, then load only this page
+        timeline = HistoryTimelineService(
+            product_filter=self._get_product_filter(),
+            object_filter=self._get_object_filter(),
+        )
+        paginator = Paginator(timeline.get_queryset(), self.paginate_by)
         page_number = self.request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
+        object_list = self._get_page_objects(timeline, page_obj)
 
         context.update(
             {
@@ -98,114 +102,16 @@ class HistoryView(TemplateView):
                 ).order_by("order"),
                 "base_url": "core:history",
                 "page_obj": page_obj,
-                "object_list": page_obj.object_list,
+                "object_list": object_list,
             }
         )
         return context
 
-    def _get_combined_objects(self):
+    def _get_page_objects(self, timeline, page_obj):
         """
-        Combine and sort predictions/tickets.
-        Now includes the specific rendering logic (break lines, match grouping)
-        from UpcomingMatchesView.
+        Load the predictions/tickets of the current page.
         """
-        predictions, tickets = self._get_filtered_querysets()
-
-        # Create unified object list
-        combined = []
-
-        # Process Predictions
-        for pred in predictions:
-            combined.append(
-                {
-                    "object": pred,
-                    "type": "prediction",
-                    "datetime": pred.match.kickoff_datetime,
-                }
-            )
-
-        # Process Tickets (Applying UpcomingMatchesView logic here)
-        for ticket in tickets:
-            # Step 1: Sort bet_lines by match_id to ensure grouping
-            bet_lines = sorted(list(ticket.bet_lines.all()), key=lambda x: x.match_id)
-
-            # Step 2: Count Picks per Match
-            match_counts = defaultdict(int)
-            for bet_line in bet_lines:
-                match_counts[bet_line.match_id] += 1
-
-            # Step 3: Set Flags (Same as Previous/Next, Should Break Line)
-            for i, bet_line in enumerate(bet_lines):
-                # Reset flags
-                bet_line.same_as_previous = False
-                bet_line.same_as_next = False
-
-                # Check Previous
-                if i > 0 and bet_lines[i - 1].match_id == bet_line.match_id:
-                    bet_line.same_as_previous = True
-
-                # Check Next
-                if i < len(bet_lines) - 1:
-                    next_bet_line = bet_lines[i + 1]
-
-                    if next_bet_line.match_id == bet_line.match_id:
-                        bet_line.same_as_next = True
-
-                    # Calculate should_break_line logic
-                    current_is_single_pick = match_counts[bet_line.match_id] == 1
-                    next_is_single_pick = match_counts[next_bet_line.match_id] == 1
-
-                    # Connect logic: nextIsSameMatch OR (current_is_single AND next_is_single)
-                    should_connect = bet_line.same_as_next or (
-                        current_is_single_pick and next_is_single_pick
-                    )
-
-                    bet_line.should_break_line = not should_connect
-                else:
-                    # Last item always breaks
-                    bet_line.should_break_line = True
-
-            # Attach the sorted list to the ticket object
-            ticket.sorted_bet_lines = bet_lines
-
-            combined.append(
-                {"object": ticket, "type": "ticket", "datetime": ticket.starts_at}
-            )
-
-        # Sort descending by date (Standard history view behavior)
-        return sorted(combined, key=lambda x: x["datetime"], reverse=True)
-
-    def _get_filtered_querysets(self):
-        """Replicate API's filtering logic with optimized queries"""
-        product_filter = self._get_product_filter()
-        obj_filter = self._get_object_filter()
-
-        predictions = Prediction.objects.none()
-        tickets = Ticket.objects.none()
-
-        if obj_filter in [None, "predictions"]:
-            predictions = Prediction.objects.filter(
-                visibility=Prediction.Visibility.PUBLIC,
-                status__in=[Prediction.Status.WON, Prediction.Status.LOST],
-            ).select_related(
-                "match__home_team", "match__away_team", "match__league", "product"
-            )
-            if product_filter:
-                predictions = predictions.filter(product__name=product_filter)
-
-        if obj_filter in [None, "tickets"]:
-            tickets = Ticket.objects.filter(
-                visibility=Ticket.Visibility.PUBLIC,
-                status__in=[Ticket.Status.WON, Ticket.Status.LOST],
-            ).prefetch_related(
-                "bet_lines__match__home_team",
-                "bet_lines__match__away_team",
-                "bet_lines__match__league",
-            )
-            if product_filter:
-                tickets = tickets.filter(product__name=product_filter)
-
-        return predictions, tickets
+        return timeline.hydrate(page_obj.object_list)
 
     def _get_product_filter(self):
         val = self.request.GET.get("filter")
@@ -474,7 +380,7 @@ class UpcomingMatchesView(TemplateView):
                 "match",
                 "match__home_team",
                 "match__away_team",
-                "match__league",
+                "match__league__country",
                 "product",
             )
             .exclude(id=1053)
@@ -495,12 +401,13 @@ class UpcomingMatchesView(TemplateView):
                 visibility__in=self._get_visibility_filter(),
                 status=Ticket.Status.PENDING,
             )
+            .select_related("product")
             .prefetch_related(
                 "bet_lines",
                 "bet_lines__match",
                 "bet_lines__match__home_team",
                 "bet_lines__match__away_team",
-                "bet_lines__match__league",
+                "bet_lines__match__league__country",
             )
             .order_by("product__name", "starts_at")
         )
@@ -508,25 +415,22 @@ class UpcomingMatchesView(TemplateView):
         if filter:
             sport_tickets = sport_tickets.filter(product__name=filter)
 
-        for ticket in sport_tickets:
-            for i, bet_line in enumerate(ticket.bet_lines.all()):
-                if i < len(ticket.bet_lines.all()) - 1:
-                    next_bet_line = ticket.bet_lines.all()[i + 1]
-                    if bet_line.match == next_bet_line.match:
-                        bet_line.has_same_next = True
-                    else:
-                        bet_line.has_same_next = False
-
-                if i > 0:
-                    previous_bet_line = ticket.bet_lines.all()[i - 1]
-                    if bet_line.match == previous_bet_line.match:
-                        bet_line.has_same_previous = True
-                    else:
-                        bet_line.has_same_previous = False
-
         return sport_tickets
 
     def _get_grouped_objects(self):
+        """
+        Cached grouped objects, keyed by everything the grouping depends on.
+        """
+        key_parts = [
+            "upcoming-web",
+            "admin" if self.request.user.is_superuser else "public",
+            self._get_product_filter(),
+            self._get_object_filter(),
+            self.request.session.get("user_timezone", "UTC"),
+        ]
+        return FeedCacheService().get_or_build(key_parts, self._build_grouped_objects)
+
+    def _build_grouped_objects(self):
         """
         Group predictions and sport tickets by date and sort by datetime within each date.
         """
@@ -555,56 +459,6 @@ class UpcomingMatchesView(TemplateView):
 
         if sport_tickets:
             for ticket in sport_tickets:
-                # FIX: Sort bet_lines by match_id (or kickoff) first.
-                # This ensures lines for the same match sit next to each other in the list.
-                bet_lines = sorted(
-                    list(ticket.bet_lines.all()), key=lambda x: x.match_id
-                )
-
-                # --- NEW: Step 1: Count Picks per Match ---
-                match_counts = defaultdict(int)
-                for bet_line in bet_lines:
-                    match_counts[bet_line.match_id] += 1
-
-                # --- Existing and NEW: Step 2: Set Flags ---
-                for i, bet_line in enumerate(bet_lines):
-                    # Existing flags
-                    bet_line.same_as_previous = False
-                    bet_line.same_as_next = False
-
-                    if (
-                        i > 0 and bet_lines[i - 1].match_id == bet_line.match_id
-                    ):  # Use match_id for comparison
-                        bet_line.same_as_previous = True
-
-                    # Check if this is not the last item
-                    if i < len(bet_lines) - 1:
-                        next_bet_line = bet_lines[i + 1]
-
-                        if next_bet_line.match_id == bet_line.match_id:
-                            bet_line.same_as_next = True
-
-                        # --- NEW: Step 3: Calculate should_break_line ---
-
-                        # Check if current and next are single picks
-                        current_is_single_pick = match_counts[bet_line.match_id] == 1
-                        next_is_single_pick = match_counts[next_bet_line.match_id] == 1
-
-                        # Flutter's CONNECT logic: nextIsSameMatch OR (current_is_single_pick AND next_is_single_pick)
-                        should_connect = bet_line.same_as_next or (
-                            current_is_single_pick and next_is_single_pick
-                        )
-
-                        # The line should break if it SHOULD NOT connect
-                        bet_line.should_break_line = not should_connect
-                    else:
-                        # The absolute last bet line always breaks (handled by CSS :last-child, but good to set here)
-                        bet_line.should_break_line = True
-
-                # FIX: Attach the sorted list to the ticket object so the template uses the correct order.
-                # In your template, change the loop to: {% for bet_line in ticket.sorted_bet_lines %}
-                ticket.sorted_bet_lines = bet_lines
-
                 all_objects.append(
                     {"object": ticket, "type": "ticket", "datetime": ticket.starts_at}
                 )
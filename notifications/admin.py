@@ -3,11 +3,12 @@ import logging
 from django.contrib import admin, messages
 
 from notifications.models import (
+    NotificationOutbox,
     NotificationRequest,
     NotificationTopic,
     UserNotification,
 )
-from notifications.services.fcm_service import FCMService
+from notifications.services.outbox_service import NotificationOutboxService
 
 logger = logging.getLogger(__name__)
 
@@ -67,28 +68,21 @@ class NotificationRequestAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at", "updated_at")
 
     def _hide_related_notifications(self, request, notification_requests):
-        """Helper to hide related UserNotifications for single or bulk deletes."""
+        """
+        Tell the apps to refetch their inbox, which drops the deleted
+        NotificationRequests, for single or bulk deletes.
+        """
         if not notification_requests:  # Handle empty queryset
             logger.info(
                 "No NotificationRequests provided for hiding related notifications."
             )
             return
         try:
-            # Use a single query to update all related UserNotifications
             logger.info(
                 f"Hiding related notifications for NotificationRequests: {notification_requests}"
             )
-            UserNotification.objects.filter(request__in=notification_requests).update(
-                is_visible=False
-            )
-
-            fcm_result = FCMService().send_silent_notification()
-            if fcm_result["status"] == "success":
-                logger.info("Refetch data message sent successfully to 'ALL' topic")
-            else:
-                logger.warning(
-                    f"Failed to send refetch message: {fcm_result['message']}"
-                )
+            NotificationOutboxService().enqueue_silent_notification()
+            logger.info("Refetch data message queued for 'ALL' topic")
         except Exception as e:
             # Log error or notify admin (optional, adjust based on your needs)
             self.message_user(
@@ -130,3 +124,27 @@ class UserNotificationAdmin(admin.ModelAdmin):
     list_filter = ("is_read", "is_important", "topic", "created_at", "updated_at")
     ordering = ("-created_at",)
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "kind",
+        "topic",
+        "title",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+    search_fields = ("title", "topic", "last_error")
+    list_filter = ("status", "kind", "created_at")
+    ordering = ("-created_at",)
+    readonly_fields = ("created_at", "updated_at")
+    actions = ["requeue_messages"]
+
+    @admin.action(description="Requeue dead-lettered messages")
+    def requeue_messages(self, request, queryset):
+        requeued = NotificationOutboxService().requeue(queryset)
+        self.message_user(request, f"Requeued {requeued} messages.")
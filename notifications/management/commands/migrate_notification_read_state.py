@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from notifications.models import (
+    NotificationReadMarker,
+    NotificationReadOverride,
+    NotificationTopic,
+    UserNotification,
+)
+from notifications.services.inbox_service import NotificationInboxService
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Carry the read state of the legacy per-user notifications over to the "
+        "read-time inbox; run once when deploying it"
+    )
+
+    def handle(self, *args, **kwargs):
+        now = timezone.now()
+        topic_ids = list(NotificationTopic.objects.values_list("id", flat=True))
+
+        with transaction.atomic():
+            # Everything sent before the deploy counts as read...
+            markers = 0
+            user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+            for i in range(0, len(user_ids), BATCH_SIZE):
+                markers += len(
+                    NotificationReadMarker.objects.bulk_create(
+                        [
+                            NotificationReadMarker(
+                                user_id=user_id, topic_id=topic_id, read_until=now
+                            )
+                            for user_id in user_ids[i : i + BATCH_SIZE]
+                            for topic_id in topic_ids
+                        ],
+                        update_conflicts=True,
+                        unique_fields=["user", "topic"],
+                        update_fields=["read_until", "updated_at"],
+                    )
+                )
+
+            # ...except for the copies users hadn't read yet
+            unread = UserNotification.objects.filter(
+                is_read=False, is_visible=True, request__isnull=False
+            ).values_list("user_id", "request_id")
+            overrides = 0
+            for batch in self._batches(unread.iterator(chunk_size=BATCH_SIZE)):
+                overrides += len(
+                    NotificationReadOverride.objects.bulk_create(
+                        [
+                            NotificationReadOverride(
+                                user_id=user_id, request_id=request_id, is_read=False
+                            )
+                            for user_id, request_id in batch
+                        ],
+                        update_conflicts=True,
+                        unique_fields=["user", "request"],
+                        update_fields=["is_read", "updated_at"],
+                    )
+                )
+
+            transaction.on_commit(NotificationInboxService.bump_version)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Marked {markers} topic inboxes read and kept {overrides} notifications unread"
+            )
+        )
+
+    def _batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 
 from core.utils import BaseInternalModel
@@ -52,11 +53,125 @@ class NotificationRequest(BaseInternalModel):
     class Meta:
         verbose_name = "Notification Request"
         verbose_name_plural = "Notification Requests"
+        indexes = [
+            # Inbox pages, newest first, see NotificationInboxService
+            models.Index(
+                fields=["-created_at", "-id"], name="notificationrequest_inbox_idx"
+            )
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.topic.name})"
 
 
+class NotificationReadMarker(BaseInternalModel):
+    """
+    Read watermark of a user in a topic: every notification of the topic
+    created up to ``read_until`` is read.
+    """
+
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="notification_read_markers",
+    )
+    topic = models.ForeignKey(
+        NotificationTopic, on_delete=models.CASCADE, related_name="read_markers"
+    )
+    read_until = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Notification Read Marker"
+        verbose_name_plural = "Notification Read Markers"
+        unique_together = [("user", "topic")]
+
+    def __str__(self):
+        return f"{self.user} read {self.topic} until {self.read_until}"
+
+
+class NotificationReadOverride(BaseInternalModel):
+    """
+    Read state of a single notification for a user, taking precedence over
+    the topic's read marker. Only notifications read one by one get a row.
+    """
+
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="notification_read_overrides",
+    )
+    request = models.ForeignKey(
+        NotificationRequest, on_delete=models.CASCADE, related_name="read_overrides"
+    )
+    is_read = models.BooleanField(default=True)
+
+    class Meta:
+        verbose_name = "Notification Read Override"
+        verbose_name_plural = "Notification Read Overrides"
+        unique_together = [("user", "request")]
+
+    def __str__(self):
+        return f"{self.request} ({'read' if self.is_read else 'unread'} by {self.user})"
+
+
+class NotificationOutbox(BaseInternalModel):
+    """
+    FCM push waiting to be sent. Rows are written in the transaction that
+    creates the notification and sent by the dispatch_outbox task, so no
+    request waits on Firebase.
+    """
+
+    class Kind(models.TextChoices):
+        NOTIFICATION = "NOTIFICATION", "Notification"
+        # One notification to every token in ``tokens``
+        MULTICAST = "MULTICAST", "Multicast"
+        # Data-only message telling the apps to refetch their inbox
+        SILENT = "SILENT", "Silent"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENT = "SENT", "Sent"
+        DEAD = "DEAD", "Dead"
+
+    request = models.ForeignKey(
+        NotificationRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbox_messages",
+    )
+    kind = models.CharField(max_length=12, choices=Kind, default=Kind.NOTIFICATION)
+    status = models.CharField(max_length=8, choices=Status, default=Status.PENDING)
+    topic = models.CharField(max_length=255, blank=True)
+    token = models.CharField(max_length=512, blank=True)
+    tokens = models.JSONField(default=list, blank=True)
+    # Product whose subscribers a MULTICAST goes to; the dispatcher resolves
+    # it into ``tokens`` when it first sends the message
+    segment = models.CharField(max_length=255, blank=True)
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    message_id = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Notification Outbox Message"
+        verbose_name_plural = "Notification Outbox"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="notification_outbox_due_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.topic or self.segment or 'token'} ({self.status})"
+
+
+# Per-user copies of the notifications, from before the inbox was resolved
+# from NotificationRequest at read time; no longer written.
 class UserNotification(BaseInternalModel):
     class IconNames(models.TextChoices):
         SOCCER = "SOCCER", "Soccer"
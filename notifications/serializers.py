@@ -46,3 +46,31 @@ class UserNotificationSerializer(serializers.ModelSerializer):
             "icon",
             "is_important",
         ]
+
+
+class InboxNotificationSerializer(serializers.ModelSerializer):
+    """
+    A NotificationRequest as an inbox entry of the requesting user, in the
+    shape of UserNotificationSerializer. Expects the ``is_read`` annotation
+    of NotificationInboxService.
+    """
+
+    user = serializers.SerializerMethodField()
+    is_read = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = NotificationRequest
+        fields = [
+            "id",
+            "user",
+            "title",
+            "message",
+            "is_read",
+            "icon",
+            "is_important",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_user(self, obj):
+        return self.context["request"].user.id
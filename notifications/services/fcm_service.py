@@ -1,17 +1,28 @@
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
+from django.conf import settings
 from firebase_admin import messaging
-from firebase_admin.exceptions import FirebaseError
+from firebase_admin.exceptions import FirebaseError, InternalError, UnavailableError
 
+from accounts.models import User
 from notifications.models import NotificationTopic
 
 
 class FCMService:
     """
     Service for handling Firebase Cloud Messaging (FCM) notifications with
-    NotificationTopic integration. Supports sending to topics or individual tokens.
+    NotificationTopic integration. Supports sending to topics or individual tokens,
+    and to many tokens at once with send_multicast.
     """
 
+    # Most tokens Firebase accepts in one multicast request
+    MULTICAST_BATCH_SIZE = 500
+    # The token no longer belongs to an app install of this project
+    UNREGISTERED_ERRORS = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+    # Worth sending again later
+    RETRYABLE_ERRORS = (messaging.QuotaExceededError, UnavailableError, InternalError)
+
     @staticmethod
     def validate_inputs(
         topic: Optional[str],
@@ -90,6 +101,14 @@ class FCMService:
                 "topic": topic,
                 "token": token,
             }
+        except self.UNREGISTERED_ERRORS as e:
+            User.objects.filter(fcm_token=token).update(fcm_token=None)
+            return {
+                "status": "error",
+                "message": f"Firebase error: {str(e)}",
+                "error_code": getattr(e, "code", "unknown"),
+                "unregistered": [token],
+            }
         except FirebaseError as e:
             return {
                 "status": "error",
@@ -99,6 +118,86 @@ class FCMService:
         except Exception as e:
             return {"status": "error", "message": f"Unexpected error: {str(e)}"}
 
+    def send_multicast(
+        self,
+        tokens: List[str],
+        title: str,
+        body: str,
+        data: Optional[Dict] = None,
+    ) -> dict:
+        """
+        Send one notification to many device tokens, in batches of
+        MULTICAST_BATCH_SIZE sent FCM_MULTICAST_CONCURRENCY at a time.
+        Tokens Firebase reports as unregistered are cleared from their users.
+
+        @return: The success and failure counts, the ``unregistered`` tokens,
+                 the ``retryable`` tokens that failed transiently and the
+                 ``errors`` of the other failed tokens.
+        """
+        if not title:
+            return {"status": "error", "message": "Title is required"}
+        if not body:
+            return {"status": "error", "message": "Body is required"}
+
+        tokens = list(dict.fromkeys(token for token in tokens if token))
+        batches = [
+            tokens[i : i + self.MULTICAST_BATCH_SIZE]
+            for i in range(0, len(tokens), self.MULTICAST_BATCH_SIZE)
+        ]
+
+        def send_batch(batch):
+            message = messaging.MulticastMessage(
+                notification=messaging.Notification(title=title, body=body),
+                data=data or {},
+                tokens=batch,
+                android=self._get_andorid_config(),
+            )
+            try:
+                return [
+                    response.exception
+                    for response in messaging.send_each_for_multicast(message).responses
+                ]
+            except FirebaseError as e:
+                # The whole batch failed, e.g. on an auth or network error
+                return [e] * len(batch)
+
+        result = {
+            "status": "success",
+            "success_count": 0,
+            "failure_count": 0,
+            "unregistered": [],
+            "retryable": [],
+            "errors": {},
+        }
+        with ThreadPoolExecutor(
+            max_workers=settings.FCM_MULTICAST_CONCURRENCY
+        ) as executor:
+            # One exception, or None on success, per token of every batch
+            for batch, exceptions in zip(batches, executor.map(send_batch, batches)):
+                for token, exception in zip(batch, exceptions):
+                    if exception is None:
+                        result["success_count"] += 1
+                        continue
+
+                    result["failure_count"] += 1
+                    if isinstance(exception, self.UNREGISTERED_ERRORS):
+                        result["unregistered"].append(token)
+                    elif isinstance(exception, self.RETRYABLE_ERRORS):
+                        result["retryable"].append(token)
+                    else:
+                        result["errors"][token] = str(exception)
+
+        if result["unregistered"]:
+            User.objects.filter(fcm_token__in=result["unregistered"]).update(
+                fcm_token=None
+            )
+
+        if tokens and not result["success_count"]:
+            result["status"] = "error"
+            result["message"] = f"All {len(tokens)} tokens failed"
+
+        return result
+
     def send_silent_notification(
         self,
         additional_data: Optional[Dict] = None,
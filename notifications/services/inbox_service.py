@@ -0,0 +1,234 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    BooleanField,
+    Case,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone as django_timezone
+
+from accounts.models import User
+from notifications.models import (
+    NotificationReadMarker,
+    NotificationReadOverride,
+    NotificationRequest,
+)
+from subscriptions.models import Product
+
+
+@dataclass(frozen=True)
+class InboxCursor:
+    """
+    Position in the inbox, which is ordered by (created_at, id) descending.
+    Encoded as ``<created_at>,<id>`` with the time in UTC.
+    """
+
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        created_at = self.created_at.astimezone(timezone.utc).isoformat()
+        return f"{created_at.replace('+00:00', 'Z')},{self.id}"
+
+    @classmethod
+    def decode(cls, value: str) -> "InboxCursor":
+        try:
+            created_at, notification_id = value.rsplit(",", 1)
+            cursor = cls(
+                created_at=datetime.fromisoformat(created_at), id=int(notification_id)
+            )
+        except ValueError as e:
+            raise ValueError(f"Invalid cursor: {value}") from e
+
+        if django_timezone.is_naive(cursor.created_at):
+            raise ValueError(f"Invalid cursor: {value}")
+
+        return cursor
+
+
+class NotificationInboxService:
+    """
+    Notification inbox of one user, resolved at read time.
+
+    A broadcast NotificationRequest is stored once and shows up in the inbox
+    of every member of its topic; product topics are limited to the users
+    with an active subscription to the product. Requests sent to a single
+    user only show up in that user's inbox.
+
+    Read state is a per-topic watermark (NotificationReadMarker) plus sparse
+    per-notification overrides (NotificationReadOverride), so neither sending
+    nor marking everything read writes a row per notification.
+
+    Unread counts are cached per user along the inbox version, which every
+    saved or deleted NotificationRequest bumps, so new notifications turn all
+    counts stale at once. Reads adjust the user's cached count in place.
+    """
+
+    VERSION_KEY = "notifications:inbox-version"
+    UNREAD_COUNT_PREFIX = "notifications:unread-count"
+
+    # Topics only the subscribers of the product receive
+    PRODUCT_TOPICS = {
+        "SOCCER": Product.Names.SOCCER,
+        "BASKETBALL": Product.Names.BASKETBALL,
+    }
+
+    def __init__(self, user: User):
+        self.user = user
+
+    def get_notifications(self, before: Optional[InboxCursor] = None) -> QuerySet:
+        """
+        @return: The visible notifications of the user, newest first, each
+                 annotated with ``is_read``; only those older than ``before``
+                 when given.
+        """
+        override = NotificationReadOverride.objects.filter(
+            user=self.user, request=OuterRef("pk")
+        ).values("is_read")[:1]
+        read_until = NotificationReadMarker.objects.filter(
+            user=self.user, topic=OuterRef("topic")
+        ).values("read_until")[:1]
+
+        notifications = NotificationRequest.objects.filter(
+            self._get_visibility_filter()
+        )
+        if before:
+            notifications = notifications.filter(
+                Q(created_at__lt=before.created_at)
+                | Q(created_at=before.created_at, id__lt=before.id)
+            )
+
+        return notifications.annotate(
+            is_read=Coalesce(
+                Subquery(override, output_field=BooleanField()),
+                Case(
+                    When(created_at__lte=Subquery(read_until), then=Value(True)),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                ),
+            )
+        ).order_by("-created_at", "-id")
+
+    def mark_read(self, notification_id: int) -> NotificationRequest:
+        """
+        @return: The notification, marked read.
+        @raise NotificationRequest.DoesNotExist: When the user can't see it.
+        """
+        notification = self.get_notifications().get(pk=notification_id)
+        NotificationReadOverride.objects.update_or_create(
+            user=self.user, request=notification, defaults={"is_read": True}
+        )
+        if not notification.is_read:
+            self._adjust_unread_count(-1)
+
+        notification.is_read = True
+        return notification
+
+    def mark_all_read(self) -> int:
+        """
+        Move the read marker of every topic in the inbox to now, replacing
+        the per-notification overrides.
+
+        @return: The number of notifications that were unread.
+        """
+        now = django_timezone.now()
+        notifications = self.get_notifications().filter(created_at__lte=now)
+        unread_count = notifications.filter(is_read=False).count()
+        topic_ids = set(notifications.order_by().values_list("topic_id", flat=True))
+
+        NotificationReadMarker.objects.bulk_create(
+            [
+                NotificationReadMarker(
+                    user=self.user, topic_id=topic_id, read_until=now
+                )
+                for topic_id in topic_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "topic"],
+            update_fields=["read_until", "updated_at"],
+        )
+        NotificationReadOverride.objects.filter(
+            user=self.user, request__created_at__lte=now
+        ).delete()
+        cache.set(
+            self._get_unread_count_key(),
+            {"version": self.get_version(), "count": 0},
+            settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT,
+        )
+
+        return unread_count
+
+    def get_unread_count(self) -> int:
+        key = self._get_unread_count_key()
+        version = self.get_version()
+        entry = cache.get(key)
+        if entry is not None and entry["version"] == version:
+            return entry["count"]
+
+        count = self.get_notifications().filter(is_read=False).count()
+        cache.set(
+            key,
+            {"version": version, "count": count},
+            settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT,
+        )
+        return count
+
+    @classmethod
+    def get_version(cls) -> int:
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            # Seed from the clock so a lost version never matches old entries
+            cache.add(cls.VERSION_KEY, int(time.time()), None)
+            version = cache.get(cls.VERSION_KEY)
+
+        return version
+
+    @classmethod
+    def bump_version(cls) -> None:
+        try:
+            cache.incr(cls.VERSION_KEY)
+        except ValueError:
+            cache.set(cls.VERSION_KEY, int(time.time()), None)
+
+    def _adjust_unread_count(self, delta: int) -> None:
+        key = self._get_unread_count_key()
+        entry = cache.get(key)
+        if entry is None or entry["version"] != self.get_version():
+            return
+
+        entry["count"] = max(entry["count"] + delta, 0)
+        cache.set(key, entry, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT)
+
+    def _get_unread_count_key(self) -> str:
+        return f"{self.UNREAD_COUNT_PREFIX}:{self.user.id}"
+
+    def _get_visibility_filter(self) -> Q:
+        subscribed_products = set(
+            self.user.subscriptions.filter(is_active=True).values_list(
+                "product_price__product__name", flat=True
+            )
+        )
+        hidden_topics = [
+            topic
+            for topic, product_name in self.PRODUCT_TOPICS.items()
+            if product_name not in subscribed_products
+        ]
+
+        oldest_day = django_timezone.now().date() - timedelta(
+            days=settings.NOTIFICATION_INBOX_DAYS
+        )
+        return Q(created_at__date__gte=oldest_day) & (
+            Q(user=self.user)
+            | (Q(user__isnull=True) & ~Q(topic__name__in=hidden_topics))
+        )
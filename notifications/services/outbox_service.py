@@ -0,0 +1,289 @@
+import logging
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import User
+from notifications.models import NotificationOutbox, NotificationRequest
+from notifications.services.fcm_service import FCMService
+from tasks.registry import get_task
+
+logger = logging.getLogger("cron")
+
+
+class NotificationOutboxService:
+    """
+    Transactional outbox for FCM pushes.
+
+    Messages are stored in the caller's transaction and handed to the
+    ``notifications.dispatch_outbox`` task once it commits. The dispatcher
+    sends due messages concurrently and retries failed ones with
+    exponential backoff; after NOTIFICATION_OUTBOX_MAX_ATTEMPTS a message is
+    dead-lettered for an admin to requeue.
+    """
+
+    # How long a claimed message is kept from other dispatchers while it sends
+    CLAIM_TIMEOUT = timedelta(minutes=5)
+
+    def enqueue_notification(
+        self,
+        title: str,
+        body: str,
+        data: Optional[Dict] = None,
+        topic: Optional[str] = None,
+        token: Optional[str] = None,
+        request: Optional[NotificationRequest] = None,
+    ) -> NotificationOutbox:
+        return self._enqueue(
+            NotificationOutbox(
+                request=request,
+                kind=NotificationOutbox.Kind.NOTIFICATION,
+                title=title,
+                body=body,
+                data=data or {},
+                topic=topic or "",
+                token=token or "",
+            )
+        )
+
+    def enqueue_multicast(
+        self,
+        title: str,
+        body: str,
+        tokens: List[str],
+        data: Optional[Dict] = None,
+        request: Optional[NotificationRequest] = None,
+    ) -> NotificationOutbox:
+        return self._enqueue(
+            NotificationOutbox(
+                request=request,
+                kind=NotificationOutbox.Kind.MULTICAST,
+                title=title,
+                body=body,
+                data=data or {},
+                tokens=list(tokens),
+            )
+        )
+
+    def enqueue_segment(
+        self,
+        title: str,
+        body: str,
+        product_name: str,
+        data: Optional[Dict] = None,
+        request: Optional[NotificationRequest] = None,
+    ) -> NotificationOutbox:
+        """
+        Queue a notification to the devices of the active subscribers of a
+        product. The tokens are looked up by the dispatcher, so queuing stays
+        a single insert however large the segment is.
+        """
+        return self._enqueue(
+            NotificationOutbox(
+                request=request,
+                kind=NotificationOutbox.Kind.MULTICAST,
+                title=title,
+                body=body,
+                data=data or {},
+                segment=product_name,
+            )
+        )
+
+    def enqueue_silent_notification(
+        self, additional_data: Optional[Dict] = None
+    ) -> NotificationOutbox:
+        return self._enqueue(
+            NotificationOutbox(
+                kind=NotificationOutbox.Kind.SILENT,
+                topic="ALL",
+                data=additional_data or {},
+            )
+        )
+
+    def requeue(self, queryset) -> int:
+        """
+        Give dead-lettered messages a fresh set of attempts.
+
+        @return: The number of messages requeued.
+        """
+        requeued = queryset.filter(status=NotificationOutbox.Status.DEAD).update(
+            status=NotificationOutbox.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        if requeued:
+            transaction.on_commit(self._start_dispatch)
+
+        return requeued
+
+    def dispatch(self) -> Counter:
+        """
+        Send every due message, a batch at a time.
+
+        @return: sent/retried/dead counts.
+        """
+        stats = Counter()
+        while True:
+            messages = self._claim(settings.NOTIFICATION_OUTBOX_BATCH_SIZE)
+            if not messages:
+                break
+
+            with ThreadPoolExecutor(
+                max_workers=settings.NOTIFICATION_OUTBOX_CONCURRENCY
+            ) as executor:
+                results = list(executor.map(self._send, messages))
+
+            now = timezone.now()
+            for message, result in zip(messages, results):
+                self._apply_result(message, result, now)
+                if message.status == NotificationOutbox.Status.PENDING:
+                    stats["retried"] += 1
+                else:
+                    stats[message.status.lower()] += 1
+
+            NotificationOutbox.objects.bulk_update(
+                messages,
+                [
+                    "status",
+                    "tokens",
+                    "segment",
+                    "next_attempt_at",
+                    "sent_at",
+                    "message_id",
+                    "last_error",
+                    "updated_at",
+                ],
+            )
+
+        if stats:
+            logger.info(f"Dispatched notification outbox: {dict(stats)}")
+
+        return stats
+
+    def _enqueue(self, message: NotificationOutbox) -> NotificationOutbox:
+        message.save()
+        transaction.on_commit(self._start_dispatch)
+        return message
+
+    def _start_dispatch(self) -> None:
+        get_task("notifications.dispatch_outbox").enqueue()
+
+    def _claim(self, limit: int) -> list:
+        now = timezone.now()
+        with transaction.atomic():
+            messages = list(
+                NotificationOutbox.objects.select_for_update(skip_locked=True)
+                .filter(
+                    status=NotificationOutbox.Status.PENDING, next_attempt_at__lte=now
+                )
+                .order_by("next_attempt_at", "id")[:limit]
+            )
+            NotificationOutbox.objects.filter(
+                id__in=[message.id for message in messages]
+            ).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + self.CLAIM_TIMEOUT,
+                updated_at=now,
+            )
+
+        for message in messages:
+            message.attempts += 1
+
+        return messages
+
+    def _send(self, message: NotificationOutbox) -> dict:
+        fcm_service = FCMService()
+        try:
+            if message.kind == NotificationOutbox.Kind.SILENT:
+                return fcm_service.send_silent_notification(message.data)
+
+            if message.kind == NotificationOutbox.Kind.MULTICAST:
+                return self._send_multicast(fcm_service, message)
+
+            validation_error = fcm_service.validate_inputs(
+                message.topic or None, message.title, message.body, message.token
+            )
+            if validation_error:
+                # Never succeeds, so it isn't retried
+                return {
+                    "status": "error",
+                    "message": validation_error,
+                    "permanent": True,
+                }
+
+            return fcm_service.send_notification(
+                title=message.title,
+                body=message.body,
+                data=message.data,
+                topic=message.topic or None,
+                token=message.token or None,
+            )
+        finally:
+            connection.close()
+
+    def _send_multicast(
+        self, fcm_service: FCMService, message: NotificationOutbox
+    ) -> dict:
+        if message.segment:
+            # Saved along the result, so retries only get the failed tokens
+            message.tokens = self._get_segment_tokens(message.segment)
+            message.segment = ""
+
+        result = fcm_service.send_multicast(
+            message.tokens, message.title, message.body, message.data
+        )
+        if result.get("retryable"):
+            # Only the tokens that failed transiently are sent again
+            message.tokens = result["retryable"]
+            return {
+                "status": "error",
+                "message": f"{len(message.tokens)} tokens failed transiently",
+            }
+
+        if result["status"] == "error":
+            # Every token was rejected for good, or the input is invalid
+            return {**result, "permanent": True}
+
+        return result
+
+    def _get_segment_tokens(self, product_name: str) -> List[str]:
+        users = User.objects.filter(
+            is_active=True,
+            subscriptions__is_active=True,
+            subscriptions__product_price__product__name=product_name,
+            fcm_token__isnull=False,
+        ).exclude(fcm_token="")
+        return list(users.values_list("fcm_token", flat=True).distinct())
+
+    def _apply_result(self, message: NotificationOutbox, result: dict, now) -> None:
+        message.updated_at = now
+        if result.get("status") == "success":
+            message.status = NotificationOutbox.Status.SENT
+            message.sent_at = now
+            message.message_id = result.get("message_id") or ""
+            message.last_error = ""
+            return
+
+        message.last_error = result.get("message", "")
+        if (
+            result.get("permanent")
+            or message.attempts >= settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+        ):
+            message.status = NotificationOutbox.Status.DEAD
+            logger.error(
+                f"Dead-lettered outbox message {message.id} after {message.attempts} attempts: {message.last_error}"
+            )
+            return
+
+        delay = settings.NOTIFICATION_OUTBOX_RETRY_BACKOFF * 2 ** (message.attempts - 1)
+        message.next_attempt_at = now + timedelta(
+            seconds=random.uniform(delay / 2, delay)
+        )
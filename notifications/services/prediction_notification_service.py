@@ -1,11 +1,10 @@
+from datetime import date
+from typing import Optional
+
 from django.utils import timezone
 
 from core.models import Prediction, Ticket
-from notifications.models import (
-    NotificationRequest,
-    NotificationTopic,
-    UserNotification,
-)
+from notifications.models import NotificationRequest, NotificationTopic
 from notifications.services.fcm_service import FCMService
 from subscriptions.models import Product
 
@@ -123,14 +122,16 @@ class PredictionNotificationService:
 
         return NotificationRequest.IconNames.TROPHY
 
-    def send_daily_picks_notification(self, product_name: Product.Names):
+    def send_daily_picks_notification(
+        self, product_name: Product.Names, day: Optional[date] = None
+    ):
         # Convert product name to sentence case for the title
-        current_date = timezone.now().date()
+        current_date = day or timezone.now().date()
         formatted_date = current_date.strftime("%d.%m.%Y")
 
         title = f"{product_name.capitalize()} selection for {formatted_date} is out!"
         preview = "Tap to see today's top picks"
-        message = self._build_daily_picks_message(product_name)
+        message = self._build_daily_picks_message(product_name, current_date)
 
         topic = self.get_topic(product_name)
         icon = NotificationRequest.IconNames.TROPHY
@@ -144,8 +145,9 @@ class PredictionNotificationService:
             is_important=False,
         )
 
-    def _build_daily_picks_message(self, product_name: Product.Names) -> str:
-        today = timezone.now().date()
+    def _build_daily_picks_message(
+        self, product_name: Product.Names, today: date
+    ) -> str:
         lines = []
 
         # Get all predictions for today for this product
@@ -246,7 +248,3 @@ class PredictionNotificationService:
         NotificationRequest.objects.filter(
             topic=topic, is_important=True, created_at__lt=max_start_time
         ).update(is_important=False)
-
-        UserNotification.objects.filter(
-            topic=topic, is_important=True, created_at__lt=max_start_time
-        ).update(is_important=False)
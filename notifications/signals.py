@@ -1,13 +1,16 @@
 import re
 from html import unescape
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.html import strip_tags
 
-from accounts.models import User
-from notifications.models import NotificationRequest, UserNotification
-from notifications.services.fcm_service import FCMService
+from core.models import Prediction, Ticket
+from notifications.models import NotificationRequest
+from notifications.services.inbox_service import NotificationInboxService
+from notifications.services.outbox_service import NotificationOutboxService
+from notifications.tasks import DAILY_PICKS_SOURCES, schedule_daily_picks_notification
 
 
 def extract_first_30_words(html_content):
@@ -27,20 +30,14 @@ def extract_first_30_words(html_content):
 @receiver(post_save, sender=NotificationRequest)
 def handle_notification_request(sender, instance, created, **kwargs):
     """
-    Handle new NotificationRequest: send FCM notification and create UserNotifications.
-    If a specific user is set, send only to that user's token and create a single UserNotification.
-    Otherwise, send to the topic and create UserNotifications for all users with FCM tokens.
+    Queue the FCM push of a saved NotificationRequest in the outbox, within
+    the same transaction: to the user's token when a specific user is set,
+    otherwise as a single send to the topic, which Firebase fans out to the
+    devices subscribed to it. The request itself is the inbox entry of every
+    recipient, resolved at read time by NotificationInboxService, so no
+    per-user rows are written.
     """
-    if not created:
-        UserNotification.objects.filter(request=instance).update(
-            title=instance.title,
-            message=instance.message,
-            topic=instance.topic,
-            icon=instance.icon,
-            is_important=instance.is_important,
-        )
-
-    fcm_service = FCMService()
+    outbox_service = NotificationOutboxService()
     # serialized_data = NotificationRequestSerializer(instance).data
     serialized_data = {}
 
@@ -51,57 +48,42 @@ def handle_notification_request(sender, instance, created, **kwargs):
         # Extract first 30 words from HTML message
         body = extract_first_30_words(instance.message)
 
-    if instance.user and instance.user.fcm_token:
+    if instance.user:
         # Targeted notification to single user
-        response = fcm_service.send_notification(
-            title=instance.title,
-            body=body,
-            data=serialized_data,
-            token=instance.user.fcm_token,
-        )
-
-        if response.get("status") == "success":
-            UserNotification.objects.create(
-                request=instance,
-                user=instance.user,
+        if instance.user.fcm_token:
+            outbox_service.enqueue_notification(
                 title=instance.title,
-                message=instance.message,
-                topic=instance.topic,
-                icon=instance.icon,
-                is_important=instance.is_important,
-                is_visible=True,
+                body=body,
+                data=serialized_data,
+                token=instance.user.fcm_token,
+                request=instance,
             )
     else:
         # Broadcast to topic
-        response = fcm_service.send_notification(
+        outbox_service.enqueue_notification(
             title=instance.title,
             body=body,
             data=serialized_data,
             topic=instance.topic.name,
+            request=instance,
         )
 
-        if response.get("status") == "success":
-            if instance.topic.name in ["SOCCER", "BASKETBALL"]:
-                product_name = instance.topic.name.capitalize()
-                users = User.objects.filter(
-                    fcm_token__isnull=False,
-                    subscriptions__is_active=True,
-                    subscriptions__product_price__product__name=product_name,
-                ).distinct()
-            else:
-                users = User.objects.filter(fcm_token__isnull=False)
-            UserNotification.objects.bulk_create(
-                [
-                    UserNotification(
-                        request=instance,
-                        user=user,
-                        title=instance.title,
-                        message=instance.message,
-                        topic=instance.topic,
-                        icon=instance.icon,
-                        is_important=instance.is_important,
-                        is_visible=True,
-                    )
-                    for user in users
-                ]
-            )
+
+@receiver(post_save, sender=NotificationRequest)
+@receiver(post_delete, sender=NotificationRequest)
+def invalidate_unread_counts(sender, instance, **kwargs):
+    transaction.on_commit(NotificationInboxService.bump_version)
+
+
+@receiver(post_save, sender=Prediction)
+@receiver(post_save, sender=Ticket)
+def handle_daily_pick_created(sender, instance, created, **kwargs):
+    """
+    Schedule, or push back, the announcement of the day's picks.
+    """
+    if not created or not instance.product_id:
+        return
+
+    product_name = instance.product.name
+    if sender in DAILY_PICKS_SOURCES.get(product_name, ()):
+        transaction.on_commit(lambda: schedule_daily_picks_notification(product_name))
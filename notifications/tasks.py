@@ -0,0 +1,123 @@
+# notifications/tasks.py
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import Prediction, Ticket
+from notifications.models import NotificationReadOverride, NotificationRequest
+from notifications.services.outbox_service import NotificationOutboxService
+from notifications.services.prediction_notification_service import (
+    PredictionNotificationService,
+)
+from subscriptions.models import Product
+from tasks.registry import task
+
+logger = logging.getLogger("cron")
+
+
+# Picks that trigger the daily announcement of each product; soccer only
+# announces its parlays
+DAILY_PICKS_SOURCES = {
+    Product.Names.SOCCER: (Ticket,),
+    Product.Names.BASKETBALL: (Prediction, Ticket),
+}
+# Quiet time after the last pick of the day before it's announced
+DAILY_PICKS_DELAY = timedelta(minutes=30)
+
+
+def schedule_daily_picks_notification(product_name):
+    """
+    Announce the picks of the product DAILY_PICKS_DELAY after the last one
+    created today; every new pick pushes the announcement back.
+    """
+    announce_daily_picks.debounce(
+        timezone.now() + DAILY_PICKS_DELAY,
+        product_name,
+        timezone.now().date().isoformat(),
+    )
+
+
+@task("notifications.announce_daily_picks", priority=5, singleton=True)
+def announce_daily_picks(product_name, day):
+    day = date.fromisoformat(day)
+    title = (
+        f"{product_name.capitalize()} selection for {day.strftime('%d.%m.%Y')} is out!"
+    )
+    if NotificationRequest.objects.filter(
+        title=title, created_at__date__gte=day
+    ).exists():
+        return False
+
+    prediction_notification_service = PredictionNotificationService()
+    prediction_notification_service.send_daily_picks_notification(product_name, day)
+    return True
+
+
+def mark_notifications_as_not_important_for_product(product_name):
+    now = timezone.now()
+    today = now.date()
+
+    predictions = Prediction.objects.filter(
+        status=Prediction.Status.PENDING,
+        match__kickoff_datetime__date=today,
+        product__name=product_name,
+    )
+
+    tickets = Ticket.objects.filter(
+        status=Ticket.Status.PENDING,
+        starts_at__date=today,
+        product__name=product_name,
+    )
+
+    start_times = [pred.match.kickoff_datetime for pred in predictions] + [
+        ticket.starts_at for ticket in tickets if ticket.starts_at
+    ]
+
+    if not start_times:
+        return
+
+    max_start_time = max(start_times)
+
+    if now >= max_start_time:
+        prediction_notification_service = PredictionNotificationService()
+        prediction_notification_service.mark_notifications_as_not_important(
+            product_name, max_start_time
+        )
+
+
+@task(
+    "notifications.mark_soccer_notifications_as_not_important",
+    priority=5,
+    singleton=True,
+)
+def mark_soccer_notifications_as_not_important():
+    mark_notifications_as_not_important_for_product(Product.Names.SOCCER)
+
+
+@task(
+    "notifications.mark_basketball_notifications_as_not_important",
+    priority=5,
+    singleton=True,
+)
+def mark_basketball_notifications_as_not_important():
+    mark_notifications_as_not_important_for_product(Product.Names.BASKETBALL)
+
+
+@task("notifications.dispatch_outbox", priority=15, singleton=True)
+def dispatch_outbox():
+    NotificationOutboxService().dispatch()
+
+
+@task("notifications.delete_older_notifications", priority=5, singleton=True)
+def delete_older_notifications():
+    """
+    Drop the read overrides of notifications that fell out of the inbox;
+    the inbox itself only lists the last NOTIFICATION_INBOX_DAYS days.
+    """
+    today_date = timezone.now().date()
+    oldest_day = today_date - timedelta(days=settings.NOTIFICATION_INBOX_DAYS)
+    NotificationReadOverride.objects.filter(
+        request__created_at__date__lt=oldest_day
+    ).delete()
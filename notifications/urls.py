@@ -4,10 +4,16 @@ from .views import (
     ListNotificationsView,
     MarkAllNotificationsReadView,
     MarkNotificationReadView,
+    UnreadNotificationsCountView,
 )
 
 urlpatterns = [
     path("", ListNotificationsView.as_view(), name="list-notifications"),
+    path(
+        "unread-count/",
+        UnreadNotificationsCountView.as_view(),
+        name="unread-notifications-count",
+    ),
     path(
         "<int:pk>/mark-read/",
         MarkNotificationReadView.as_view(),
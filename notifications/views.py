@@ -1,23 +1,88 @@
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
-from .models import UserNotification
-from .serializers import UserNotificationSerializer
+from .models import NotificationRequest
+from .serializers import InboxNotificationSerializer
+from .services.inbox_service import InboxCursor, NotificationInboxService
+
+
+class NotificationPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
 
 
 class ListNotificationsView(APIView):
     permission_classes = [IsAuthenticated]
+    pagination_class = NotificationPagination
 
     def get(self, request):
         """List all notifications for the authenticated user."""
-        notifications = UserNotification.objects.filter(
-            user=request.user, is_visible=True
-        ).order_by("-created_at")
-        serializer = UserNotificationSerializer(notifications, many=True)
+        # Keyset pagination: ?before=<created_at>,<id>. An empty value asks for the first page.
+        if "before" in request.query_params:
+            return self._get_cursor_page(request)
+
+        notifications = NotificationInboxService(request.user).get_notifications()
+        serializer = InboxNotificationSerializer(
+            notifications, many=True, context={"request": request}
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def _get_cursor_page(self, request):
+        cursor = None
+        before = request.query_params.get("before")
+        if before:
+            try:
+                cursor = InboxCursor.decode(before)
+            except ValueError:
+                raise ValidationError({"before": "Invalid cursor."})
+
+        page_size = self.pagination_class().get_page_size(request)
+        notifications = list(
+            NotificationInboxService(request.user).get_notifications(before=cursor)[
+                : page_size + 1
+            ]
+        )
+
+        next_cursor = None
+        if len(notifications) > page_size:
+            notifications = notifications[:page_size]
+            last = notifications[-1]
+            next_cursor = InboxCursor(created_at=last.created_at, id=last.id)
+
+        next_link = None
+        if next_cursor:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "before", next_cursor.encode()
+            )
+
+        serializer = InboxNotificationSerializer(
+            notifications, many=True, context={"request": request}
+        )
+        return Response(
+            {
+                "page_size": page_size,
+                "next_cursor": next_cursor.encode() if next_cursor else None,
+                "next": next_link,
+                "results": serializer.data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class UnreadNotificationsCountView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """Number of unread notifications of the authenticated user, for badges."""
+        unread_count = NotificationInboxService(request.user).get_unread_count()
+        return Response({"unread_count": unread_count}, status=status.HTTP_200_OK)
+
 
 class MarkNotificationReadView(APIView):
     permission_classes = [IsAuthenticated]
@@ -25,15 +90,15 @@ class MarkNotificationReadView(APIView):
     def patch(self, request, pk):
         """Mark a specific notification as read."""
         try:
-            notification = UserNotification.objects.get(pk=pk, user=request.user)
-        except UserNotification.DoesNotExist:
+            notification = NotificationInboxService(request.user).mark_read(pk)
+        except NotificationRequest.DoesNotExist:
             return Response(
                 {"detail": "Notification not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
-        notification.is_read = True
-        notification.save()
-        serializer = UserNotificationSerializer(notification)
+        serializer = InboxNotificationSerializer(
+            notification, context={"request": request}
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -42,9 +107,7 @@ class MarkAllNotificationsReadView(APIView):
 
     def patch(self, request):
         """Mark all notifications for the authenticated user as read."""
-        updated_count = UserNotification.objects.filter(
-            user=request.user, is_read=False, is_visible=True
-        ).update(is_read=True)
+        updated_count = NotificationInboxService(request.user).mark_all_read()
         return Response(
             {"status": "success", "updated_count": updated_count},
             status=status.HTTP_200_OK,
@@ -0,0 +1,49 @@
+from django.contrib import admin
+
+from tasks.models import Task, TaskRun, TaskSchedule
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "status",
+        "priority",
+        "attempts",
+        "max_attempts",
+        "run_at",
+        "locked_by",
+        "finished_at",
+    ]
+    list_filter = ["status", "name"]
+    search_fields = ["name", "unique_key"]
+    ordering = ["-created_at"]
+    raw_id_fields = ["parent"]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TaskRun)
+class TaskRunAdmin(admin.ModelAdmin):
+    list_display = ["name", "attempt", "status", "worker", "started_at", "duration"]
+    list_filter = ["status", "name"]
+    ordering = ["-started_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TaskSchedule)
+class TaskScheduleAdmin(admin.ModelAdmin):
+    list_display = ["name", "cron", "last_enqueued_at"]
+    ordering = ["name"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
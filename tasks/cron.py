@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+
+class CronExpression:
+    """
+    Standard five-field crontab expression (minute, hour, day of month,
+    month, day of week), supporting ``*``, ``*/n``, ``a-b``, ``a-b/n`` and
+    comma-separated lists. Day of week runs from 0 (Sunday) to 6.
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != len(self.FIELD_RANGES):
+            raise ValueError(f"Invalid cron expression: {expression}")
+
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high)
+            for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        ]
+        # Like cron: when both day fields are restricted, either one matches
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+    def matches(self, dt: datetime) -> bool:
+        if dt.minute not in self.minutes or dt.hour not in self.hours:
+            return False
+        if dt.month not in self.months:
+            return False
+
+        day_matches = dt.day in self.days
+        weekday_matches = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_matches or weekday_matches
+
+        return day_matches and weekday_matches
+
+    def matches_between(self, start: datetime, end: datetime) -> bool:
+        """
+        @return: Whether any minute after ``start``, up to and including
+                 ``end``, matches.
+        """
+        current = start.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        while current <= end:
+            if self.matches(current):
+                return True
+            current += timedelta(minutes=1)
+
+        return False
+
+    def _parse_field(self, field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            value_range, _, step = part.partition("/")
+            if value_range == "*":
+                start, end = low, high
+            elif "-" in value_range:
+                start, end = (int(v) for v in value_range.split("-"))
+            else:
+                start = end = int(value_range)
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Invalid cron field: {field}")
+
+            values.update(range(start, end + 1, int(step) if step else 1))
+
+        return values
@@ -0,0 +1,30 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.task_worker import TaskWorker
+
+
+class Command(BaseCommand):
+    help = "Run a task worker: queue the scheduled tasks and run the queued ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, help="Number of worker threads")
+        parser.add_argument(
+            "--no-scheduler",
+            action="store_true",
+            help="Only run queued tasks, don't queue the scheduled ones",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Stop once the queue is empty instead of waiting for new tasks",
+        )
+
+    def handle(self, *args, **kwargs):
+        worker = TaskWorker(
+            concurrency=kwargs["concurrency"], scheduler=not kwargs["no_scheduler"]
+        )
+        # Let running tasks finish on shutdown
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        worker.run(burst=kwargs["burst"])
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from core.utils import BaseInternalModel
+
+
+class Task(BaseInternalModel):
+    """
+    A queued call of a registered task function. Workers claim the due
+    tasks with the highest priority first; failed tasks are queued again
+    with backoff until they run out of attempts.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    ACTIVE_STATUSES = [Status.QUEUED, Status.RUNNING]
+
+    name = models.CharField(max_length=128, db_index=True)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    priority = models.IntegerField(default=0)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    # Singleton tasks: at most one queued or running task per key
+    unique_key = models.CharField(max_length=255, blank=True, null=True)
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        verbose_name = "Task"
+        verbose_name_plural = "Tasks"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "-priority", "run_at"], name="task_claim_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["unique_key"],
+                condition=Q(status__in=["QUEUED", "RUNNING"]),
+                name="task_active_unique_key",
+            ),
+        ]
+
+
+class TaskRun(BaseInternalModel):
+    """
+    One attempt of a task, kept as the run history of every job.
+    """
+
+    task = models.ForeignKey(
+        Task, on_delete=models.SET_NULL, null=True, related_name="runs"
+    )
+    name = models.CharField(max_length=128)
+    attempt = models.PositiveIntegerField()
+    worker = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=Task.Status.choices)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    error = models.TextField(blank=True)
+
+    @property
+    def duration(self) -> timedelta:
+        return self.finished_at - self.started_at
+
+    def __str__(self):
+        return f"{self.name} #{self.attempt} at {self.started_at}"
+
+    class Meta:
+        verbose_name = "Task Run"
+        verbose_name_plural = "Task Runs"
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["name", "-started_at"], name="taskrun_name_idx"),
+        ]
+
+
+class TaskSchedule(BaseInternalModel):
+    """
+    State of a periodic task from settings.TASK_SCHEDULES: when it was last
+    queued, so several workers never queue the same run twice.
+    """
+
+    name = models.CharField(max_length=128, unique=True)
+    cron = models.CharField(max_length=64)
+    last_enqueued_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.cron})"
+
+    class Meta:
+        verbose_name = "Task Schedule"
+        verbose_name_plural = "Task Schedules"
+        ordering = ["name"]
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+_registry = {}
+
+
+@dataclass
+class TaskDefinition:
+    """
+    A function registered with @task. Calling it runs the function right
+    away; ``enqueue`` queues it for the workers.
+    """
+
+    func: Callable
+    name: str
+    priority: int = 0
+    max_attempts: int = 1
+    # Seconds before the first retry, doubled on every further attempt
+    retry_backoff: int = 60
+    # At most one queued or running task per name and arguments
+    singleton: bool = False
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *args, **kwargs):
+        """
+        @return: The queued Task, or None when the task is a singleton that
+                 is already queued or running.
+        """
+        from tasks.services.task_queue_service import TaskQueueService
+
+        return TaskQueueService().enqueue(self, args=list(args), kwargs=kwargs)
+
+    def debounce(self, run_at, *args, **kwargs):
+        """
+        Queue the task to run at ``run_at``, pushing back the queued task with
+        the same arguments instead when there is one. Singleton tasks only.
+
+        @return: The queued Task, or None when it is already running.
+        """
+        from tasks.services.task_queue_service import TaskQueueService
+
+        return TaskQueueService().debounce(self, run_at, args=list(args), kwargs=kwargs)
+
+
+def task(
+    name: str,
+    priority: int = 0,
+    max_attempts: int = 1,
+    retry_backoff: int = 60,
+    singleton: bool = False,
+) -> Callable[[Callable], TaskDefinition]:
+    def decorator(func: Callable) -> TaskDefinition:
+        if name in _registry:
+            raise ValueError(f"Task {name} is already registered")
+
+        definition = TaskDefinition(
+            func=func,
+            name=name,
+            priority=priority,
+            max_attempts=max_attempts,
+            retry_backoff=retry_backoff,
+            singleton=singleton,
+        )
+        _registry[name] = definition
+        return definition
+
+    return decorator
+
+
+def get_task(name: str) -> Optional[TaskDefinition]:
+    return _registry.get(name)
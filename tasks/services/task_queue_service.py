@@ -0,0 +1,319 @@
+import json
+import logging
+import random
+import threading
+import traceback
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from tasks.cron import CronExpression
+from tasks.models import Task, TaskRun, TaskSchedule
+from tasks.registry import TaskDefinition, get_task
+
+logger = logging.getLogger("cron")
+
+_current = threading.local()
+
+
+def get_current_task() -> Optional[Task]:
+    """
+    @return: The task running in this thread, if any. Tasks queued while it
+             runs become its children.
+    """
+    return getattr(_current, "task", None)
+
+
+class TaskQueueService:
+    """
+    Postgres-backed task queue.
+
+    Workers claim due tasks by priority with ``SELECT ... FOR UPDATE SKIP
+    LOCKED``, so any number of them can poll the same table. Singleton tasks
+    rely on a partial unique index over the active tasks, which makes
+    overlapping runs of the same job impossible.
+    """
+
+    # How far back a schedule catches up on runs missed while no worker ran
+    SCHEDULE_CATCH_UP = timedelta(days=1)
+
+    def enqueue(
+        self,
+        definition: TaskDefinition,
+        args: list = None,
+        kwargs: dict = None,
+        run_at=None,
+        priority: int = None,
+    ) -> Optional[Task]:
+        args = args or []
+        kwargs = kwargs or {}
+        unique_key = self._get_unique_key(definition, args, kwargs)
+
+        try:
+            with transaction.atomic():
+                return Task.objects.create(
+                    name=definition.name,
+                    args=args,
+                    kwargs=kwargs,
+                    priority=definition.priority if priority is None else priority,
+                    run_at=run_at or timezone.now(),
+                    max_attempts=definition.max_attempts,
+                    unique_key=unique_key,
+                    parent=get_current_task(),
+                )
+        except IntegrityError:
+            logger.info(f"Task {unique_key} is already queued or running. Skipping.")
+            return None
+
+    def debounce(
+        self, definition: TaskDefinition, run_at, args: list = None, kwargs: dict = None
+    ) -> Optional[Task]:
+        """
+        Queue a singleton task to run at ``run_at``, or move the queued one
+        with the same arguments there, so a burst of calls runs it once,
+        after the last call.
+
+        @return: The queued Task, or None when it is already running.
+        """
+        if not definition.singleton:
+            raise ValueError(f"Task {definition.name} isn't a singleton")
+
+        args = args or []
+        kwargs = kwargs or {}
+        queued = Task.objects.filter(
+            unique_key=self._get_unique_key(definition, args, kwargs),
+            status=Task.Status.QUEUED,
+        )
+
+        task = queued.first()
+        if task is None:
+            task = self.enqueue(definition, args=args, kwargs=kwargs, run_at=run_at)
+            if task is not None:
+                return task
+
+            # Lost the race to another caller, which queued it meanwhile
+            task = queued.first()
+            if task is None:
+                return None
+
+        # Conditional, so a task a worker just claimed is left alone
+        if not queued.filter(id=task.id).update(
+            run_at=run_at, updated_at=timezone.now()
+        ):
+            return None
+
+        task.run_at = run_at
+        return task
+
+    def claim(self, worker: str) -> Optional[Task]:
+        """
+        Lock the next due task for ``worker``.
+
+        @return: The claimed task, or None when nothing is due.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            task = (
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(status=Task.Status.QUEUED, run_at__lte=now)
+                .order_by("-priority", "run_at", "id")
+                .first()
+            )
+            if task is None:
+                return None
+
+            # Conditional, so backends without row locks never hand a task
+            # to two workers either
+            claimed = Task.objects.filter(id=task.id, status=Task.Status.QUEUED).update(
+                status=Task.Status.RUNNING,
+                attempts=F("attempts") + 1,
+                locked_by=worker,
+                locked_at=now,
+                updated_at=now,
+            )
+            if not claimed:
+                return None
+
+        task.status = Task.Status.RUNNING
+        task.attempts += 1
+        task.locked_by = worker
+        task.locked_at = now
+        return task
+
+    def run(self, task: Task, worker: str) -> bool:
+        """
+        Run a claimed task and record the attempt. A failed task is queued
+        again with exponential backoff while it has attempts left.
+
+        @return: Whether the task succeeded.
+        """
+        definition = get_task(task.name)
+        started_at = timezone.now()
+        error = ""
+
+        _current.task = task
+        try:
+            if definition is None:
+                raise LookupError(f"Task {task.name} is not registered")
+
+            definition.func(*task.args, **task.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            logger.error(f"Task {task.name} #{task.id} failed: {error}")
+        finally:
+            _current.task = None
+
+        now = timezone.now()
+        if not error:
+            task.status = Task.Status.SUCCEEDED
+            task.finished_at = now
+        elif task.attempts < task.max_attempts:
+            task.status = Task.Status.QUEUED
+            task.run_at = now + self._get_backoff(definition, task.attempts)
+        else:
+            task.status = Task.Status.FAILED
+            task.finished_at = now
+
+        task.last_error = error
+        task.save(
+            update_fields=[
+                "status",
+                "run_at",
+                "finished_at",
+                "last_error",
+                "updated_at",
+            ]
+        )
+        TaskRun.objects.create(
+            task=task,
+            name=task.name,
+            attempt=task.attempts,
+            worker=worker,
+            status=Task.Status.FAILED if error else Task.Status.SUCCEEDED,
+            started_at=started_at,
+            finished_at=now,
+            error=error,
+        )
+
+        return not error
+
+    def heartbeat(self, worker: str) -> int:
+        """
+        Refresh the lock of the tasks ``worker``'s threads are running, so
+        long tasks aren't mistaken for abandoned ones.
+
+        @return: The number of tasks refreshed.
+        """
+        now = timezone.now()
+        return Task.objects.filter(
+            status=Task.Status.RUNNING, locked_by__startswith=f"{worker}:"
+        ).update(locked_at=now, updated_at=now)
+
+    def delete_finished(self, older_than: timedelta) -> tuple:
+        """
+        Drop the tasks that finished, and the runs recorded, before
+        ``older_than`` ago.
+
+        @return: The number of tasks and runs deleted.
+        """
+        cutoff = timezone.now() - older_than
+        runs, _ = TaskRun.objects.filter(finished_at__lt=cutoff).delete()
+        tasks, _ = Task.objects.filter(
+            status__in=[Task.Status.SUCCEEDED, Task.Status.FAILED],
+            finished_at__lt=cutoff,
+        ).delete()
+        return tasks, runs
+
+    def requeue_stale(self) -> int:
+        """
+        Release tasks locked by a worker that died, queuing them again while
+        they have attempts left.
+
+        @return: The number of tasks released.
+        """
+        now = timezone.now()
+        stale = Task.objects.filter(
+            status=Task.Status.RUNNING,
+            locked_at__lt=now - timedelta(seconds=settings.TASK_STALE_AFTER),
+        )
+        requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+            status=Task.Status.QUEUED, run_at=now, updated_at=now
+        )
+        failed = stale.update(
+            status=Task.Status.FAILED,
+            finished_at=now,
+            last_error="Worker stopped while running the task",
+            updated_at=now,
+        )
+        if requeued or failed:
+            logger.warning(
+                f"Released stale tasks: {requeued} requeued, {failed} failed"
+            )
+
+        return requeued + failed
+
+    def enqueue_due_schedules(self) -> list:
+        """
+        Queue the tasks of settings.TASK_SCHEDULES whose cron expression
+        matched since they were last queued.
+
+        @return: The names of the tasks queued.
+        """
+        now = timezone.localtime().replace(second=0, microsecond=0)
+        TaskSchedule.objects.bulk_create(
+            [
+                TaskSchedule(name=name, cron=cron, last_enqueued_at=now)
+                for cron, name in settings.TASK_SCHEDULES
+            ],
+            ignore_conflicts=True,
+        )
+
+        crons = {name: cron for cron, name in settings.TASK_SCHEDULES}
+        enqueued = []
+        with transaction.atomic():
+            schedules = TaskSchedule.objects.select_for_update(skip_locked=True).filter(
+                name__in=crons, last_enqueued_at__lt=now
+            )
+            for schedule in schedules:
+                last_enqueued_at = max(
+                    timezone.localtime(schedule.last_enqueued_at),
+                    now - self.SCHEDULE_CATCH_UP,
+                )
+                if not CronExpression(crons[schedule.name]).matches_between(
+                    last_enqueued_at, now
+                ):
+                    continue
+
+                definition = get_task(schedule.name)
+                if definition is None:
+                    logger.error(f"Scheduled task {schedule.name} is not registered")
+                    continue
+
+                self.enqueue(definition)
+                schedule.cron = crons[schedule.name]
+                schedule.last_enqueued_at = now
+                schedule.save(update_fields=["cron", "last_enqueued_at", "updated_at"])
+                enqueued.append(schedule.name)
+
+        return enqueued
+
+    def _get_unique_key(
+        self, definition: TaskDefinition, args: list, kwargs: dict
+    ) -> Optional[str]:
+        if not definition.singleton:
+            return None
+
+        unique_key = definition.name
+        if args or kwargs:
+            unique_key += ":" + json.dumps([args, kwargs], sort_keys=True)
+
+        return unique_key
+
+    def _get_backoff(self, definition: Optional[TaskDefinition], attempt: int):
+        base = definition.retry_backoff if definition else 60
+        delay = base * 2 ** (attempt - 1)
+        return timedelta(seconds=random.uniform(delay / 2, delay))
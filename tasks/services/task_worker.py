@@ -0,0 +1,107 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from tasks.models import Task
+from tasks.services.task_queue_service import TaskQueueService
+
+logger = logging.getLogger("cron")
+
+
+class TaskWorker:
+    """
+    Pool of worker threads draining the task queue. The calling thread
+    queues the scheduled tasks, keeps the locks of the running ones fresh
+    and releases stale ones meanwhile.
+
+    In ``burst`` mode the worker stops once no task is due or running,
+    instead of polling forever.
+    """
+
+    def __init__(self, concurrency: int = None, scheduler: bool = True):
+        self.concurrency = concurrency or settings.TASK_WORKER_CONCURRENCY
+        self.scheduler = scheduler
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.task_queue_service = TaskQueueService()
+        self.stop_event = threading.Event()
+        self.active = 0
+        self.lock = threading.Lock()
+
+    def run(self, burst: bool = False) -> None:
+        logger.info(f"Task worker {self.name} started with {self.concurrency} threads")
+        threads = [
+            threading.Thread(target=self._work, args=(f"{self.name}:{i}", burst))
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        last_heartbeat = time.monotonic()
+        try:
+            while not self.stop_event.is_set():
+                if (
+                    time.monotonic() - last_heartbeat
+                    >= settings.TASK_HEARTBEAT_INTERVAL
+                ):
+                    self.task_queue_service.heartbeat(self.name)
+                    last_heartbeat = time.monotonic()
+
+                if self.scheduler:
+                    self.task_queue_service.requeue_stale()
+                    for name in self.task_queue_service.enqueue_due_schedules():
+                        logger.info(f"Queued scheduled task {name}")
+
+                alive = [thread for thread in threads if thread.is_alive()]
+                if not alive:
+                    break
+
+                alive[0].join(settings.TASK_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            logger.info(f"Task worker {self.name} stopping")
+        finally:
+            self.stop_event.set()
+            for thread in threads:
+                thread.join()
+            connection.close()
+
+        logger.info(f"Task worker {self.name} stopped")
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def _work(self, worker: str, burst: bool) -> None:
+        try:
+            while not self.stop_event.is_set():
+                task = self.task_queue_service.claim(worker)
+                if task is None:
+                    if burst and self._is_idle():
+                        return
+
+                    self.stop_event.wait(settings.TASK_POLL_INTERVAL)
+                    continue
+
+                with self.lock:
+                    self.active += 1
+                try:
+                    self.task_queue_service.run(task, worker)
+                finally:
+                    with self.lock:
+                        self.active -= 1
+        finally:
+            connection.close()
+
+    def _is_idle(self) -> bool:
+        """
+        Nothing is running in this worker and nothing else is queued, so no
+        task can still fan out new work for it.
+        """
+        with self.lock:
+            if self.active:
+                return False
+
+        return not Task.objects.filter(status=Task.Status.QUEUED).exists()
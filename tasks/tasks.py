@@ -0,0 +1,17 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+
+from tasks.registry import task
+from tasks.services.task_queue_service import TaskQueueService
+
+logger = logging.getLogger("cron")
+
+
+@task("tasks.delete_finished_tasks", priority=5, singleton=True)
+def delete_finished_tasks():
+    tasks, runs = TaskQueueService().delete_finished(
+        timedelta(days=settings.TASK_RETENTION_DAYS)
+    )
+    logger.info(f"Deleted {tasks} finished tasks and {runs} task runs")